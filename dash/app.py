@@ -7,7 +7,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
-# ⭐ CRITIQUE: Importer FrequencyEncoder AVANT model_predictor
+# Importer FrequencyEncoder AVANT model_predictor (modèle picklé, si pas de registre dash/models)
 from frequency_encoder import FrequencyEncoder
 
 import layouts
@@ -20,29 +20,6 @@ app = dash.Dash(__name__,
                 suppress_callback_exceptions=True)
 server = app.server
 
-
-def load_data_complete():
-    """Charge et prépare les données"""
-    df = db_manager.get_all_data()
-
-    if not df.empty:
-        if 'departement' in df.columns:
-            df['departement'] = df['departement'].astype(str).apply(
-                lambda x: x.split('.')[0].zfill(2))
-
-        if 'categorie_salaire' in df.columns:
-            df['categorie_salaire_label'] = df['categorie_salaire'].apply(
-                lambda x: "Haut salaire" if x == 1 else "Bas salaire")
-
-        if 'temps_travail' in df.columns:
-            df['temps_travail_label'] = df['temps_travail'].apply(
-                lambda x: "Temps plein" if x == 1 else "Temps partiel")
-
-    return df
-
-
-df = load_data_complete()
-
 # Layout principal
 app.layout = html.Div([
     dcc.Location(id="url", refresh=False),
@@ -96,43 +73,28 @@ def render_page(pathname):
 )
 def update_filters_bidirectional(selected_cities, selected_depts):
     """Met à jour les options de département et ville de manière bidirectionnelle"""
-    # Options par défaut (toutes les données)
-    all_unique_depts = sorted([int(d) for d in df['departement'].dropna().unique()
-                               if str(d).replace('.', '').isdigit() or isinstance(d, (int, float))])
-    all_dept_options = [{'label': f"Département {d:02d}", 'value': d} for d in all_unique_depts]
+    def dept_options(**filtres):
+        depts = sorted(int(d) for d in db_manager.valeurs_distinctes('departement', **filtres)
+                       if str(d).replace('.', '').isdigit() or isinstance(d, (int, float)))
+        return [{'label': f"Département {d:02d}", 'value': d} for d in depts]
 
-    all_unique_cities = sorted(df['region'].dropna().unique().tolist()[:100]) if 'region' in df.columns else []
-    all_city_options = [{'label': city, 'value': city} for city in all_unique_cities]
-
-    # Si rien n'est sélectionné, retourner toutes les options
-    if (not selected_cities or len(selected_cities) == 0) and (not selected_depts or len(selected_depts) == 0):
-        return all_dept_options, all_city_options
+    def city_options(limit=None, **filtres):
+        cities = sorted(db_manager.valeurs_distinctes('region', limit=limit, **filtres))
+        return [{'label': city, 'value': city} for city in cities]
 
     # Cas 1: Villes sélectionnées → filtrer départements
-    if selected_cities and len(selected_cities) > 0:
-        dff_city = df[df['region'].isin(selected_cities)]
-        if not dff_city.empty:
-            filtered_depts = sorted([int(d) for d in dff_city['departement'].dropna().unique()
-                                     if str(d).replace('.', '').isdigit() or isinstance(d, (int, float))])
-            dept_options = [{'label': f"Département {d:02d}", 'value': d} for d in filtered_depts]
-        else:
-            dept_options = []
+    if selected_cities:
+        filtered_dept_options = dept_options(cities=selected_cities)
     else:
-        dept_options = all_dept_options
+        filtered_dept_options = dept_options()
 
     # Cas 2: Départements sélectionnés → filtrer villes
-    if selected_depts and len(selected_depts) > 0:
-        depts_str = [str(d).zfill(2) for d in selected_depts]
-        dff_dept = df[df['departement'].isin(depts_str)]
-        if not dff_dept.empty:
-            filtered_cities = sorted(dff_dept['region'].dropna().unique().tolist())
-            city_options = [{'label': city, 'value': city} for city in filtered_cities]
-        else:
-            city_options = []
+    if selected_depts:
+        filtered_city_options = city_options(depts=[int(d) for d in selected_depts])
     else:
-        city_options = all_city_options
+        filtered_city_options = city_options(limit=100)
 
-    return dept_options, city_options
+    return filtered_dept_options, filtered_city_options
 
 
 # CALLBACK 2: AJOUT OFFRE
@@ -149,8 +111,6 @@ def update_filters_bidirectional(selected_cities, selected_depts):
 )
 def save_offer(n_clicks, title, company, region, dept, city, salary, worktime):
     """Enregistre une nouvelle offre avec prédiction du cluster"""
-    global df
-
     if not n_clicks:
         raise PreventUpdate
 
@@ -181,7 +141,6 @@ def save_offer(n_clicks, title, company, region, dept, city, salary, worktime):
                                 sal_val, cat, temps_val, cluster_predit)
 
         if ok:
-            df = load_data_complete()
             return dbc.Alert([
                 html.H5("✅ Offre ajoutée avec succès!", className="alert-heading"),
                 html.P(f"Classée dans le Cluster {cluster_predit}"),
@@ -229,44 +188,11 @@ def update_from_treemap(click_data):
         region_clicked = click_data['points'][0]['label']
 
         # Trouver toutes les villes de cette région
-        dff = df[df['departement'].apply(dept_to_region) == region_clicked]
-        cities_in_region = dff['region'].dropna().unique().tolist()
-
-        return cities_in_region
+        return db_manager.villes_de_region(region_clicked)
     except:
         raise PreventUpdate
 
 
-def dept_to_region(dept):
-    """Convertit un département en région"""
-    try:
-        dept_num = int(str(dept).split('.')[0])
-    except:
-        return "Autre"
-
-    mapping = {
-        range(75, 96): "Île-de-France",
-        (14, 27, 50, 61, 76): "Normandie",
-        (22, 29, 35, 56): "Bretagne",
-        (44, 49, 53, 72, 85): "Pays de la Loire",
-        (18, 28, 36, 37, 41, 45): "Centre-Val de Loire",
-        (21, 25, 39, 58, 70, 71, 89, 90): "Bourgogne-Franche-Comté",
-        (2, 59, 60, 62, 80): "Hauts-de-France",
-        (8, 10, 51, 52, 54, 55, 57, 67, 68, 88): "Grand Est",
-        (16, 17, 19, 23, 24, 33, 40, 47, 64, 79, 86, 87): "Nouvelle-Aquitaine",
-        (9, 11, 12, 30, 31, 32, 34, 46, 48, 65, 66, 81, 82): "Occitanie",
-        (1, 3, 7, 15, 26, 38, 42, 43, 63, 69, 73, 74): "Auvergne-Rhône-Alpes",
-        (4, 5, 6, 13, 83, 84): "Provence-Alpes-Côte d'Azur",
-        (20, 201, 202): "Corse"
-    }
-
-    for depts, region in mapping.items():
-        if dept_num in depts if isinstance(depts, tuple) else dept_num in depts:
-            return region
-
-    return "Autre"
-
-
 # CALLBACK 4: UPDATE DASHBOARD
 @app.callback(
     [Output('kpi-count', 'children'),
@@ -285,23 +211,14 @@ def dept_to_region(dept):
 )
 def update_dashboard(cities, depts, clusters, companies):
     """Met à jour tous les graphiques selon les filtres"""
-    dff = df.copy()
-
-    # Application des filtres
-    if cities:
-        dff = dff[dff['region'].isin(cities)]
-    if depts:
-        depts_str = [str(d).zfill(2) for d in depts]
-        dff = dff[dff['departement'].isin(depts_str)]
-    if clusters:
-        dff = dff[dff['cluster'].isin(clusters)]
-    if companies:
-        dff = dff[dff['entreprise'].isin(companies)]
+    # Filtres et agrégations exécutés en SQL : seuls les agrégats sont chargés
+    agregats = db_manager.tableau_de_bord(cities, depts, clusters, companies)
 
     # KPIs
-    count = len(dff)
-    avg = f"{dff['salaire_annuel'].mean():,.0f} €" if count > 0 else "-"
-    nb_dept = dff['departement'].nunique() if count > 0 else 0
+    kpis = agregats['kpis']
+    count = kpis['count']
+    avg = f"{kpis['salaire_moyen']:,.0f} €" if count > 0 and kpis['salaire_moyen'] is not None else "-"
+    nb_dept = kpis['nb_departements'] if count > 0 else 0
 
     # Figure vide par défaut
     empty = go.Figure().update_layout(
@@ -315,14 +232,8 @@ def update_dashboard(cities, depts, clusters, companies):
         return 0, "-", 0, empty, empty, empty, empty, empty, "Aucune donnée"
 
     # 1. TREEMAP (remplace la carte)
-    dff['region_mapped'] = dff['departement'].apply(dept_to_region)
-
-    # Grouper par région et calculer les statistiques
-    df_region = dff.groupby('region_mapped').agg({
-        'salaire_annuel': ['count', 'mean']
-    }).reset_index()
-    df_region.columns = ['region', 'count', 'avg_salary']
-    df_region = df_region[df_region['region'] != 'Autre']
+    # Nombre d'offres et salaire moyen par région officielle
+    df_region = agregats['regions']
 
     # Créer le treemap
     fig_map = px.treemap(
@@ -347,7 +258,11 @@ def update_dashboard(cities, depts, clusters, companies):
     )
 
     # 2. CAMEMBERT TEMPS
-    fig_time = px.pie(dff, names='temps_travail_label', hole=0.6,
+    temps = agregats['temps_travail']
+    df_time = pd.DataFrame({'temps_travail_label': ["Temps plein", "Temps partiel"],
+                            'count': [temps[1], temps[0]]})
+    df_time = df_time[df_time['count'] > 0]
+    fig_time = px.pie(df_time, names='temps_travail_label', values='count', hole=0.6,
                       color_discrete_sequence=px.colors.qualitative.Prism)
     fig_time.update_layout(
         margin={"r": 10, "t": 10, "l": 10, "b": 10}, showlegend=False,
@@ -355,8 +270,10 @@ def update_dashboard(cities, depts, clusters, companies):
     )
 
     # 3. BARRES SALAIRES
-    cat_counts = dff['categorie_salaire_label'].value_counts().reset_index()
-    cat_counts.columns = ['categorie', 'count']
+    categories = agregats['categorie_salaire']
+    cat_counts = pd.DataFrame({'categorie': ["Haut salaire", "Bas salaire"],
+                               'count': [categories[1], categories[0]]})
+    cat_counts = cat_counts[cat_counts['count'] > 0].sort_values('count', ascending=False)
     fig_cat = px.bar(cat_counts, x='count', y='categorie', orientation='h',
                      text='count', color='categorie',
                      color_discrete_sequence=px.colors.qualitative.Pastel)
@@ -365,8 +282,7 @@ def update_dashboard(cities, depts, clusters, companies):
                           showlegend=False, plot_bgcolor='rgba(0,0,0,0)')
 
     # 4. TOP JOBS
-    top_jobs = dff['emploi'].value_counts().head(10).reset_index()
-    top_jobs.columns = ['emploi', 'count']
+    top_jobs = agregats['top_emplois']
     fig_jobs = px.bar(top_jobs, x='count', y='emploi', orientation='h', text='count')
     fig_jobs.update_layout(margin={"r": 10, "t": 0, "l": 0, "b": 0},
                            yaxis={'autorange': "reversed", 'title': ''},
@@ -374,7 +290,15 @@ def update_dashboard(cities, depts, clusters, companies):
                            plot_bgcolor='rgba(0,0,0,0)')
 
     # 5. BOX PLOT
-    fig_box = px.box(dff, x='cluster', y='salaire_annuel', color='cluster', points=False)
+    # Boîtes construites à partir des quartiles calculés en SQL (moyenne et
+    # écart-type depuis offres_resume)
+    colors = px.colors.qualitative.Plotly
+    fig_box = go.Figure([
+        go.Box(x=[row.cluster], q1=[row.q1], median=[row.median], q3=[row.q3],
+               lowerfence=[row.lowerfence], upperfence=[row.upperfence],
+               mean=[row.mean], sd=[row.sd], name=str(row.cluster), marker_color=colors[i % len(colors)], boxpoints=False)
+        for i, row in enumerate(agregats['salaires_cluster'].itertuples())
+    ])
     fig_box.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 30},
                           showlegend=False, xaxis={'title': 'Cluster'},
                           yaxis={'title': 'Salaire'}, plot_bgcolor='white')
@@ -0,0 +1,93 @@
+"""
+Benchmark FrequencyEncoder : transform historique (DataFrame + Series.map)
+vs lookup vectorisé (factorize + Index.get_indexer dans un tableau préalloué)
+
+    python bench_frequency_encoder.py [--rows 1000000]
+
+Les offres de hellowork_clustered.csv sont rééchantillonnées jusqu'à
+--rows lignes (avec 1 % de valeurs inconnues). Vérifie que les deux
+transform donnent exactement les mêmes valeurs, puis que le pipeline
+picklé model_class.joblib prédit la même chose avec les deux versions.
+"""
+import os
+import time
+import pickle
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from frequency_encoder import FrequencyEncoder
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INPUT = os.path.join(BASE_DIR, "data", "hellowork_clustered.csv")
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_class.joblib")
+COLUMNS = ["emploi", "entreprise", "region", "departement"]
+
+
+def transform_historique(encoder, X):
+    """transform d'origine (copié dans les notebooks)"""
+    X = pd.DataFrame(X, columns=encoder.columns)
+    X_encoded = pd.DataFrame()
+    for col in encoder.columns:
+        X_encoded[col] = X[col].map(encoder.freq_maps_[col]).fillna(0)
+    return X_encoded.values
+
+
+def echantillon(df, rows, seed=42):
+    rng = np.random.default_rng(seed)
+    X = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+
+    inconnues = rng.random(rows) < 0.01
+    X.loc[inconnues, "emploi"] = "Poste inconnu H/F"
+    return X
+
+
+def timed(transform, *args):
+    start = time.perf_counter()
+    out = transform(*args)
+    return out, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark FrequencyEncoder")
+    arg_parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    encoder = FrequencyEncoder(COLUMNS).fit(df[COLUMNS])
+    X = echantillon(df, args.rows)
+
+    reference, t_map = timed(transform_historique, encoder, X[COLUMNS])
+    vectorized, t_lookup = timed(encoder.transform, X[COLUMNS])
+    assert reference.dtype == vectorized.dtype and np.array_equal(reference, vectorized)
+
+    print("=" * 60)
+    print(f"⏱️ FrequencyEncoder.transform : {len(X)} lignes x {len(COLUMNS)} colonnes")
+    print("=" * 60)
+    print(f"   Series.map          {t_map:7.3f}s → {len(X) / t_map:>12,.0f} lignes/s")
+    print(f"   factorize + lookup  {t_lookup:7.3f}s → {len(X) / t_lookup:>12,.0f} lignes/s")
+    print(f"\n🚀 Speed-up : x{t_map / t_lookup:.1f} (résultats identiques ✅)")
+
+    if os.path.exists(MODEL_PATH):
+        import joblib
+        import __main__
+        __main__.FrequencyEncoder = FrequencyEncoder  # classe picklée depuis le notebook
+
+        model = joblib.load(MODEL_PATH)
+        predictions = model.predict(X)
+
+        fitted = model.named_steps["preprocessor"].named_transformers_["cat"]
+        fitted.transform = lambda X_cat: transform_historique(fitted, X_cat)
+        assert np.array_equal(predictions, model.predict(X))
+
+        # l'état picklé ne contient pas les tables de lookup
+        assert "_tables" not in pickle.loads(pickle.dumps(encoder)).__dict__
+        print(f"✅ {os.path.basename(MODEL_PATH)} : prédictions identiques")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
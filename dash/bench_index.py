@@ -0,0 +1,131 @@
+"""
+Benchmark des index de la table offres (plans de requête + temps)
+
+    python bench_index.py [--rows 1000000]
+
+Construit une base temporaire de --rows offres (tirées avec remise dans
+hellowork.db), applique les migrations, puis pour chaque requête chaude
+(rechercher, get_stats, filtres du dashboard) :
+- vérifie avec EXPLAIN QUERY PLAN qu'elle passe par l'index attendu ;
+- compare son temps avec et sans les index.
+"""
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from connection_pool import connect
+from migrations import COLUMNS, INDEXES, migrer
+
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hellowork.db")
+
+
+def plus_frequent(conn, col):
+    """Les deux valeurs les plus fréquentes de col (cas le moins sélectif)"""
+    return conn.execute(f"SELECT {col} FROM offres GROUP BY {col} "
+                        f"ORDER BY COUNT(*) DESC LIMIT 2").fetchall()
+
+
+def requetes(conn):
+    """(libellé, sql, paramètres, index attendu)"""
+    (region,), (region_2,) = plus_frequent(conn, "region")
+    departement = plus_frequent(conn, "departement")[0][0]
+    entreprise = plus_frequent(conn, "entreprise")[0][0]
+
+    return [
+        ("rechercher(region=)", "SELECT * FROM offres WHERE region = ?",
+         (region,), "idx_offres_region"),
+        ("rechercher(departement=)", "SELECT * FROM offres WHERE departement = ?",
+         (departement,), "idx_offres_departement"),
+        ("rechercher(entreprise=)", "SELECT * FROM offres WHERE entreprise = ?",
+         (entreprise,), "idx_offres_entreprise"),
+        ("get_stats: GROUP BY cluster", "SELECT cluster, COUNT(*) FROM offres GROUP BY cluster",
+         (), "idx_offres_cluster"),
+        ("get_stats: DISTINCT entreprise", "SELECT COUNT(DISTINCT entreprise) FROM offres",
+         (), "idx_offres_entreprise"),
+        ("get_stats: DISTINCT departement", "SELECT COUNT(DISTINCT departement) FROM offres",
+         (), "idx_offres_departement"),
+        ("dashboard: region IN + cluster IN",
+         "SELECT COUNT(*), AVG(salaire_annuel) FROM offres "
+         "WHERE region IN (?, ?) AND cluster IN (?, ?)",
+         (region, region_2, 0, 1), "idx_offres_region"),
+    ]
+
+
+def plan(conn, sql, params):
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def chrono(conn, sql, params, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def construire(path, n_rows, seed=42):
+    """Base de n_rows offres tirées avec remise dans SOURCE_DB"""
+    source = sqlite3.connect(SOURCE_DB)
+    rows = source.execute(f"SELECT {', '.join(COLUMNS)} FROM offres").fetchall()
+    source.close()
+
+    picks = np.random.default_rng(seed).integers(0, len(rows), n_rows)
+    date = COLUMNS.index("date_publication")
+    debut = datetime(2025, 1, 1)
+
+    conn = connect(path)
+    migrer(conn, verbose=False)
+    conn.execute("BEGIN IMMEDIATE")
+    # une date distincte par ligne : pas de doublon sur la clé naturelle
+    conn.executemany(f"INSERT INTO offres ({', '.join(COLUMNS)}) "
+                     f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                     (rows[i][:date] + (str(debut + timedelta(seconds=n)),) + rows[i][date + 1:]
+                      for n, i in enumerate(picks)))
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    return conn
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Index de la table offres")
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        conn = construire(os.path.join(tmp, "bench.db"), args.rows)
+        print(f"📦 {args.rows:,} offres chargées en {time.perf_counter() - start:.1f}s")
+
+        hot = requetes(conn)
+        results = []
+        for label, sql, params, index in hot:
+            detail = plan(conn, sql, params)
+            assert index in detail, f"{label}: {index} non utilisé ({detail})"
+            results.append([label, detail, chrono(conn, sql, params)])
+
+        for name in INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        for row, (label, sql, params, _) in zip(results, hot):
+            row.append(chrono(conn, sql, params))
+        conn.close()
+
+    print("=" * 78)
+    print(f"🔎 Requêtes chaudes sur {args.rows:,} lignes (meilleur de 3)")
+    print("=" * 78)
+    for label, detail, t_index, t_scan in results:
+        print(f"   {label:<34} {t_index:9.2f} ms   sans index {t_scan:9.2f} ms"
+              f"   x{t_scan / t_index:.1f}")
+        print(f"      {detail}")
+    print("\n✅ Toutes les requêtes passent par leur index")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de latence : scoring d'une offre via le pipeline sklearn
+(DataFrame 1 ligne + ColumnTransformer) vs prédicteur compilé
+
+    python bench_predictor.py [--n 2000]
+
+Rejoue les offres de la table offres une par une, vérifie que les deux
+chemins donnent exactement les mêmes clusters et probabilités, et
+affiche les latences p50 / p99 de chacun.
+"""
+import time
+import argparse
+
+import numpy as np
+
+from gestionnaire import db_manager
+from model_predictor import ClusterPredictor
+
+
+COLUMNS = ['emploi', 'entreprise', 'region', 'departement',
+           'salaire_annuel', 'categorie_salaire', 'temps_travail']
+
+
+def latences(score, offres):
+    results, timings = [], np.empty(len(offres))
+    for i, offre in enumerate(offres):
+        start = time.perf_counter()
+        results.append(score(offre))
+        timings[i] = time.perf_counter() - start
+    return results, timings * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Latence du scoring unitaire")
+    arg_parser.add_argument("--n", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    predictor = ClusterPredictor('model_class', verbose=False)
+    if predictor.compiled is None:
+        raise SystemExit("❌ Modèle non chargé ou non compilable")
+
+    df = next(db_manager.iter_offres(COLUMNS, chunksize=args.n))
+    offres = list(df[COLUMNS].itertuples(index=False, name=None))
+
+    def sklearn_path(offre):
+        X = predictor.preprocess_input(*offre)
+        return int(predictor.model.predict(X)[0]), predictor.model.predict_proba(X)[0].tolist()
+
+    def compiled_path(offre):
+        features = predictor.preprocess_offre(*offre)
+        return int(predictor.compiled.predict(features)), predictor.compiled.predict_proba(features)
+
+    reference, t_sklearn = latences(sklearn_path, offres)
+    compiled, t_compiled = latences(compiled_path, offres)
+    assert reference == compiled, "résultats différents"
+
+    print("=" * 60)
+    print(f"⏱️ Scoring unitaire : {len(offres)} offres (predict + predict_proba)")
+    print("=" * 60)
+    for label, timings in (("pipeline sklearn", t_sklearn), ("compilé", t_compiled)):
+        print(f"   {label:<18} p50 {np.percentile(timings, 50):9.1f} µs"
+              f"   p99 {np.percentile(timings, 99):9.1f} µs")
+    print(f"\n🚀 Speed-up p50 : x{np.median(t_sklearn) / np.median(t_compiled):.0f}"
+          f" (résultats identiques ✅)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Prédicteur « compilé » pour le scoring d'une offre à la fois
+
+Le pipeline (StandardScaler + FrequencyEncoder + passthrough +
+LogisticRegression) est réduit au chargement à quelques valeurs Python,
+un dict de fréquences par colonne catégorielle et les coefficients en
+NumPy. Une prédiction ne construit plus de DataFrame et ne passe plus par
+le ColumnTransformer : quelques microsecondes au lieu de quelques
+millisecondes.
+
+Le produit matriciel reprend exactement l'opération de sklearn
+(X @ coef.T + intercept sur une matrice 1 x n_features), les résultats
+sont donc identiques bit à bit au pipeline d'origine.
+"""
+import numpy as np
+
+from model_registry import extraire_pipeline, softmax
+
+
+class CompiledModel:
+
+    def __init__(self, features, arrays):
+        self.num = list(features["num"])
+        self.cat = list(features["cat"])
+        self.bin = list(features["bin"])
+
+        self.mean = [float(v) for v in arrays["scaler_mean"]]
+        self.scale = [float(v) for v in arrays["scaler_scale"]]
+        self.freqs = [
+            dict(zip(arrays[f"cat_{col}_categories"].tolist(),
+                     arrays[f"cat_{col}_freqs"].tolist()))
+            for col in self.cat
+        ]
+
+        self.coef_T = np.ascontiguousarray(arrays["coef"]).T
+        self.intercept = np.array(arrays["intercept"])
+        self.classes = np.asarray(arrays["classes"]).tolist()
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Depuis le pipeline sklearn (ValueError si non supporté)"""
+        return cls(*extraire_pipeline(pipeline))
+
+    @classmethod
+    def from_registry_model(cls, model):
+        """Depuis un RegistryModel (model_registry.py)"""
+        return cls(model.features, model.arrays)
+
+    def decision(self, offre):
+        """
+        Args:
+            offre: dict feature → valeur, typé comme preprocess_input
+                   (str, int(departement), float(salaire), int(temps_travail))
+
+        Returns:
+            np.ndarray: scores (1, n_classes), ou (1,) en binaire
+        """
+        row = [(offre[col] - m) / s for col, m, s in zip(self.num, self.mean, self.scale)]
+        row += [freqs.get(offre[col], 0.0) for col, freqs in zip(self.cat, self.freqs)]
+        row += [offre[col] for col in self.bin]
+
+        x = np.array([row], dtype=np.float64)
+        if not np.isfinite(x).all():
+            raise ValueError(f"Valeurs manquantes ou invalides: {offre}")
+        scores = x @ self.coef_T + self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, offre):
+        """Probabilités par classe (mêmes opérations que LogisticRegression.predict_proba)"""
+        from scipy.special import expit
+
+        scores = self.decision(offre)
+        if len(self.classes) <= 2:
+            p = expit(scores)
+            return np.vstack([1 - p, p]).T[0].tolist()
+        return softmax(scores)[0].tolist()
+
+    def predict(self, offre):
+        scores = self.decision(offre)
+        if len(self.classes) <= 2:
+            return self.classes[int(scores[0] > 0)]
+        return self.classes[int(scores[0].argmax())]
@@ -0,0 +1,139 @@
+"""
+Pool de connexions SQLite thread-safe (mode WAL)
+
+    pool = ConnectionPool("hellowork.db", size=5)
+
+    with pool.connexion() as conn:          # lecture (autocommit)
+        conn.execute("SELECT COUNT(*) FROM offres").fetchone()
+
+    with pool.transaction() as conn:        # écriture (BEGIN IMMEDIATE ... COMMIT)
+        conn.execute("UPDATE offres SET cluster = ? WHERE rowid = ?", (1, 42))
+
+Les connexions sont ouvertes une fois et réutilisées par les callbacks Dash
+(threads gunicorn). En WAL, les lecteurs lisent un instantané et ne sont
+jamais bloqués par l'écrivain (formulaire d'ajout) ni ne le bloquent. Chaque
+connexion garde en cache ses requêtes préparées (cached_statements) : les
+requêtes du gestionnaire sont des chaînes constantes, elles ne sont donc
+compilées qu'une fois par connexion.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",        # sûr en WAL, fsync seulement aux checkpoints
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,       # en Kio (64 Mio par connexion)
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,           # ms d'attente si un autre écrivain tient le verrou
+}
+
+
+def connect(db_path, pragmas=PRAGMAS, cached_statements=256):
+    """
+    Connexion configurée (autocommit : les transactions sont explicites)
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                           cached_statements=cached_statements)
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+class ConnectionPool:
+
+    def __init__(self, db_path, size=5, timeout=30.0, pragmas=PRAGMAS):
+        """
+        Args:
+            size: nombre max de connexions ouvertes
+            timeout: attente max (s) d'une connexion libre
+        """
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = pragmas
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("Pool de connexions fermé")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return connect(self.db_path, self.pragmas)
+                except Exception:
+                    self._opened -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Aucune connexion libre après {self.timeout}s") from None
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connexion(self):
+        """Connexion empruntée au pool, rendue à la sortie du bloc"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Connexion dans une transaction d'écriture : COMMIT en sortie,
+        ROLLBACK si exception
+        """
+        with self.connexion() as conn:
+            # IMMEDIATE : verrou d'écriture pris tout de suite (pas d'erreur
+            # « database is locked » au milieu de la transaction)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self):
+        """Ferme les connexions libres (celles empruntées le seront à leur retour)"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,13 +1,26 @@
-import pandas as pd
 import os
+import sys
+import argparse
 from gestionnaire import db_manager
+from ingestion import afficher, inserer_offres
+
+# lecture des artefacts typés (etl/artifacts.py)
+ETL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl")
+if ETL_DIR not in sys.path:
+    sys.path.append(ETL_DIR)
+import artifacts
 
 # Configuration
 CSV_FILE = r"C:\Projects\Project Bi\data\hellowork_clustered.csv"
 
 
-def import_csv_to_db(csv_path):
-    """Importe un CSV dans la base de données"""
+def import_csv_to_db(csv_path, remplacer=False, mode="ignore"):
+    """
+    Importe un CSV dans la base de données
+
+    Par défaut les offres sont ajoutées à la table (chargement quotidien
+    incrémental, doublons ignorés) ; remplacer=True vide la table d'abord.
+    """
 
     # Vérification
     if not os.path.exists(csv_path):
@@ -17,8 +30,8 @@ def import_csv_to_db(csv_path):
     print(f"✅ CSV trouvé: {csv_path}")
 
     try:
-        # Lecture
-        df = pd.read_csv(csv_path)
+        # Lecture (CSV ou artefact Parquet), typée comme la sortie de l'ETL
+        df = artifacts.lire(csv_path, "clustered")
         print(f"📊 {len(df)} lignes lues")
         print(f"   Colonnes: {df.columns.tolist()}")
 
@@ -35,11 +48,6 @@ def import_csv_to_db(csv_path):
 
         df.rename(columns=column_mapping, inplace=True)
 
-        # Nettoyage
-        if 'departement' in df.columns:
-            df['departement'] = df['departement'].apply(
-                lambda x: str(x).zfill(2) if pd.notnull(x) else "00")
-
         # Colonnes requises
         required = ['emploi', 'entreprise', 'region', 'departement',
                     'salaire_annuel', 'categorie_salaire', 'temps_travail', 'cluster']
@@ -48,12 +56,12 @@ def import_csv_to_db(csv_path):
             if col not in df.columns:
                 df[col] = None
 
-        # Insertion
-        conn = db_manager.get_connection()
-        df.to_sql("offres", conn, if_exists="replace", index=False)
-        conn.close()
+        # Insertion en masse (une transaction, département normalisé en SQL)
+        with db_manager.connexion() as conn:
+            stats = inserer_offres(conn, df, mode=mode, remplacer=remplacer)
 
-        print(f"🎉 Import réussi: {len(df)} offres")
+        afficher(stats)
+        print(f"🎉 Import réussi: {stats['inserees']} nouvelles offres")
         print(f"   Base: {db_manager.db_path}")
 
         return True
@@ -64,11 +72,20 @@ def import_csv_to_db(csv_path):
 
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Import CSV → base de données")
+    arg_parser.add_argument("csv", nargs="?", default=CSV_FILE)
+    arg_parser.add_argument("--remplacer", action="store_true", help="vide la table avant l'import")
+    arg_parser.add_argument("--upsert", action="store_true",
+                            help="met à jour les offres déjà présentes au lieu de les ignorer")
+    args = arg_parser.parse_args()
+
     print("\n" + "=" * 60)
     print("📥 IMPORT CSV → BASE DE DONNÉES")
     print("=" * 60 + "\n")
 
-    success = import_csv_to_db(CSV_FILE)
+    db_manager.init_db()
+    success = import_csv_to_db(args.csv, remplacer=args.remplacer,
+                               mode="update" if args.upsert else "ignore")
 
     if success:
         stats = db_manager.get_stats()
@@ -1,39 +1,66 @@
-import pandas as pd
 import sqlite3
 import os
+import sys
+import argparse
 
-# Nom des fichiers
-csv_file = "C:/Projects/Project Bi/data/hellowork_clustered.csv"
-db_file = "hellowork.db"
-
-# 1. Vérifier si le CSV existe
-if not os.path.exists(csv_file):
-    print(f"❌ ERREUR : Le fichier '{csv_file}' est introuvable !")
-    print("👉 Assurez-vous qu'il est dans le même dossier que ce script.")
-    exit()
-
-print("✅ Fichier CSV trouvé. Lecture en cours...")
-
-# 2. Lecture du CSV
-try:
-    df = pd.read_csv(csv_file)
-    print(f"📊 {len(df)} lignes lues dans le CSV.")
-except Exception as e:
-    print(f"❌ Erreur de lecture CSV : {e}")
-    exit()
-
-# 3. Connexion et import en base
-try:
-    conn = sqlite3.connect(db_file)
-
-    # On écrase la table 'offres' si elle existe déjà pour repartir propre
-    df.to_sql("offres", conn, if_exists="replace", index=False)
-
-    # Vérification
-    cursor = conn.cursor()
-    count = cursor.execute("SELECT count(*) FROM offres").fetchone()[0]
-    print(f"🎉 SUCCÈS : {count} offres importées dans '{db_file}'.")
-
-    conn.close()
-except Exception as e:
-    print(f"❌ Erreur SQLite : {e}")
\ No newline at end of file
+from migrations import migrer
+from ingestion import afficher, inserer_offres
+
+# lecture des artefacts typés (etl/artifacts.py)
+ETL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl")
+if ETL_DIR not in sys.path:
+    sys.path.append(ETL_DIR)
+import artifacts
+
+# Nom des fichiers (CSV ou artefact Parquet typé de etl/artifacts.py)
+CSV_FILE = "C:/Projects/Project Bi/data/hellowork_clustered.csv"
+DB_FILE = "hellowork.db"
+
+
+def recharger(csv_file=CSV_FILE, db_file=DB_FILE):
+    """Vide la table offres et la recharge depuis csv_file, True si réussi"""
+
+    # 1. Vérifier si le CSV existe
+    if not os.path.exists(csv_file):
+        print(f"❌ ERREUR : Le fichier '{csv_file}' est introuvable !")
+        print("👉 Assurez-vous qu'il est dans le même dossier que ce script.")
+        return False
+
+    print("✅ Fichier CSV trouvé. Lecture en cours...")
+
+    # 2. Lecture du CSV (même typage que la sortie de l'ETL)
+    try:
+        df = artifacts.lire(csv_file, "clustered")
+        print(f"📊 {len(df)} lignes lues dans le CSV.")
+    except Exception as e:
+        print(f"❌ Erreur de lecture CSV : {e}")
+        return False
+
+    # 3. Connexion et import en base
+    try:
+        conn = sqlite3.connect(db_file, isolation_level=None)
+        migrer(conn)
+
+        # On vide la table 'offres' pour repartir propre (sans la supprimer :
+        # if_exists="replace" perdrait la clé primaire et les index)
+        afficher(inserer_offres(conn, df, remplacer=True))
+
+        # Vérification
+        cursor = conn.cursor()
+        count = cursor.execute("SELECT count(*) FROM offres").fetchone()[0]
+        print(f"🎉 SUCCÈS : {count} offres importées dans '{db_file}'.")
+
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"❌ Erreur SQLite : {e}")
+        return False
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Recharge la table offres (vidée) depuis un CSV ou un Parquet")
+    arg_parser.add_argument("fichier", nargs="?", default=CSV_FILE)
+    arg_parser.add_argument("--db", default=DB_FILE)
+    args = arg_parser.parse_args()
+
+    recharger(args.fichier, args.db)
@@ -3,12 +3,18 @@ Encodeur de fréquence pour les variables catégorielles
 Doit être importé AVANT de charger le modèle
 """
 from sklearn.base import BaseEstimator, TransformerMixin
+import numpy as np
 import pandas as pd
 
 
 class FrequencyEncoder(BaseEstimator, TransformerMixin):
     """
     Encode les variables catégorielles en utilisant leur fréquence d'apparition
+
+    freq_maps_ (value_counts par colonne) reste l'état appris et picklé : les
+    pipelines existants se chargent tels quels. Les tables de lookup (Index
+    des catégories + tableau de fréquences) en sont dérivées au premier
+    transform et ne sont pas picklées.
     """
     def __init__(self, columns):
         self.columns = columns
@@ -18,11 +24,38 @@ class FrequencyEncoder(BaseEstimator, TransformerMixin):
         X = pd.DataFrame(X, columns=self.columns)
         for col in self.columns:
             self.freq_maps_[col] = X[col].value_counts(normalize=True)
+        self._tables = None
         return self
 
+    def _lookup_tables(self):
+        """Par colonne : (Index des catégories, fréquences + 0 final pour les inconnues)"""
+        tables = getattr(self, "_tables", None)
+        if tables is None:
+            tables = [
+                (pd.Index(self.freq_maps_[col].index),
+                 np.append(self.freq_maps_[col].to_numpy(dtype=np.float64), 0.0))
+                for col in self.columns
+            ]
+            self._tables = tables
+        return tables
+
     def transform(self, X):
-        X = pd.DataFrame(X, columns=self.columns)
-        X_encoded = pd.DataFrame()
-        for col in self.columns:
-            X_encoded[col] = X[col].map(self.freq_maps_[col]).fillna(0)
-        return X_encoded.values
\ No newline at end of file
+        if isinstance(X, pd.DataFrame):
+            columns = [X[col] for col in self.columns]
+        else:
+            X = np.asarray(X)
+            columns = [X[:, j] for j in range(len(self.columns))]
+
+        X_encoded = np.empty((len(X), len(self.columns)), dtype=np.float64)
+        for j, (values, (categories, freqs)) in enumerate(zip(columns, self._lookup_tables())):
+            # lookup sur les valeurs distinctes seulement, puis gather par code ;
+            # -1 (catégorie inconnue ou NaN) → dernier élément, fréquence 0
+            codes, uniques = pd.factorize(values)
+            positions = np.append(categories.get_indexer(uniques), -1)
+            X_encoded[:, j] = freqs[positions[codes]]
+        return X_encoded
+
+    def __getstate__(self):
+        state = dict(super().__getstate__())
+        state.pop("_tables", None)
+        return state
@@ -1,76 +1,79 @@
-import sqlite3
 import pandas as pd
 from datetime import datetime
 import os
 
+from connection_pool import ConnectionPool, connect
+from migrations import colonnes, migrer, schema_a_jour
+from ingestion import afficher, inserer_offres
+import requetes
+
 
 class GestionnaireOffres:
-    def __init__(self, db_name="hellowork.db"):
-        """Initialise le gestionnaire de base de données"""
+    def __init__(self, db_name="hellowork.db", pool_size=5, migrer_schema=False):
+        """
+        Initialise le gestionnaire de base de données
+
+        Les méthodes empruntent une connexion à un pool partagé (WAL) au lieu
+        d'ouvrir une connexion par requête : utilisable depuis les threads
+        des callbacks Dash, et comme context manager (ferme le pool).
+
+        La base n'est pas migrée à la création (import de app, rescore...) :
+        migrer_schema=True, init_db() ou python migrations.py appliquent les
+        migrations en attente.
+        """
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.db_path = os.path.join(base_dir, db_name)
-        self.init_db()
+        self.pool = ConnectionPool(self.db_path, size=pool_size)
+        if migrer_schema:
+            self.init_db()
+        else:
+            self.verifier_schema()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
 
     def get_connection(self):
-        """Retourne une connexion SQLite"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Retourne une connexion SQLite dédiée (hors pool, à fermer par l'appelant)"""
+        return connect(self.db_path)
+
+    def connexion(self):
+        """Connexion du pool (context manager, lecture)"""
+        return self.pool.connexion()
+
+    def transaction(self):
+        """Connexion du pool dans une transaction d'écriture (context manager)"""
+        return self.pool.transaction()
 
     def init_db(self):
-        """Crée la table si elle n'existe pas"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-                       CREATE TABLE IF NOT EXISTS offres
-                       (
-                           id
-                           INTEGER
-                           PRIMARY
-                           KEY
-                           AUTOINCREMENT,
-                           emploi
-                           TEXT
-                           NOT
-                           NULL,
-                           entreprise
-                           TEXT
-                           NOT
-                           NULL,
-                           date_publication
-                           TEXT,
-                           temps_travail
-                           INTEGER,
-                           salaire_annuel
-                           REAL,
-                           categorie_salaire
-                           INTEGER,
-                           region
-                           TEXT,
-                           departement
-                           INTEGER,
-                           cluster
-                           INTEGER
-                           DEFAULT
-                           0
-                       )
-                       """)
-
-        conn.commit()
-        conn.close()
+        """Crée la table si elle n'existe pas et applique les migrations (index)"""
+        with self.connexion() as conn:
+            migrer(conn)
+
         print(f"✅ Base de données: {self.db_path}")
 
+    def verifier_schema(self):
+        """Avertit, sans rien écrire, si des migrations sont en attente"""
+        with self.connexion() as conn:
+            if not schema_a_jour(conn):
+                print(f"⚠️ Schéma de {self.db_path} pas à jour : "
+                      f"lancer python migrations.py")
+
     def get_all_data(self):
         """Récupère toutes les offres"""
-        conn = self.get_connection()
         try:
-            df = pd.read_sql_query("SELECT * FROM offres", conn)
+            with self.connexion() as conn:
+                df = pd.read_sql_query("SELECT * FROM offres", conn)
             print(f"📊 {len(df)} offres récupérées")
             return df
         except Exception as e:
             print(f"⚠️ Erreur lecture: {e}")
             return pd.DataFrame()
-        finally:
-            conn.close()
 
     def ajouter(self, emploi, entreprise, region, departement,
                 salaire, categorie, temps, cluster=0):
@@ -80,20 +83,17 @@ class GestionnaireOffres:
         Returns:
             bool: True si succès
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
         date_pub = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         try:
-            cursor.execute("""
-                           INSERT INTO offres
-                           (emploi, entreprise, date_publication, temps_travail,
-                            salaire_annuel, categorie_salaire, region, departement, cluster)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                           """, (emploi, entreprise, date_pub, temps, salaire,
-                                 categorie, region, departement, cluster))
-
-            conn.commit()
+            with self.transaction() as conn:
+                conn.execute("""
+                             INSERT INTO offres
+                             (emploi, entreprise, date_publication, temps_travail,
+                              salaire_annuel, categorie_salaire, region, departement, cluster)
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                             """, (emploi, entreprise, date_pub, temps, salaire,
+                                   categorie, region, departement, cluster))
 
             print("=" * 60)
             print("✅ OFFRE AJOUTÉE")
@@ -108,17 +108,28 @@ class GestionnaireOffres:
         except Exception as e:
             print(f"❌ Erreur ajout: {e}")
             return False
-        finally:
-            conn.close()
+
+    def ajouter_batch(self, offres, mode="ignore", chunksize=50_000):
+        """
+        Ajoute des offres en masse (une transaction, executemany)
+
+        Args:
+            offres: DataFrame, ou itérable de dicts / tuples
+            mode: "ignore" (doublons de la clé naturelle ignorés) ou "update" (upsert)
+
+        Returns:
+            dict: lues, inserees, mises_a_jour, ignorees, secondes, lignes_par_s
+        """
+        with self.connexion() as conn:
+            stats = inserer_offres(conn, offres, mode=mode, chunksize=chunksize)
+        afficher(stats)
+        return stats
 
     def supprimer(self, offre_id):
         """Supprime une offre par ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("DELETE FROM offres WHERE id = ?", (offre_id,))
-            conn.commit()
+            with self.transaction() as conn:
+                cursor = conn.execute("DELETE FROM offres WHERE id = ?", (offre_id,))
 
             if cursor.rowcount > 0:
                 print(f"✅ Offre {offre_id} supprimée")
@@ -130,8 +141,6 @@ class GestionnaireOffres:
         except Exception as e:
             print(f"❌ Erreur suppression: {e}")
             return False
-        finally:
-            conn.close()
 
     def modifier(self, offre_id, **kwargs):
         """
@@ -141,9 +150,6 @@ class GestionnaireOffres:
             offre_id: ID de l'offre
             **kwargs: Champs à modifier (emploi, entreprise, etc.)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         updates = []
         params = []
 
@@ -160,8 +166,8 @@ class GestionnaireOffres:
         query = f"UPDATE offres SET {', '.join(updates)} WHERE id = ?"
 
         try:
-            cursor.execute(query, params)
-            conn.commit()
+            with self.transaction() as conn:
+                cursor = conn.execute(query, params)
 
             if cursor.rowcount > 0:
                 print(f"✅ Offre {offre_id} modifiée")
@@ -173,13 +179,36 @@ class GestionnaireOffres:
         except Exception as e:
             print(f"❌ Erreur modification: {e}")
             return False
-        finally:
-            conn.close()
+
+    def iter_offres(self, colonnes=None, chunksize=50_000):
+        """
+        Parcourt la table offres par morceaux (mémoire bornée)
+
+        Yields:
+            DataFrame indexé par rowid
+        """
+        select = ", ".join(colonnes) if colonnes else "*"
+        query = f"SELECT rowid AS _rowid, {select} FROM offres ORDER BY rowid"
+        with self.connexion() as conn:
+            for chunk in pd.read_sql_query(query, conn, chunksize=chunksize):
+                yield chunk.set_index("_rowid")
+
+    def modifier_clusters(self, rowids, clusters):
+        """
+        Réécrit la colonne cluster en masse (une transaction, executemany)
+
+        Returns:
+            int: nombre de lignes modifiées
+        """
+        with self.transaction() as conn:
+            cursor = conn.executemany(
+                "UPDATE offres SET cluster = ? WHERE rowid = ?",
+                zip(map(int, clusters), map(int, rowids))
+            )
+        return cursor.rowcount
 
     def rechercher(self, **criteres):
         """Recherche des offres selon des critères"""
-        conn = self.get_connection()
-
         try:
             conditions = []
             params = []
@@ -189,11 +218,12 @@ class GestionnaireOffres:
                     conditions.append(f"{key} = ?")
                     params.append(value)
 
-            if conditions:
-                query = f"SELECT * FROM offres WHERE {' AND '.join(conditions)}"
-                df = pd.read_sql_query(query, conn, params=params)
-            else:
-                df = pd.read_sql_query("SELECT * FROM offres", conn)
+            with self.connexion() as conn:
+                if conditions:
+                    query = f"SELECT * FROM offres WHERE {' AND '.join(conditions)}"
+                    df = pd.read_sql_query(query, conn, params=params)
+                else:
+                    df = pd.read_sql_query("SELECT * FROM offres", conn)
 
             print(f"🔍 {len(df)} offres trouvées")
             return df
@@ -201,39 +231,37 @@ class GestionnaireOffres:
         except Exception as e:
             print(f"❌ Erreur recherche: {e}")
             return pd.DataFrame()
-        finally:
-            conn.close()
-
-    def get_stats(self):
-        """Récupère des statistiques"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
 
-        try:
-            stats = {}
-
-            cursor.execute("SELECT COUNT(*) FROM offres")
-            stats['total_offres'] = cursor.fetchone()[0]
-
-            cursor.execute("SELECT AVG(salaire_annuel) FROM offres")
-            stats['salaire_moyen'] = cursor.fetchone()[0]
+    # -------------------------------------------------
+    # REQUETES DU DASHBOARD (agrégats calculés en SQL, cf. requetes.py)
+    # -------------------------------------------------
+    def tableau_de_bord(self, cities=None, depts=None, clusters=None, companies=None):
+        """KPIs et agrégats de chaque graphique pour les filtres donnés"""
+        with self.connexion() as conn:
+            return requetes.tableau_de_bord(conn, requetes.Filtre(cities, depts, clusters, companies))
 
-            cursor.execute("SELECT cluster, COUNT(*) FROM offres GROUP BY cluster")
-            stats['offres_par_cluster'] = dict(cursor.fetchall())
+    def valeurs_distinctes(self, colonne, limit=None, **filtres):
+        """Valeurs distinctes d'une colonne (options des listes déroulantes)"""
+        with self.connexion() as conn:
+            return requetes.valeurs_distinctes(conn, colonne, requetes.Filtre(**filtres), limit)
 
-            cursor.execute("SELECT COUNT(DISTINCT entreprise) FROM offres")
-            stats['nb_entreprises'] = cursor.fetchone()[0]
+    def villes_de_region(self, region):
+        with self.connexion() as conn:
+            return requetes.villes_de_region(conn, region)
 
-            cursor.execute("SELECT COUNT(DISTINCT departement) FROM offres")
-            stats['nb_departements'] = cursor.fetchone()[0]
+    def colonnes(self):
+        with self.connexion() as conn:
+            return colonnes(conn)
 
-            return stats
+    def get_stats(self):
+        """Récupère des statistiques (lues dans la table de synthèse offres_resume)"""
+        try:
+            with self.connexion() as conn:
+                return requetes.statistiques(conn)
 
         except Exception as e:
             print(f"❌ Erreur stats: {e}")
             return {}
-        finally:
-            conn.close()
 
 
 # Instance globale
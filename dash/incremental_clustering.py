@@ -0,0 +1,244 @@
+"""
+Clustering incrémental des offres (MiniBatchKMeans)
+
+    python incremental_clustering.py [--chunksize 5000] [--dry-run] [--reset]
+
+Même préprocesseur que le notebook de clustering (StandardScaler +
+FrequencyEncoder + passthrough), mais mis à jour par lots : le scaler via
+partial_fit, les fréquences via des comptages cumulés. Les centres
+MiniBatchKMeans évoluent avec partial_fit sur les nouvelles offres
+seulement (rowid > dernier rowid traité), sans recalcul complet.
+
+Identifiants de clusters stables :
+- au premier lancement, les centres sont initialisés sur les clusters
+  déjà présents dans la table (moyenne de chaque cluster existant) ;
+- partial_fit conserve l'ordre des centres ;
+- refit_complet() réaligne les nouveaux centres sur les anciens
+  (affectation hongroise sur les distances).
+
+L'état (préprocesseur, comptages, modèle, dernier rowid) est sauvegardé
+avec joblib, puis les affectations modifiées sont réécrites en masse.
+"""
+import os
+import time
+import argparse
+
+import joblib
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import StandardScaler
+
+from frequency_encoder import FrequencyEncoder
+
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clustering_state.joblib")
+
+NUMERIC_FEATURES = ["salaire_annuel"]
+BINARY_FEATURES = ["temps_travail", "categorie_salaire"]
+CATEGORICAL_FEATURES = ["emploi", "entreprise", "region", "departement"]
+FEATURES = NUMERIC_FEATURES + BINARY_FEATURES + CATEGORICAL_FEATURES
+
+
+def build_preprocessor():
+    """ColumnTransformer du notebook cluster.ipynb"""
+    return ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), NUMERIC_FEATURES),
+            ("cat", FrequencyEncoder(CATEGORICAL_FEATURES), CATEGORICAL_FEATURES),
+            ("bin", "passthrough", BINARY_FEATURES),
+        ],
+        remainder="drop"
+    )
+
+
+def aligner_centres(reference, centres):
+    """
+    Permutation qui réordonne centres au plus près de reference
+
+    Returns:
+        np.ndarray: ordre tel que centres[ordre][i] ≈ reference[i]
+    """
+    distances = ((reference[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2)
+    _, ordre = linear_sum_assignment(distances)
+    return ordre
+
+
+class IncrementalClusterer:
+
+    def __init__(self, n_clusters=3, batch_size=1024, random_state=42):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+        self.preprocessor = None
+        self.counts = {}
+        self.kmeans = None
+        self.last_rowid = 0
+        self.n_seen = 0
+
+    # -------------------------------------------------
+    # PREPROCESSEUR INCREMENTAL
+    # -------------------------------------------------
+    def _update_preprocessor(self, df):
+        if self.preprocessor is None:
+            self.preprocessor = build_preprocessor().fit(df[FEATURES])
+            self.counts = {col: df[col].value_counts() for col in CATEGORICAL_FEATURES}
+            return
+
+        self.preprocessor.named_transformers_["num"].partial_fit(df[NUMERIC_FEATURES])
+
+        encoder = self.preprocessor.named_transformers_["cat"]
+        for col in CATEGORICAL_FEATURES:
+            counts = self.counts[col].add(df[col].value_counts(), fill_value=0)
+            self.counts[col] = counts
+            encoder.freq_maps_[col] = counts / counts.sum()
+        encoder._tables = None
+
+    def transform(self, df):
+        return self.preprocessor.transform(df[FEATURES])
+
+    # -------------------------------------------------
+    # CLUSTERING
+    # -------------------------------------------------
+    def _new_kmeans(self, init="k-means++"):
+        return MiniBatchKMeans(n_clusters=self.n_clusters, init=init,
+                               n_init=1 if not isinstance(init, str) else 3,
+                               batch_size=self.batch_size, random_state=self.random_state)
+
+    def partial_fit(self, df, labels=None):
+        """
+        Met à jour préprocesseur et centres avec un lot d'offres
+
+        Args:
+            labels: clusters existants du lot, utilisés au premier appel pour
+                    initialiser les centres (identifiants conservés)
+        """
+        valid = df[NUMERIC_FEATURES + BINARY_FEATURES].notna().all(axis=1).to_numpy()
+        if labels is not None:
+            labels = np.asarray(labels)
+            if len(labels) != len(df):
+                raise ValueError(f"labels: {len(labels)} valeurs pour {len(df)} offres")
+            # mêmes lignes que df après suppression des valeurs manquantes
+            labels = labels[valid]
+
+        df = df[valid]
+        if df.empty:
+            return self
+
+        self._update_preprocessor(df)
+        X = self.transform(df)
+
+        if self.kmeans is None:
+            init = "k-means++"
+            if labels is not None and len(np.unique(labels)) == self.n_clusters:
+                init = np.vstack([X[labels == c].mean(axis=0)
+                                  for c in range(self.n_clusters)])
+            elif labels is not None:
+                print(f"⚠️ {len(np.unique(labels))} clusters existants pour {self.n_clusters} "
+                      f"attendus : centres initialisés par k-means++")
+            self.kmeans = self._new_kmeans(init)
+
+        self.kmeans.partial_fit(X)
+        self.n_seen += len(X)
+        return self
+
+    def refit_complet(self, df):
+        """
+        Recalcul complet des centres sur df, réalignés sur les identifiants
+        actuels
+        """
+        df = df.dropna(subset=NUMERIC_FEATURES + BINARY_FEATURES)
+        X = self.transform(df)
+        kmeans = self._new_kmeans().fit(X)
+
+        if self.kmeans is not None:
+            ordre = aligner_centres(self.kmeans.cluster_centers_, kmeans.cluster_centers_)
+            kmeans.cluster_centers_ = kmeans.cluster_centers_[ordre]
+            kmeans.labels_ = np.argsort(ordre)[kmeans.labels_]
+
+        self.kmeans = kmeans
+        return self
+
+    def predict(self, df, default=0):
+        """Cluster de chaque offre (default si salaire ou temps de travail manquant)"""
+        clusters = np.full(len(df), default, dtype=np.int64)
+        valid = df[NUMERIC_FEATURES + BINARY_FEATURES].notna().all(axis=1).to_numpy()
+        if self.kmeans is not None and valid.any():
+            clusters[valid] = self.kmeans.predict(self.transform(df[valid]))
+        return clusters
+
+    # -------------------------------------------------
+    # PERSISTANCE
+    # -------------------------------------------------
+    def save(self, path=STATE_PATH):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path=STATE_PATH):
+        return joblib.load(path)
+
+
+def mise_a_jour(clusterer, db_manager, chunksize=5000, dry_run=False):
+    """
+    partial_fit sur les offres ajoutées depuis la dernière mise à jour, puis
+    réaffectation de toute la table et écriture en masse des clusters modifiés
+
+    Returns:
+        dict: nouvelles offres, lignes dont le cluster change, lignes écrites
+    """
+    stats = {"nouvelles": 0, "changees": 0, "ecrites": 0}
+    colonnes = FEATURES + ["cluster"]
+
+    for chunk in db_manager.iter_offres(colonnes, chunksize):
+        nouvelles = chunk[chunk.index > clusterer.last_rowid]
+        if nouvelles.empty:
+            continue
+
+        labels = nouvelles["cluster"].to_numpy() if clusterer.kmeans is None else None
+        clusterer.partial_fit(nouvelles, labels)
+        clusterer.last_rowid = int(nouvelles.index.max())
+        stats["nouvelles"] += len(nouvelles)
+
+    for chunk in db_manager.iter_offres(colonnes, chunksize):
+        clusters = clusterer.predict(chunk)
+        changed = chunk["cluster"].to_numpy() != clusters
+        stats["changees"] += int(changed.sum())
+        if changed.any() and not dry_run:
+            stats["ecrites"] += db_manager.modifier_clusters(chunk.index[changed],
+                                                             clusters[changed])
+
+    return stats
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Clustering incrémental des offres")
+    arg_parser.add_argument("--state", default=STATE_PATH)
+    arg_parser.add_argument("--n-clusters", type=int, default=3)
+    arg_parser.add_argument("--chunksize", type=int, default=5000)
+    arg_parser.add_argument("--reset", action="store_true", help="repart d'un état vide")
+    arg_parser.add_argument("--dry-run", action="store_true")
+    args = arg_parser.parse_args()
+
+    from gestionnaire import db_manager
+
+    if os.path.exists(args.state) and not args.reset:
+        clusterer = IncrementalClusterer.load(args.state)
+        print(f"📂 État chargé: {clusterer.n_seen} offres vues, dernier rowid {clusterer.last_rowid}")
+    else:
+        clusterer = IncrementalClusterer(n_clusters=args.n_clusters)
+
+    start = time.perf_counter()
+    stats = mise_a_jour(clusterer, db_manager, args.chunksize, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    if not args.dry_run:
+        clusterer.save(args.state)
+
+    print("=" * 60)
+    print(f"🧩 Clustering incrémental{' [dry-run]' if args.dry_run else ''} ({elapsed:.2f}s)")
+    print("=" * 60)
+    print(f"   {stats['nouvelles']} nouvelles offres intégrées (partial_fit)")
+    print(f"   {stats['changees']} clusters modifiés, {stats['ecrites']} lignes écrites")
+    print("=" * 60)
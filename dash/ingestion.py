@@ -0,0 +1,170 @@
+"""
+Ingestion en masse des offres (executemany, une transaction)
+
+    from ingestion import inserer_offres
+
+    stats = inserer_offres(conn, df)                    # ajout, doublons ignorés
+    stats = inserer_offres(conn, df, mode="update")     # upsert
+    stats = inserer_offres(conn, df, remplacer=True)    # vide la table d'abord
+
+Les lignes (DataFrame, dicts ou tuples dans l'ordre de COLUMNS) sont
+chargées par paquets dans une table temporaire, dédoublonnée sur la clé
+naturelle (emploi, entreprise, region, date_publication ; première
+occurrence gardée en mode "ignore", dernière en mode "update"), puis
+copiées dans offres par un INSERT ... SELECT ... ON CONFLICT sur cette
+clé : les offres déjà présentes sont ignorées ou mises à jour selon le
+mode. Les compteurs viennent de changes() (rowcount), sans COUNT(*) sur
+offres.
+
+Le département est stocké en entier (colonne INTEGER : « 03 », « 3.0 »
+→ 3), une valeur vide devient NULL ; un code non numérique (« 2A ») est
+gardé tel quel.
+
+La connexion doit être en autocommit (isolation_level=None, cf.
+connection_pool.connect) : tout le chargement est une seule transaction.
+"""
+import time
+from datetime import datetime
+from itertools import islice
+
+import pandas as pd
+
+from migrations import COLUMNS, CLE_NATURELLE, CLE_SQL, cle_sql
+
+
+STAGING = "temp.offres_import"
+
+# l'affinité INTEGER de la colonne convertit « 03 » / « 3.0 » en 3
+DEPARTEMENT_SQL = "NULLIF(trim(CAST(departement AS TEXT)), '')"
+
+MODES = ("ignore", "update")
+
+
+def _creer_staging(conn):
+    # colonnes sans type : les valeurs sont copiées telles quelles, la
+    # conversion se fait à l'insertion dans offres
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS offres_import ({', '.join(COLUMNS)})")
+    conn.execute(f"DELETE FROM {STAGING}")
+
+
+def _valeur(value):
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item"):
+        # scalaires NumPy
+        return value.item()
+    return value
+
+
+def _lignes(offres):
+    """DataFrame, dicts ou tuples → tuples dans l'ordre de COLUMNS"""
+    if isinstance(offres, pd.DataFrame):
+        offres = offres.reindex(columns=COLUMNS).astype(object)
+        offres = offres.where(offres.notna(), None).itertuples(index=False, name=None)
+
+    for offre in offres:
+        if isinstance(offre, dict):
+            offre = [offre.get(col) for col in COLUMNS]
+        yield tuple(_valeur(value) for value in offre)
+
+
+def _dedoublonner_sql(mode):
+    """Supprime de la table temporaire les doublons de la clé naturelle"""
+    garder = "MIN" if mode == "ignore" else "MAX"
+    return (f"DELETE FROM {STAGING} WHERE rowid NOT IN "
+            f"(SELECT {garder}(rowid) FROM {STAGING} GROUP BY {', '.join(CLE_SQL)})")
+
+
+def _existantes_sql():
+    """Lignes de la table temporaire déjà présentes dans offres (index idx_offres_cle)"""
+    match = " AND ".join(f"{o} = {s}" for o, s in zip(cle_sql("o."), cle_sql("s.")))
+    return (f"SELECT COUNT(*) FROM {STAGING} s "
+            f"WHERE EXISTS (SELECT 1 FROM offres o WHERE {match})")
+
+
+def _insert_sql(mode):
+    cle = ", ".join(CLE_SQL)
+    select = ", ".join(DEPARTEMENT_SQL if col == "departement"
+                       else "COALESCE(cluster, 0)" if col == "cluster"
+                       else col
+                       for col in COLUMNS)
+    sql = (f"INSERT INTO offres ({', '.join(COLUMNS)}) "
+           f"SELECT {select} FROM {STAGING} WHERE true "
+           f"ON CONFLICT ({cle}) DO ")
+    if mode == "ignore":
+        return sql + "NOTHING"
+
+    updates = ", ".join(f"{col} = excluded.{col}"
+                        for col in COLUMNS if col not in CLE_NATURELLE)
+    return sql + f"UPDATE SET {updates}"
+
+
+def inserer_offres(conn, offres, mode="ignore", remplacer=False, chunksize=50_000):
+    """
+    Ajoute des offres en une transaction (executemany par paquets)
+
+    Args:
+        offres: DataFrame, ou itérable de dicts / tuples (ordre de COLUMNS)
+        mode: "ignore" (doublons de la clé naturelle ignorés) ou "update" (upsert)
+        remplacer: vide la table avant l'insertion (même transaction)
+        chunksize: lignes par paquet (mémoire bornée pour un itérateur)
+
+    Returns:
+        dict: lues, inserees, mises_a_jour, ignorees, secondes, lignes_par_s
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(MODES)})")
+
+    insert_sql = _insert_sql(mode)
+    dedoublonner_sql = _dedoublonner_sql(mode)
+    staging_sql = (f"INSERT INTO {STAGING} ({', '.join(COLUMNS)}) "
+                   f"VALUES ({', '.join('?' * len(COLUMNS))})")
+    stats = {"lues": 0, "inserees": 0, "mises_a_jour": 0, "ignorees": 0}
+
+    start = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if remplacer:
+            conn.execute("DELETE FROM offres")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'offres'")
+        _creer_staging(conn)
+
+        lignes = _lignes(offres)
+        while True:
+            paquet = list(islice(lignes, chunksize))
+            if not paquet:
+                break
+
+            conn.executemany(staging_sql, paquet)
+            conn.execute(dedoublonner_sql)
+            # en mode update, changes() compte insertions + mises à jour
+            existantes = (conn.execute(_existantes_sql()).fetchone()[0]
+                          if mode == "update" else 0)
+            changes = conn.execute(insert_sql).rowcount
+            conn.execute(f"DELETE FROM {STAGING}")
+
+            stats["lues"] += len(paquet)
+            stats["inserees"] += changes - existantes
+            stats["mises_a_jour"] += existantes
+
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    elapsed = time.perf_counter() - start
+    stats["ignorees"] = stats["lues"] - stats["inserees"] - stats["mises_a_jour"]
+    stats["secondes"] = elapsed
+    stats["lignes_par_s"] = stats["lues"] / elapsed if elapsed > 0 else float("inf")
+    return stats
+
+
+def afficher(stats):
+    print(f"📥 {stats['lues']} offres lues en {stats['secondes']:.2f}s "
+          f"({stats['lignes_par_s']:,.0f} lignes/s)")
+    print(f"   {stats['inserees']} insérées | {stats['mises_a_jour']} mises à jour | "
+          f"{stats['ignorees']} doublons ignorés")
@@ -2,23 +2,16 @@ from dash import html, dcc, dash_table
 import dash_bootstrap_components as dbc
 from gestionnaire import db_manager
 
-# Chargement des données
-df = db_manager.get_all_data()
-
-# Extraction des valeurs uniques
-if not df.empty:
-    liste_entreprises = sorted(df['entreprise'].dropna().unique().tolist()[:500])
-    unique_clusters = sorted(df['cluster'].dropna().unique().tolist())
-    unique_cities = sorted(df['region'].dropna().unique().tolist()[:100]) if 'region' in df.columns else []
-    unique_depts = sorted([int(d) for d in df['departement'].dropna().unique()
-                           if str(d).replace('.', '').isdigit() or isinstance(d, (int, float))])
-    columns_list = [{"name": i, "id": i} for i in df.columns]
-else:
-    liste_entreprises = []
-    unique_clusters = []
-    unique_cities = []
+# Valeurs des listes déroulantes (requêtes SQL, la table n'est pas chargée)
+liste_entreprises = sorted(db_manager.valeurs_distinctes('entreprise', limit=500))
+unique_clusters = sorted(db_manager.valeurs_distinctes('cluster'))
+unique_cities = sorted(db_manager.valeurs_distinctes('region', limit=100))
+unique_depts = sorted([int(d) for d in db_manager.valeurs_distinctes('departement')
+                       if str(d).replace('.', '').isdigit() or isinstance(d, (int, float))])
+columns_list = [{"name": i, "id": i} for i in db_manager.colonnes()]
+
+if not unique_depts:
     unique_depts = list(range(1, 96))
-    columns_list = []
 
 # Options pour dropdowns
 options_cities = [{'label': city, 'value': city} for city in unique_cities]
@@ -168,7 +161,7 @@ dataset_layout = html.Div([
         dbc.CardBody(
             dash_table.DataTable(
                 id='dataset-table',
-                data=df.to_dict('records'),
+                data=[],  # rempli par render_page à l'ouverture de la page
                 columns=columns_list,
                 page_size=15,
                 style_table={'overflowX': 'auto'},
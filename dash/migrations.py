@@ -0,0 +1,288 @@
+"""
+Migrations du schéma de la base (table offres)
+
+    python migrations.py [hellowork.db]
+
+Chaque migration a un numéro ; le numéro de la dernière migration appliquée
+est stocké dans PRAGMA user_version. migrer() applique celles qui manquent,
+dans une transaction, puis vérifie que les index existent toujours (une
+table recréée par DataFrame.to_sql(if_exists="replace") les perd).
+
+    1  schéma de référence : recrée une table importée par to_sql (sans
+       colonne id) avec id INTEGER PRIMARY KEY AUTOINCREMENT (id = rowid,
+       les rowid existants sont conservés)
+    2  index des colonnes filtrées par rechercher(), get_stats() et le
+       dashboard (region, departement, cluster, entreprise)
+    3  index unique sur la clé naturelle (emploi, entreprise, region,
+       date_publication), après suppression des doublons existants
+       (la plus ancienne offre est gardée, les autres sont copiées dans
+       la table offres_doublons avec leur date d'archivage) : cible du
+       ON CONFLICT de l'ingestion en masse (ingestion.py)
+    4  table de synthèse offres_resume (nombre d'offres, somme et somme des
+       carrés des salaires par region, departement, cluster, entreprise,
+       temps_travail, categorie_salaire), tenue à jour par des triggers
+       sur chaque INSERT / DELETE / UPDATE de offres
+    5  clé naturelle recréée sur COALESCE(region, ''), COALESCE(date_publication, '') :
+       une region ou une date vide compte comme une valeur (l'index unique
+       traitait les NULL comme distincts, la purge des doublons comme égaux)
+"""
+import os
+import sys
+
+
+COLUMNS = ["emploi", "entreprise", "date_publication", "temps_travail", "salaire_annuel",
+           "categorie_salaire", "region", "departement", "cluster"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offres
+(
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    emploi            TEXT NOT NULL,
+    entreprise        TEXT NOT NULL,
+    date_publication  TEXT,
+    temps_travail     INTEGER,
+    salaire_annuel    REAL,
+    categorie_salaire INTEGER,
+    region            TEXT,
+    departement       INTEGER,
+    cluster           INTEGER DEFAULT 0
+)
+"""
+
+INDEXES = {
+    "idx_offres_region": "offres(region)",
+    "idx_offres_departement": "offres(departement)",
+    "idx_offres_cluster": "offres(cluster)",
+    "idx_offres_entreprise": "offres(entreprise)",
+}
+
+
+CLE_NATURELLE = ["emploi", "entreprise", "region", "date_publication"]
+
+
+def cle_sql(alias=""):
+    """Expressions de l'index unique idx_offres_cle : NULL = NULL, comme GROUP BY"""
+    return [f"COALESCE({alias}{col}, '')" if col in ("region", "date_publication")
+            else f"{alias}{col}" for col in CLE_NATURELLE]
+
+
+CLE_SQL = cle_sql()
+
+
+DIMENSIONS = ["region", "departement", "cluster", "entreprise",
+              "temps_travail", "categorie_salaire"]
+
+TRIGGERS = ["trg_resume_insert", "trg_resume_delete", "trg_resume_update"]
+
+
+def colonnes(conn, table="offres"):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+# -------------------------------------------------
+# MIGRATIONS
+# -------------------------------------------------
+def _schema_reference(conn):
+    existing = colonnes(conn)
+    if not existing:
+        conn.execute(SCHEMA)
+        return
+    if "id" in existing:
+        return
+
+    # table créée par to_sql : reconstruction avec la clé primaire
+    conn.execute("ALTER TABLE offres RENAME TO offres_import")
+    conn.execute(SCHEMA)
+    copied = [col for col in COLUMNS if col in existing]
+    conn.execute(f"INSERT INTO offres (id, {', '.join(copied)}) "
+                 f"SELECT rowid, {', '.join(copied)} FROM offres_import")
+    conn.execute("DROP TABLE offres_import")
+
+
+def _index(conn):
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    conn.execute("ANALYZE offres")
+
+
+def _cle_naturelle(conn):
+    cle = ", ".join(CLE_SQL)
+    doublons = f"id NOT IN (SELECT MIN(id) FROM offres GROUP BY {cle})"
+    if conn.execute(f"SELECT 1 FROM offres WHERE {doublons} LIMIT 1").fetchone():
+        # archivés avant suppression : rien n'est perdu, à revoir à la main
+        conn.execute("CREATE TABLE IF NOT EXISTS offres_doublons AS "
+                     "SELECT *, CURRENT_TIMESTAMP AS archivee_le FROM offres WHERE 0")
+        archived = conn.execute(f"INSERT INTO offres_doublons "
+                                f"SELECT *, CURRENT_TIMESTAMP FROM offres WHERE {doublons}").rowcount
+        conn.execute(f"DELETE FROM offres WHERE {doublons}")
+        print(f"🧹 {archived} doublons ({', '.join(CLE_NATURELLE)}) "
+              f"déplacés dans offres_doublons")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_offres_cle ON offres({cle})")
+
+
+def _cle_naturelle_coalesce(conn):
+    # index de la migration 3 créé sur les colonnes brutes
+    conn.execute("DROP INDEX IF EXISTS idx_offres_cle")
+    _cle_naturelle(conn)
+
+
+def _delta_resume(row, signe):
+    """Ajoute (signe +) ou retire (signe -) la ligne NEW / OLD de offres_resume"""
+    match = " AND ".join(f"{col} IS {row}.{col}" for col in DIMENSIONS)
+    salaire = f"{row}.salaire_annuel"
+    statements = []
+    if signe == "+":
+        statements.append(
+            f"INSERT INTO offres_resume ({', '.join(DIMENSIONS)}) "
+            f"SELECT {', '.join(f'{row}.{col}' for col in DIMENSIONS)} "
+            f"WHERE NOT EXISTS (SELECT 1 FROM offres_resume WHERE {match});")
+    statements.append(
+        f"UPDATE offres_resume SET "
+        f"n = n {signe} 1, "
+        f"n_salaire = n_salaire {signe} ({salaire} IS NOT NULL), "
+        f"somme_salaire = somme_salaire {signe} COALESCE({salaire}, 0), "
+        f"somme_carres = somme_carres {signe} COALESCE({salaire} * {salaire}, 0) "
+        f"WHERE {match};")
+    if signe == "-":
+        statements.append(f"DELETE FROM offres_resume WHERE n = 0 AND {match};")
+    return "\n".join(statements)
+
+
+def reconstruire_resume(conn):
+    """Recalcule offres_resume depuis offres (GROUP BY sur toute la table)"""
+    dims = ", ".join(DIMENSIONS)
+    conn.execute("DELETE FROM offres_resume")
+    conn.execute(f"""
+        INSERT INTO offres_resume ({dims}, n, n_salaire, somme_salaire, somme_carres)
+        SELECT {dims}, COUNT(*), COUNT(salaire_annuel),
+               COALESCE(SUM(salaire_annuel), 0),
+               COALESCE(SUM(salaire_annuel * salaire_annuel), 0)
+        FROM offres GROUP BY {dims}
+    """)
+
+
+def _resume(conn):
+    dims = ", ".join(DIMENSIONS)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS offres_resume
+        (
+            region            TEXT,
+            departement       INTEGER,
+            cluster           INTEGER,
+            entreprise        TEXT,
+            temps_travail     INTEGER,
+            categorie_salaire INTEGER,
+            n                 INTEGER NOT NULL DEFAULT 0,
+            n_salaire         INTEGER NOT NULL DEFAULT 0,
+            somme_salaire     REAL NOT NULL DEFAULT 0,
+            somme_carres      REAL NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_resume_dimensions ON offres_resume({dims})")
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_insert AFTER INSERT ON offres
+        BEGIN
+        {_delta_resume("NEW", "+")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_delete AFTER DELETE ON offres
+        BEGIN
+        {_delta_resume("OLD", "-")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resume_update
+        AFTER UPDATE OF {dims}, salaire_annuel ON offres
+        BEGIN
+        {_delta_resume("OLD", "-")}
+        {_delta_resume("NEW", "+")}
+        END
+    """)
+    reconstruire_resume(conn)
+
+
+MIGRATIONS = [
+    (1, "schéma de référence (clé primaire id)", _schema_reference),
+    (2, "index region / departement / cluster / entreprise", _index),
+    (3, "index unique de la clé naturelle", _cle_naturelle),
+    (4, "table de synthèse offres_resume (triggers)", _resume),
+    (5, "clé naturelle : region / date vides comparées comme des valeurs",
+     _cle_naturelle_coalesce),
+]
+
+
+def version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def index_manquants(conn):
+    """Index et triggers de offres absents (perdus si la table a été recréée)"""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') "
+        "AND tbl_name = 'offres'")}
+    return [name for name in list(INDEXES) + ["idx_offres_cle"] + TRIGGERS
+            if name not in existing]
+
+
+def schema_a_jour(conn):
+    """Toutes les migrations appliquées et aucun index / trigger manquant"""
+    return version(conn) >= MIGRATIONS[-1][0] and not index_manquants(conn)
+
+
+def migrer(conn, verbose=True):
+    """
+    Applique les migrations en attente (connexion en autocommit,
+    isolation_level=None) et recrée les index et triggers manquants
+
+    Returns:
+        int: version du schéma après migration
+    """
+    current = version(conn)
+    for numero, description, migration in MIGRATIONS:
+        if numero <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if verbose:
+            print(f"🛠️ Migration {numero}: {description}")
+        current = numero
+
+    # table remplacée depuis (to_sql if_exists="replace") : schéma et index perdus
+    if "id" not in colonnes(conn) or index_manquants(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for _, _, migration in MIGRATIONS:
+                migration(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if verbose:
+            print("🛠️ Schéma, index et triggers de offres restaurés")
+
+    return current
+
+
+if __name__ == "__main__":
+    from connection_pool import connect
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    db_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "hellowork.db")
+
+    conn = connect(db_path)
+    try:
+        print(f"📂 {db_path} (version {version(conn)})")
+        print(f"✅ Schéma à jour: version {migrer(conn)}")
+        for (name,) in conn.execute("SELECT name FROM sqlite_master "
+                                    "WHERE type = 'index' AND tbl_name = 'offres'"):
+            print(f"   {name}")
+    finally:
+        conn.close()
@@ -1,28 +1,76 @@
-import joblib
 import pickle
+import numpy as np
 import pandas as pd
 import os
 
-# Import de FrequencyEncoder (doit être disponible)
-from frequency_encoder import FrequencyEncoder
+from model_registry import ModelRegistry, RegistryModel, REGISTRY_DIR
+from compiled_predictor import CompiledModel
+from prediction_cache import PredictionCache
 
 
 class ClusterPredictor:
-    def __init__(self, model_path='model_class'):
+    def __init__(self, model_path='model_class', model=None, verbose=True,
+                 cache_size=1024, cache_ttl=300.0):
         """
         Initialise le prédicteur de cluster
 
         Args:
             model_path: Chemin vers le fichier du modèle (sans extension)
+            model: modèle déjà chargé (registre), model_path n'est alors pas lu
+            verbose: affiche le détail de chaque prédiction
+            cache_size: nombre de prédictions gardées en cache LRU (0 : pas de cache)
+            cache_ttl: durée de vie d'une prédiction en cache, en secondes
         """
-        self.model = None
+        self.cache = PredictionCache(cache_size, cache_ttl)
+        self.model = model
+        self.compiled = self._compile(model)
         self.model_path = model_path
-        self.load_model()
+        self.version = getattr(model, 'version', None)
+        self.verbose = verbose
+        if model is None:
+            self.load_model()
+
+    @classmethod
+    def from_registry(cls, version=None, root=REGISTRY_DIR, **kwargs):
+        """
+        Prédicteur chargé depuis le registre de modèles (sans pickle)
+
+        Args:
+            version: version à charger, LATEST si None
+            **kwargs: options du constructeur (verbose, cache_size, cache_ttl)
+        """
+        registry = ModelRegistry(root)
+        model = registry.load(version)
+        print(f"✅ Modèle chargé depuis le registre: {model.version}")
+        return cls(model_path=os.path.join(registry.root, model.version), model=model, **kwargs)
+
+    def use_version(self, version=None, root=REGISTRY_DIR):
+        """
+        Bascule à chaud vers une autre version du registre
+
+        Le nouveau modèle est entièrement chargé avant d'être substitué :
+        une prédiction en cours termine avec l'ancien.
+        """
+        registry = ModelRegistry(root)
+        model = registry.load(version)
+        self.compiled, self.model, self.version = self._compile(model), model, model.version
+        self.cache.clear()
+        self.model_path = os.path.join(registry.root, model.version)
+        print(f"🔄 Modèle basculé vers: {model.version}")
 
     def load_model(self):
         """Charge le modèle depuis différents formats possibles"""
         extensions = ['', '.joblib', '.pkl', '.h5', '.sav']
 
+        # joblib / pickle uniquement : sklearn n'est pas importé par le registre
+        import joblib
+        import __main__
+        from frequency_encoder import FrequencyEncoder
+
+        # le pipeline a été picklé depuis un notebook (__main__.FrequencyEncoder)
+        if not hasattr(__main__, 'FrequencyEncoder'):
+            __main__.FrequencyEncoder = FrequencyEncoder
+
         for ext in extensions:
             path = f"{self.model_path}{ext}"
             if not os.path.exists(path):
@@ -46,6 +94,8 @@ class ClusterPredictor:
                         print(f"   {i}. {name}: {type(step).__name__}")
 
                 self.model_path = path
+                self.compiled = self._compile(self.model)
+                self.cache.clear()
                 return
 
             except Exception as e:
@@ -54,6 +104,24 @@ class ClusterPredictor:
 
         print(f"❌ Aucun modèle trouvé: '{self.model_path}'")
         self.model = None
+        self.compiled = None
+        self.cache.clear()
+
+    def cache_stats(self):
+        """Compteurs du cache de prédictions (hits, misses, evictions...)"""
+        return self.cache.stats()
+
+    @staticmethod
+    def _compile(model):
+        """Version compilée du modèle pour le scoring unitaire, None si non supporté"""
+        if isinstance(model, RegistryModel):
+            return CompiledModel.from_registry_model(model)
+        if hasattr(model, 'named_steps'):
+            try:
+                return CompiledModel.from_pipeline(model)
+            except ValueError as e:
+                print(f"ℹ️  Pas de prédicteur compilé ({e}), pipeline sklearn utilisé")
+        return None
 
     def _load_from_h5(self, h5_path):
         """Charge un modèle depuis HDF5"""
@@ -79,6 +147,19 @@ class ClusterPredictor:
             'temps_travail': [int(temps_travail)]
         })
 
+    def preprocess_offre(self, emploi, entreprise, ville, departement,
+                         salaire, categorie_salaire, temps_travail):
+        """Même typage que preprocess_input, en dict (prédicteur compilé)"""
+        return {
+            'emploi': str(emploi),
+            'entreprise': str(entreprise),
+            'region': str(ville),
+            'departement': int(departement),
+            'salaire_annuel': float(salaire),
+            'categorie_salaire': int(categorie_salaire),
+            'temps_travail': int(temps_travail)
+        }
+
     def predict_cluster(self, emploi, entreprise, ville, departement,
                         salaire, categorie_salaire, temps_travail):
         """
@@ -87,19 +168,31 @@ class ClusterPredictor:
         Returns:
             int: Numéro du cluster (0 par défaut si erreur)
         """
-        if self.model is None:
+        generation = self.cache.generation
+        model, compiled = self.model, self.compiled
+        if model is None:
             print("❌ Modèle non chargé, cluster par défaut: 0")
             return 0
 
         try:
-            X = self.preprocess_input(emploi, entreprise, ville, departement,
-                                      salaire, categorie_salaire, temps_travail)
-
-            cluster = int(self.model.predict(X)[0])
+            offre = self.preprocess_offre(emploi, entreprise, ville, departement,
+                                          salaire, categorie_salaire, temps_travail)
+            key = ('cluster',) + tuple(offre.values())
+
+            cluster = self.cache.get(key)
+            if cluster is None:
+                if compiled is not None:
+                    cluster = int(compiled.predict(offre))
+                else:
+                    X = self.preprocess_input(emploi, entreprise, ville, departement,
+                                              salaire, categorie_salaire, temps_travail)
+                    cluster = int(model.predict(X)[0])
+                self.cache.put(key, cluster, generation)
 
-            print(f"✅ Cluster prédit: {cluster}")
-            print(f"   📝 {emploi} | 🏢 {entreprise}")
-            print(f"   📍 {ville} ({departement}) | 💰 {salaire}€")
+            if self.verbose:
+                print(f"✅ Cluster prédit: {cluster}")
+                print(f"   📝 {emploi} | 🏢 {entreprise}")
+                print(f"   📍 {ville} ({departement}) | 💰 {salaire}€")
 
             return cluster
 
@@ -115,20 +208,38 @@ class ClusterPredictor:
         Returns:
             tuple: (cluster, probabilities_dict)
         """
-        if self.model is None:
+        generation = self.cache.generation
+        model, compiled = self.model, self.compiled
+        if model is None:
             return 0, {}
 
         try:
-            X = self.preprocess_input(emploi, entreprise, ville, departement,
-                                      salaire, categorie_salaire, temps_travail)
-
-            cluster = int(self.model.predict(X)[0])
-            probas_dict = {}
-
-            if hasattr(self.model, 'predict_proba'):
-                probas = self.model.predict_proba(X)[0]
-                probas_dict = {f"Cluster {i}": float(p) * 100
-                               for i, p in enumerate(probas)}
+            offre = self.preprocess_offre(emploi, entreprise, ville, departement,
+                                          salaire, categorie_salaire, temps_travail)
+            key = ('proba',) + tuple(offre.values())
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                cluster, probas_dict = cached[0], dict(cached[1])
+            else:
+                probas = None
+                if compiled is not None:
+                    cluster = int(compiled.predict(offre))
+                    probas = compiled.predict_proba(offre)
+                else:
+                    X = self.preprocess_input(emploi, entreprise, ville, departement,
+                                              salaire, categorie_salaire, temps_travail)
+                    cluster = int(model.predict(X)[0])
+                    if hasattr(model, 'predict_proba'):
+                        probas = model.predict_proba(X)[0]
+
+                probas_dict = {}
+                if probas is not None:
+                    probas_dict = {f"Cluster {i}": float(p) * 100
+                                   for i, p in enumerate(probas)}
+                self.cache.put(key, (cluster, dict(probas_dict)), generation)
+
+            if probas_dict and self.verbose:
                 print("📊 Probabilités:")
                 for name, proba in probas_dict.items():
                     print(f"   {name}: {proba:.2f}%")
@@ -139,6 +250,67 @@ class ClusterPredictor:
             print(f"❌ Erreur prédiction avec probas: {e}")
             return 0, {}
 
+    # -------------------------------------------------
+    # PREDICTION EN LOT
+    # -------------------------------------------------
+    def preprocess_batch(self, df):
+        """
+        Équivalent vectorisé de preprocess_input sur un DataFrame d'offres
+        (colonnes de la table offres)
+
+        Returns:
+            tuple: (X, masque des lignes prédictibles : salaire et temps de travail connus)
+        """
+        X = pd.DataFrame({
+            'emploi': df['emploi'].astype(str),
+            'entreprise': df['entreprise'].astype(str),
+            'region': df['region'].astype(str),
+            # '03' → 3 comme int(departement) ; '2A' ou vide → NaN (fréquence 0)
+            'departement': pd.to_numeric(df['departement'], errors='coerce'),
+            'salaire_annuel': pd.to_numeric(df['salaire_annuel'], errors='coerce'),
+            'categorie_salaire': pd.to_numeric(df['categorie_salaire'], errors='coerce'),
+            'temps_travail': pd.to_numeric(df['temps_travail'], errors='coerce'),
+        }, index=df.index)
+
+        valid = (X['salaire_annuel'].notna() & X['temps_travail'].notna()).to_numpy()
+        return X, valid
+
+    def predict_batch(self, df, default=0, chunksize=100_000):
+        """
+        Prédit le cluster de toutes les offres de df en une passe vectorisée
+
+        Returns:
+            np.ndarray: clusters (default pour les lignes non prédictibles)
+        """
+        model = self.model
+        clusters = np.full(len(df), default, dtype=np.int64)
+        if model is None or df.empty:
+            return clusters
+
+        for start in range(0, len(df), chunksize):
+            X, valid = self.preprocess_batch(df.iloc[start:start + chunksize])
+            if valid.any():
+                clusters[start:start + len(X)][valid] = model.predict(X[valid])
+        return clusters
+
+    def predict_proba_batch(self, df, chunksize=100_000):
+        """
+        Probabilités par cluster pour toutes les offres de df
+
+        Returns:
+            np.ndarray: (n_offres, n_clusters), NaN pour les lignes non prédictibles
+        """
+        model = self.model
+        if model is None or not hasattr(model, 'predict_proba'):
+            raise ValueError("Modèle non chargé ou sans predict_proba")
+
+        probas = np.full((len(df), len(model.classes_)), np.nan)
+        for start in range(0, len(df), chunksize):
+            X, valid = self.preprocess_batch(df.iloc[start:start + chunksize])
+            if valid.any():
+                probas[start:start + len(X)][valid] = model.predict_proba(X[valid])
+        return probas
+
 
 # Instance globale
 print("\n" + "=" * 60)
@@ -146,7 +318,11 @@ print("🚀 INITIALISATION DU PRÉDICTEUR")
 print("=" * 60)
 
 try:
-    predictor = ClusterPredictor('model_class')
+    # registre versionné si disponible, sinon modèle picklé historique
+    if ModelRegistry().latest():
+        predictor = ClusterPredictor.from_registry()
+    else:
+        predictor = ClusterPredictor('model_class')
     if predictor.model is not None:
         print("🤖 PRÉDICTEUR PRÊT ✅")
     else:
@@ -0,0 +1,330 @@
+"""
+Registre de modèles versionnés (sans pickle)
+
+    models/
+        LATEST                      version courante
+        v1/
+            manifest.json           version, features, classes, hash des données...
+            scaler_mean.npy         moyenne / écart-type du StandardScaler
+            scaler_scale.npy
+            cat_<col>_categories.npy  tables du FrequencyEncoder
+            cat_<col>_freqs.npy
+            coef.npy                coefficients / intercept de la LogisticRegression
+            intercept.npy
+            classes.npy
+
+Les tableaux sont rechargés en mémoire mappée (np.load mmap_mode="r",
+allow_pickle=False) : démarrage rapide, pas besoin d'importer
+FrequencyEncoder avant le chargement, et un fichier corrompu ne peut pas
+exécuter de code. Une version publiée n'est jamais modifiée : elle est
+écrite dans un dossier temporaire puis renommée, et LATEST est remplacé
+atomiquement.
+
+    python model_registry.py export model_class.joblib v1 --data ../data/hellowork_clustered.csv
+    python model_registry.py list
+"""
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+FORMAT_VERSION = 1
+
+
+def sha256_file(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# -------------------------------------------------
+# EXTRACTION DU PIPELINE SKLEARN
+# -------------------------------------------------
+def extraire_pipeline(pipeline):
+    """
+    Pipeline(ColumnTransformer[StandardScaler, FrequencyEncoder, passthrough],
+    LogisticRegression) → (features, tableaux NumPy)
+
+    Raises:
+        ValueError: si le pipeline n'a pas cette forme
+    """
+    try:
+        preprocessor = pipeline.named_steps["preprocessor"]
+        classifier = pipeline.named_steps["classifier"]
+        transformers = {name: (step, cols) for name, step, cols in preprocessor.transformers_}
+        scaler, num = transformers["num"]
+        encoder, cat = transformers["cat"]
+        _, binaires = transformers["bin"]
+    except (AttributeError, KeyError, ValueError) as e:
+        raise ValueError(f"Pipeline non supporté par le registre: {e}") from e
+
+    arrays = {
+        "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+        "coef": np.asarray(classifier.coef_, dtype=np.float64),
+        "intercept": np.asarray(classifier.intercept_, dtype=np.float64),
+        "classes": np.asarray(classifier.classes_),
+    }
+
+    categories_dtypes = {}
+    for col in cat:
+        freq_map = encoder.freq_maps_[col]
+        categories = freq_map.index
+        if pd.api.types.is_integer_dtype(categories) or all(isinstance(v, (int, np.integer))
+                                                            for v in categories):
+            values = categories.to_numpy(dtype=np.int64)
+        elif all(isinstance(v, str) for v in categories):
+            values = categories.to_numpy(dtype=str)
+        else:
+            raise ValueError(f"Catégories de '{col}' non sérialisables sans pickle")
+
+        arrays[f"cat_{col}_categories"] = values
+        arrays[f"cat_{col}_freqs"] = freq_map.to_numpy(dtype=np.float64)
+        categories_dtypes[col] = values.dtype.kind
+
+    features = {
+        "num": list(num),
+        "cat": list(cat),
+        "bin": list(binaires),
+        "categories_dtypes": categories_dtypes,
+    }
+    return features, arrays
+
+
+def softmax(scores):
+    """Softmax par ligne, mêmes opérations que sklearn.utils.extmath.softmax"""
+    exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+# -------------------------------------------------
+# MODELE CHARGE DEPUIS LE REGISTRE
+# -------------------------------------------------
+class RegistryModel:
+    """
+    Pipeline reconstitué à partir des tableaux du registre
+
+    Même interface que le pipeline sklearn pour la prédiction (predict,
+    predict_proba, classes_) et mêmes résultats, calculés en NumPy.
+    """
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.features = manifest["features"]
+        self.arrays = arrays
+
+        self.classes_ = arrays["classes"]
+        self._tables = [
+            (pd.Index(arrays[f"cat_{col}_categories"]),
+             np.append(arrays[f"cat_{col}_freqs"], 0.0))
+            for col in self.features["cat"]
+        ]
+
+    @property
+    def feature_names(self):
+        return self.features["num"] + self.features["cat"] + self.features["bin"]
+
+    def transform(self, X):
+        """Équivalent de preprocessor.transform : (n, n_features) float64"""
+        num, cat, binaires = self.features["num"], self.features["cat"], self.features["bin"]
+        Xt = np.empty((len(X), len(num) + len(cat) + len(binaires)), dtype=np.float64)
+
+        Xt[:, :len(num)] = X[num].to_numpy(dtype=np.float64)
+        Xt[:, :len(num)] -= self.arrays["scaler_mean"]
+        Xt[:, :len(num)] /= self.arrays["scaler_scale"]
+
+        for j, (col, (categories, freqs)) in enumerate(zip(cat, self._tables), start=len(num)):
+            codes, uniques = pd.factorize(X[col])
+            positions = np.append(categories.get_indexer(uniques), -1)
+            Xt[:, j] = freqs[positions[codes]]
+
+        Xt[:, len(num) + len(cat):] = X[binaires].to_numpy(dtype=np.float64)
+        return Xt
+
+    def decision_function(self, X):
+        return self.transform(X) @ self.arrays["coef"].T + self.arrays["intercept"]
+
+    def predict_proba(self, X):
+        decision = self.decision_function(X)
+        if len(self.classes_) <= 2:
+            proba = 1.0 / (1.0 + np.exp(-decision.ravel()))
+            return np.column_stack([1 - proba, proba])
+        return softmax(decision)
+
+    def predict(self, X):
+        decision = self.decision_function(X)
+        if len(self.classes_) <= 2:
+            return self.classes_[(decision.ravel() > 0).astype(int)]
+        return self.classes_[decision.argmax(axis=1)]
+
+
+# -------------------------------------------------
+# REGISTRE
+# -------------------------------------------------
+class ModelRegistry:
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isfile(self._path(name, "manifest.json")))
+
+    def latest(self):
+        """Version courante (fichier LATEST), None si le registre est vide"""
+        try:
+            with open(self._path("LATEST"), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_latest(self, version):
+        if version not in self.versions():
+            raise ValueError(f"Version inconnue: {version}")
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".LATEST-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, self._path("LATEST"))
+
+    def manifest(self, version):
+        with open(self._path(version, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def publish(self, pipeline, version, training_data=None, set_latest=True):
+        """
+        Exporte un pipeline sklearn entraîné sous une nouvelle version
+
+        Args:
+            training_data: fichier des données d'entraînement (hashé dans le manifest)
+
+        Returns:
+            dict: manifest écrit
+        """
+        import sklearn
+
+        if os.path.exists(self._path(version)):
+            raise ValueError(f"La version {version} existe déjà (les versions sont immuables)")
+
+        features, arrays = extraire_pipeline(pipeline)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "version": version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "sklearn_version": sklearn.__version__,
+            "features": features,
+            "classes": arrays["classes"].tolist(),
+            "training_data": os.path.basename(training_data) if training_data else None,
+            "training_data_sha256": sha256_file(training_data) if training_data else None,
+            "arrays": {},
+        }
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.root, prefix=f".{version}-")
+        os.chmod(tmp, 0o755)
+        try:
+            for name, values in arrays.items():
+                path = os.path.join(tmp, f"{name}.npy")
+                np.save(path, values, allow_pickle=False)
+                manifest["arrays"][name] = {
+                    "dtype": values.dtype.str,
+                    "shape": list(values.shape),
+                    "sha256": sha256_file(path),
+                }
+
+            with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+            os.replace(tmp, self._path(version))
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        if set_latest:
+            self.set_latest(version)
+
+        print(f"📦 Modèle publié: {version} ({self._path(version)})")
+        return manifest
+
+    def load(self, version=None, verify=False):
+        """
+        Charge une version (LATEST si None), tableaux en mémoire mappée
+
+        Args:
+            verify: recalcule le sha256 de chaque tableau
+        """
+        version = version or self.latest()
+        if version is None:
+            raise FileNotFoundError(f"Registre vide: {self.root}")
+
+        manifest = self.manifest(version)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Format de registre non supporté: {manifest.get('format')}")
+
+        arrays = {}
+        for name, meta in manifest["arrays"].items():
+            path = self._path(version, f"{name}.npy")
+            if verify and sha256_file(path) != meta["sha256"]:
+                raise ValueError(f"Tableau corrompu: {path}")
+            arrays[name] = np.load(path, mmap_mode="r", allow_pickle=False)
+
+        return RegistryModel(manifest, arrays)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Registre de modèles versionnés")
+    arg_parser.add_argument("--root", default=REGISTRY_DIR)
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="publie un pipeline joblib")
+    export.add_argument("model")
+    export.add_argument("version")
+    export.add_argument("--data", default=None, help="données d'entraînement (hash)")
+    export.add_argument("--no-latest", action="store_true")
+
+    commands.add_parser("list", help="liste les versions")
+
+    use = commands.add_parser("use", help="change la version courante")
+    use.add_argument("version")
+
+    args = arg_parser.parse_args()
+    registry = ModelRegistry(args.root)
+
+    if args.command == "export":
+        import joblib
+        import __main__
+        from frequency_encoder import FrequencyEncoder
+
+        # le pipeline a été picklé depuis un notebook (__main__.FrequencyEncoder)
+        __main__.FrequencyEncoder = FrequencyEncoder
+        registry.publish(joblib.load(args.model), args.version, args.data,
+                         set_latest=not args.no_latest)
+
+    elif args.command == "list":
+        latest = registry.latest()
+        for version in registry.versions():
+            manifest = registry.manifest(version)
+            marker = "⭐" if version == latest else "  "
+            print(f"{marker} {version}  {manifest['created_at']}  "
+                  f"classes={manifest['classes']}  data={manifest['training_data']}")
+
+    elif args.command == "use":
+        registry.set_latest(args.version)
+        print(f"✅ Version courante: {args.version}")
@@ -0,0 +1,82 @@
+"""
+Cache LRU des prédictions (taille et durée de vie bornées)
+
+Clé : tuple des features normalisées (même typage que l'entrée du modèle).
+Le cache est vidé à chaque changement de modèle ; une prédiction lancée
+avec l'ancien modèle et terminée après le changement n'y est pas écrite
+(numéro de génération).
+"""
+import time
+import threading
+from collections import OrderedDict
+
+
+class PredictionCache:
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        """
+        Args:
+            maxsize: nombre d'entrées max (0 désactive le cache)
+            ttl: durée de vie d'une entrée en secondes (None : illimitée)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Valeur en cache, None si absente ou expirée"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value, generation=None):
+        """Ajoute une entrée, ignorée si le modèle a changé depuis generation"""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Invalide tout le cache (changement de modèle)"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "taille": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,282 @@
+"""
+Requêtes agrégées du dashboard (filtres et agrégations en SQL)
+
+    filtre = Filtre(cities=["Lyon"], clusters=[1])
+    with db_manager.connexion() as conn:
+        agregats = tableau_de_bord(conn, filtre)
+
+Chaque graphique ne reçoit que ses agrégats (quelques dizaines de lignes
+au plus) : KPIs, nombre d'offres / salaire moyen par région, top 10 des
+emplois, répartition temps de travail / catégorie de salaire et quartiles
+des salaires par cluster. Les filtres du dashboard deviennent des
+clauses WHERE ... IN (?) paramétrées, servies par les index de la table
+(cf. migrations.py) ; la mémoire du dashboard ne dépend plus de la taille
+de la table.
+
+Les KPIs, la répartition par région, les camemberts / barres et la
+moyenne / écart-type des salaires par cluster sont lus dans la table de
+synthèse offres_resume (tenue à jour par triggers, une ligne par
+combinaison de filtres) au lieu des offres elles-mêmes. Seuls le top des
+emplois et les quartiles, qui ne se déduisent pas de sommes, lisent encore
+la table offres.
+"""
+import math
+import os
+import sys
+
+import pandas as pd
+
+from migrations import COLUMNS
+
+# département → région officielle : index de l'ETL (etl/localisation.py)
+ETL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "etl")
+if ETL_DIR not in sys.path:
+    sys.path.append(ETL_DIR)
+from localisation import LocationIndex
+
+LOCALISATIONS = LocationIndex()
+
+# filtre du dashboard → colonne de la table
+FILTRES = {
+    "cities": "region",
+    "depts": "departement",
+    "clusters": "cluster",
+    "companies": "entreprise",
+}
+
+
+def regions_officielles(departements):
+    """Series de départements (entiers ou codes) → région officielle, « Autre » si inconnu"""
+    return LOCALISATIONS.region_de(departements).fillna("Autre")
+
+
+class Filtre:
+    """Filtres du dashboard → clause WHERE paramétrée"""
+
+    def __init__(self, cities=None, depts=None, clusters=None, companies=None):
+        self.valeurs = {"cities": cities, "depts": depts,
+                        "clusters": clusters, "companies": companies}
+
+    def where(self, prefix="WHERE"):
+        """
+        Returns:
+            (str, list): clause SQL (vide si aucun filtre) et paramètres
+        """
+        conditions, params = [], []
+        for name, values in self.valeurs.items():
+            if values:
+                conditions.append(f"{FILTRES[name]} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if not conditions:
+            return "", []
+        return f"{prefix} {' AND '.join(conditions)}", params
+
+    def et(self, condition):
+        """Clause WHERE avec une condition supplémentaire"""
+        where, params = self.where(prefix="AND")
+        return f"WHERE {condition} {where}", params
+
+
+def _colonne(colonne):
+    if colonne not in COLUMNS:
+        raise ValueError(f"Colonne inconnue: {colonne}")
+    return colonne
+
+
+# -------------------------------------------------
+# AGREGATS
+# -------------------------------------------------
+def kpis(conn, filtre):
+    where, params = filtre.where()
+    count, salaire_moyen, nb_departements = conn.execute(
+        f"SELECT COALESCE(SUM(n), 0), SUM(somme_salaire) / SUM(n_salaire), "
+        f"COUNT(DISTINCT departement) FROM offres_resume {where}",
+        params).fetchone()
+    return {"count": count, "salaire_moyen": salaire_moyen, "nb_departements": nb_departements}
+
+
+def offres_par_region(conn, filtre):
+    """
+    Nombre de salaires renseignés et salaire moyen par région officielle
+
+    Returns:
+        DataFrame: region, count, avg_salary (hors région « Autre »)
+    """
+    where, params = filtre.where()
+    df = pd.DataFrame(conn.execute(
+        f"SELECT departement, SUM(n_salaire), SUM(somme_salaire) "
+        f"FROM offres_resume {where} GROUP BY departement", params).fetchall(),
+        columns=["departement", "count", "total"])
+
+    df["region"] = regions_officielles(df["departement"])
+    df = df.groupby("region", as_index=False)[["count", "total"]].sum()
+    df = df[(df["region"] != "Autre") & (df["count"] > 0)]
+    df["avg_salary"] = df["total"] / df["count"]
+    return df[["region", "count", "avg_salary"]].reset_index(drop=True)
+
+
+def repartition_binaire(conn, filtre, colonne):
+    """
+    Nombre d'offres avec colonne = 1 et les autres (0 ou vide)
+
+    Returns:
+        dict: {1: n, 0: n}
+    """
+    colonne = _colonne(colonne)
+    where, params = filtre.where()
+    counts = dict(conn.execute(
+        f"SELECT COALESCE({colonne} = 1, 0), SUM(n) FROM offres_resume {where} "
+        f"GROUP BY 1", params).fetchall())
+    return {1: counts.get(1, 0), 0: counts.get(0, 0)}
+
+
+def salaires_par_cluster(conn, filtre):
+    """
+    Moyenne et écart-type (échantillon) des salaires par cluster, depuis les
+    sommes et sommes des carrés
+
+    Returns:
+        DataFrame: cluster, n, mean, sd
+    """
+    where, params = filtre.where()
+    rows = []
+    for cluster, n, somme, carres in conn.execute(
+            f"SELECT cluster, SUM(n_salaire), SUM(somme_salaire), SUM(somme_carres) "
+            f"FROM offres_resume {where} GROUP BY cluster HAVING SUM(n_salaire) > 0 "
+            f"ORDER BY cluster", params):
+        mean = somme / n
+        variance = (carres - n * mean * mean) / (n - 1) if n > 1 else 0.0
+        rows.append([cluster, n, mean, math.sqrt(max(variance, 0.0))])
+    return pd.DataFrame(rows, columns=["cluster", "n", "mean", "sd"])
+
+
+def top_emplois(conn, filtre, n=10):
+    where, params = filtre.et("emploi IS NOT NULL")
+    return pd.DataFrame(conn.execute(
+        f"SELECT emploi, COUNT(*) AS count FROM offres {where} "
+        f"GROUP BY emploi ORDER BY count DESC, emploi LIMIT ?", params + [n]).fetchall(),
+        columns=["emploi", "count"])
+
+
+def quartiles_par_cluster(conn, filtre):
+    """
+    Statistiques de boîte à moustaches des salaires par cluster (quartiles
+    par interpolation linéaire, moustaches à 1.5 IQR comme plotly)
+
+    Returns:
+        DataFrame: cluster, n, q1, median, q3, lowerfence, upperfence
+    """
+    where, params = filtre.et("salaire_annuel IS NOT NULL")
+
+    # valeurs encadrant chaque quartile (rangs floor / ceil de p * (n - 1))
+    rangs = " OR ".join(f"rn IN (CAST((n - 1) * {p} AS INTEGER), "
+                        f"CAST((n - 1) * {p} AS INTEGER) + 1)"
+                        for p in (0.25, 0.5, 0.75))
+    rows = conn.execute(f"""
+        WITH s AS (
+            SELECT cluster, salaire_annuel AS v,
+                   ROW_NUMBER() OVER (PARTITION BY cluster ORDER BY salaire_annuel) - 1 AS rn,
+                   COUNT(*) OVER (PARTITION BY cluster) AS n
+            FROM offres {where}
+        )
+        SELECT cluster, n, rn, v FROM s WHERE {rangs}
+    """, params).fetchall()
+
+    valeurs = {}
+    for cluster, n, rn, v in rows:
+        valeurs.setdefault(cluster, (n, {}))[1][rn] = v
+
+    stats = []
+    for cluster, (n, by_rank) in sorted(valeurs.items()):
+        def quantile(p):
+            pos = (n - 1) * p
+            low = int(pos)
+            high = min(low + 1, n - 1)
+            return by_rank[low] + (pos - low) * (by_rank[high] - by_rank[low])
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        iqr = q3 - q1
+        stats.append([cluster, n, q1, median, q3, q1 - 1.5 * iqr, q3 + 1.5 * iqr])
+
+    df = pd.DataFrame(stats, columns=["cluster", "n", "q1", "median", "q3", "lo", "hi"])
+    if df.empty:
+        return df.drop(columns=["lo", "hi"]).assign(lowerfence=[], upperfence=[])
+
+    # moustaches : valeurs extrêmes à l'intérieur des bornes
+    bornes = ", ".join("(?, ?, ?)" for _ in range(len(df)))
+    bornes_params = [v for row in df[["cluster", "lo", "hi"]].itertuples(index=False)
+                     for v in row]
+    where_o, params_o = filtre.et("o.salaire_annuel BETWEEN b.lo AND b.hi")
+    fences = conn.execute(f"""
+        WITH b(c, lo, hi) AS (VALUES {bornes})
+        SELECT o.cluster, MIN(o.salaire_annuel), MAX(o.salaire_annuel)
+        FROM offres o JOIN b ON o.cluster = b.c
+        {where_o}
+        GROUP BY o.cluster
+    """, bornes_params + params_o).fetchall()
+    fences = pd.DataFrame(fences, columns=["cluster", "lowerfence", "upperfence"])
+
+    return df.drop(columns=["lo", "hi"]).merge(fences, on="cluster", how="left")
+
+
+def tableau_de_bord(conn, filtre):
+    """
+    Tous les agrégats du dashboard, lus dans une même transaction (instantané
+    cohérent en WAL)
+    """
+    conn.execute("BEGIN")
+    try:
+        return {
+            "kpis": kpis(conn, filtre),
+            "regions": offres_par_region(conn, filtre),
+            "temps_travail": repartition_binaire(conn, filtre, "temps_travail"),
+            "categorie_salaire": repartition_binaire(conn, filtre, "categorie_salaire"),
+            "top_emplois": top_emplois(conn, filtre),
+            "salaires_cluster": quartiles_par_cluster(conn, filtre).merge(
+                salaires_par_cluster(conn, filtre).drop(columns="n"), on="cluster", how="left"),
+        }
+    finally:
+        conn.execute("COMMIT")
+
+
+def statistiques(conn):
+    """Statistiques globales de get_stats, depuis offres_resume"""
+    total, salaire_moyen, nb_entreprises, nb_departements = conn.execute(
+        "SELECT COALESCE(SUM(n), 0), SUM(somme_salaire) / SUM(n_salaire), "
+        "COUNT(DISTINCT entreprise), COUNT(DISTINCT departement) FROM offres_resume"
+    ).fetchone()
+    par_cluster = dict(conn.execute(
+        "SELECT cluster, SUM(n) FROM offres_resume GROUP BY cluster").fetchall())
+    return {
+        "total_offres": total,
+        "salaire_moyen": salaire_moyen,
+        "offres_par_cluster": par_cluster,
+        "nb_entreprises": nb_entreprises,
+        "nb_departements": nb_departements,
+    }
+
+
+# -------------------------------------------------
+# OPTIONS DES FILTRES
+# -------------------------------------------------
+def valeurs_distinctes(conn, colonne, filtre=None, limit=None):
+    """
+    Valeurs distinctes non nulles de colonne, dans l'ordre de première
+    apparition dans la table (limit : les premières seulement)
+    """
+    colonne = _colonne(colonne)
+    where, params = (filtre or Filtre()).et(f"{colonne} IS NOT NULL")
+    query = f"SELECT {colonne} FROM offres {where} GROUP BY {colonne} ORDER BY MIN(rowid)"
+    if limit:
+        query += " LIMIT ?"
+        params = params + [limit]
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def villes_de_region(conn, region):
+    """Villes (colonne region) dont le département est dans la région officielle"""
+    villes = pd.DataFrame(conn.execute("SELECT DISTINCT region, departement FROM offres "
+                                       "WHERE region IS NOT NULL").fetchall(),
+                          columns=["ville", "departement"])
+    dans_region = regions_officielles(villes["departement"]) == region
+    return list(dict.fromkeys(villes.loc[dans_region, "ville"]))
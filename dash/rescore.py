@@ -0,0 +1,68 @@
+"""
+Re-score de la table offres après une mise à jour du modèle
+
+    python rescore.py [--version v2] [--chunksize 50000] [--dry-run]
+
+Lit la table par morceaux, prédit les clusters en lot (predict_batch) et
+ne réécrit que les lignes dont le cluster change, en une transaction
+executemany par morceau.
+"""
+import time
+import argparse
+
+from gestionnaire import db_manager
+from model_predictor import ClusterPredictor
+
+
+FEATURES = ['emploi', 'entreprise', 'region', 'departement',
+            'salaire_annuel', 'categorie_salaire', 'temps_travail', 'cluster']
+
+
+def rescore(predictor, chunksize=50_000, dry_run=False):
+    """
+    Returns:
+        dict: lignes lues, lignes dont le cluster change, lignes écrites
+    """
+    stats = {'lues': 0, 'changees': 0, 'ecrites': 0}
+
+    for chunk in db_manager.iter_offres(FEATURES, chunksize):
+        clusters = predictor.predict_batch(chunk)
+        changed = chunk['cluster'].to_numpy() != clusters
+
+        stats['lues'] += len(chunk)
+        stats['changees'] += int(changed.sum())
+        if changed.any() and not dry_run:
+            stats['ecrites'] += db_manager.modifier_clusters(chunk.index[changed],
+                                                             clusters[changed])
+
+    return stats
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Re-score de la table offres")
+    arg_parser.add_argument("--version", default=None,
+                            help="version du registre (LATEST si absent, joblib si pas de registre)")
+    arg_parser.add_argument("--chunksize", type=int, default=50_000)
+    arg_parser.add_argument("--dry-run", action="store_true")
+    args = arg_parser.parse_args()
+
+    try:
+        predictor = ClusterPredictor.from_registry(args.version)
+    except FileNotFoundError:
+        predictor = ClusterPredictor('model_class')
+
+    if predictor.model is None:
+        raise SystemExit("❌ Aucun modèle disponible")
+
+    start = time.perf_counter()
+    stats = rescore(predictor, args.chunksize, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print(f"🎯 Re-score ({predictor.version or predictor.model_path})"
+          f"{' [dry-run]' if args.dry_run else ''}")
+    print("=" * 60)
+    print(f"   {stats['lues']} offres lues en {elapsed:.2f}s "
+          f"({stats['lues'] / max(elapsed, 1e-9):,.0f} lignes/s)")
+    print(f"   {stats['changees']} clusters modifiés, {stats['ecrites']} lignes écrites")
+    print("=" * 60)
@@ -0,0 +1,205 @@
+"""
+Artefacts inter-étapes typés (Parquet / Arrow)
+
+    brut       sortie du scraper        (hellowork_400pages)
+    etl        sortie de etl.py         (hellowork_etl)
+    clustered  sortie du clustering     (hellowork_clustered)
+
+Chaque étape a un schéma Arrow explicite : departement reste une chaîne
+('03', '2A') d'un bout à l'autre, emploi / entreprise / region sont
+encodés en dictionnaire (category côté pandas), et les lectures ne
+chargent que les colonnes demandées.
+
+Les CSV restent lisibles (même API, même typage) pour les fichiers
+existants :
+
+    python artifacts.py ../data/hellowork_etl.csv ../data/hellowork_etl.parquet --stage etl
+
+Nécessite pyarrow.
+"""
+import os
+import argparse
+
+import pandas as pd
+
+from localisation import normaliser_code
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Les artefacts Parquet nécessitent pyarrow : pip install pyarrow") from e
+    return pyarrow
+
+
+# -------------------------------------------------
+# SCHEMAS
+# -------------------------------------------------
+DICTIONNAIRE = ("emploi", "entreprise", "region")
+
+
+def schema(stage):
+    pa = _pyarrow()
+    texte = pa.string()
+    categorie = pa.dictionary(pa.int32(), pa.string())
+
+    brut = [
+        ("titre", texte), ("entreprise", categorie), ("localisation", texte),
+        ("salaire", texte), ("date_publication", texte), ("description", texte),
+        ("offre_id", texte),
+    ]
+    etl = [
+        ("emploi", categorie), ("entreprise", categorie),
+        ("date_publication", pa.timestamp("us")), ("temps_travail", pa.int8()),
+        ("salaire_annuel", pa.float64()), ("categorie_salaire", pa.int8()),
+        ("region", categorie), ("departement", texte),
+    ]
+    stages = {
+        "brut": brut,
+        "etl": etl,
+        "clustered": etl + [("cluster", pa.int16())],
+    }
+    if stage not in stages:
+        raise ValueError(f"Étape inconnue: {stage} (attendu: {', '.join(stages)})")
+    return pa.schema(stages[stage])
+
+
+def _sous_schema(stage, colonnes):
+    """Schéma de l'étape restreint aux colonnes présentes, dans leur ordre"""
+    complet = schema(stage)
+    return _pyarrow().schema([complet.field(c) for c in colonnes if c in complet.names])
+
+
+def typer(df, stage):
+    """Applique le typage pandas équivalent au schéma (lecture CSV)"""
+    df = df.copy()
+
+    if "departement" in df.columns:
+        departement = df["departement"].astype("string").str.split(".").str[0]
+        df["departement"] = normaliser_code(departement).astype(object)
+
+    if stage != "brut":
+        if "date_publication" in df.columns:
+            df["date_publication"] = pd.to_datetime(df["date_publication"])
+        for col in ("temps_travail", "categorie_salaire"):
+            if col in df.columns:
+                df[col] = df[col].astype("Int8")
+        if "cluster" in df.columns:
+            df["cluster"] = df["cluster"].astype("Int16")
+
+    for col in DICTIONNAIRE if stage != "brut" else ("entreprise",):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    return df
+
+
+# -------------------------------------------------
+# LECTURE / ECRITURE
+# -------------------------------------------------
+def est_parquet(path):
+    return os.path.isdir(path) or path.endswith((".parquet", ".pq"))
+
+
+def to_arrow(df, stage):
+    """DataFrame → pyarrow.Table au schéma de l'étape (colonnes hors schéma ignorées)"""
+    pa = _pyarrow()
+    cible = _sous_schema(stage, df.columns)
+    df = typer(df[cible.names], stage)
+    return pa.Table.from_pandas(df, schema=cible, preserve_index=False)
+
+
+def ecrire(df, path, stage):
+    """Écrit df en Parquet (zstd) ou en CSV selon l'extension de path"""
+    if not est_parquet(path):
+        df.to_csv(path, index=False, encoding="utf-8")
+        return
+
+    pa = _pyarrow()
+    pa.parquet.write_table(to_arrow(df, stage), path, compression="zstd")
+
+
+def lire(path, stage, columns=None):
+    """
+    Lit un artefact (fichier Parquet, dossier Parquet de ParquetSink, ou CSV)
+
+    Args:
+        columns: colonnes à charger (projection), toutes si None
+
+    Returns:
+        DataFrame typé selon le schéma de l'étape
+    """
+    if not est_parquet(path):
+        return typer(pd.read_csv(path, usecols=columns), stage)
+
+    pa = _pyarrow()
+    table = pa.parquet.read_table(path, columns=columns)
+    return table.to_pandas()
+
+
+def iter_morceaux(path, stage, chunksize=100_000, columns=None):
+    """Lit un artefact par morceaux de chunksize lignes (mémoire bornée)"""
+    if not est_parquet(path):
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            yield typer(chunk, stage)
+        return
+
+    pa = _pyarrow()
+    dataset = pa.dataset.dataset(path, format="parquet")
+    for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+class ArtifactWriter:
+    """
+    Écriture incrémentale d'un artefact, morceau par morceau (CSV ou Parquet)
+
+        with ArtifactWriter("sortie.parquet", "etl") as writer:
+            for chunk in ...:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path, stage):
+        self.path = path
+        self.stage = stage
+        self._parquet = est_parquet(path)
+        self._writer = None
+        self._first = True
+
+    def write(self, df):
+        if not self._parquet:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first,
+                      index=False, encoding="utf-8")
+        else:
+            table = to_arrow(df, self.stage)
+            if self._writer is None:
+                self._writer = _pyarrow().parquet.ParquetWriter(self.path, table.schema,
+                                                                compression="zstd")
+            self._writer.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Conversion d'un artefact CSV ↔ Parquet")
+    arg_parser.add_argument("input")
+    arg_parser.add_argument("output")
+    arg_parser.add_argument("--stage", choices=["brut", "etl", "clustered"], required=True)
+    args = arg_parser.parse_args()
+
+    df = lire(args.input, args.stage)
+    ecrire(df, args.output, args.stage)
+    print(f"💾 {len(df)} lignes converties: {args.input} → {args.output}")
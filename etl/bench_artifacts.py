@@ -0,0 +1,63 @@
+"""
+Benchmark artefacts : CSV vs Parquet typé (temps de chargement et mémoire)
+
+    python bench_artifacts.py [clustered.csv] [--scale 100]
+
+--scale duplique l'entrée pour simuler un plus gros volume. La lecture
+« projection » ne charge que les colonnes utiles au dashboard.
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+import artifacts
+from etl import BASE_DIR
+
+
+DEFAULT_INPUT = os.path.join(BASE_DIR, "data", "hellowork_clustered.csv")
+PROJECTION = ["departement", "salaire_annuel", "cluster"]
+
+
+def mesurer(label, lecture):
+    start = time.perf_counter()
+    df = lecture()
+    elapsed = time.perf_counter() - start
+    memoire = df.memory_usage(deep=True).sum() / 1e6
+    print(f"   {label:<28} {elapsed:7.3f}s  {memoire:9.1f} Mo")
+    return df
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark CSV vs Parquet")
+    arg_parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    arg_parser.add_argument("--scale", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    df = artifacts.lire(args.input, "clustered")
+    df = pd.concat([df] * args.scale, ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "clustered.csv")
+        parquet_path = os.path.join(tmp, "clustered.parquet")
+        df.to_csv(csv_path, index=False)
+        artifacts.ecrire(df, parquet_path, "clustered")
+
+        print("=" * 60)
+        print(f"📦 {len(df)} lignes | CSV {os.path.getsize(csv_path) / 1e6:.1f} Mo"
+              f" | Parquet {os.path.getsize(parquet_path) / 1e6:.1f} Mo")
+        print("=" * 60)
+        mesurer("CSV (pd.read_csv)", lambda: pd.read_csv(csv_path))
+        mesurer("CSV typé (artifacts.lire)", lambda: artifacts.lire(csv_path, "clustered"))
+        parquet = mesurer("Parquet", lambda: artifacts.lire(parquet_path, "clustered"))
+        mesurer("Parquet projection", lambda: artifacts.lire(parquet_path, "clustered",
+                                                               columns=PROJECTION))
+        print("=" * 60)
+
+    print(f"✅ departement: {parquet['departement'].iloc[0]!r} (type conservé)")
+
+
+if __name__ == "__main__":
+    main()
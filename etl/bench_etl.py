@@ -0,0 +1,165 @@
+"""
+Benchmark ETL : logique ligne par ligne du notebook vs module etl vectorisé
+
+    python bench_etl.py [entree.csv] [--scale 10]
+
+Vérifie que les deux versions produisent le même résultat et affiche
+le débit en lignes/seconde. --scale duplique l'entrée pour simuler
+un plus gros volume.
+"""
+import re
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import etl
+
+
+# -------------------------------------------------
+# REFERENCE : CELLULES DU NOTEBOOK etl.ipynb
+# -------------------------------------------------
+def extraire_temps_travail(description):
+    if pd.isna(description):
+        return None
+
+    description_lower = description.lower()
+
+    if 'temps plein' in description_lower:
+        return 'Temps plein'
+    elif 'temps partiel' in description_lower:
+        return 'Temps partiel'
+    elif 'plein temps' in description_lower:
+        return 'Temps plein'
+    elif 'partiel' in description_lower:
+        return 'Temps partiel'
+    elif 'mi-temps' in description_lower:
+        return 'Mi-temps'
+    else:
+        return 'Non spécifié'
+
+
+def salaire_to_annuel(s):
+    if pd.isna(s):
+        return np.nan
+
+    s = str(s).lower().replace("€", "").replace(" ", "")
+
+    numbers = re.findall(r"\d+", s)
+    if not numbers:
+        return np.nan
+
+    numbers = list(map(float, numbers))
+    salaire = np.mean(numbers)
+
+    if "heure" in s or "/h" in s:
+        salaire *= 1820
+    elif "mois" in s or "/m" in s:
+        salaire *= 12
+    elif "an" in s or "annuel" in s or "/a" in s:
+        salaire = salaire
+    else:
+        if salaire < 100:
+            salaire *= 1820
+        elif salaire < 10000:
+            salaire *= 12
+
+    return float(salaire)
+
+
+def split_localisation(df, col_name='localisation'):
+    df = df.copy()
+
+    def extract_info(localisation):
+        if pd.isna(localisation):
+            return pd.Series({'region': None, 'departement': None})
+
+        loc_str = str(localisation)
+        match = re.search(r'-\s*(\d+)\s*$', loc_str)
+
+        if match:
+            departement = match.group(1)
+            region = loc_str[:match.start()].strip()
+        else:
+            region = loc_str.strip()
+            departement = None
+
+        return pd.Series({'region': region, 'departement': departement})
+
+    df[['region', 'departement']] = df[col_name].apply(extract_info)
+    return df
+
+
+def transform_notebook(df):
+    df = df.dropna(subset=['salaire'])
+    df['temps_travail'] = df['description'].apply(extraire_temps_travail)
+
+    df["salaire"] = df["salaire"].str.replace("\u202f", "", regex=False) \
+                                 .str.replace("\u00a0", "", regex=False) \
+                                 .str.replace(" ", "", regex=False)
+    df["salaire_annuel"] = df["salaire"].apply(salaire_to_annuel)
+    df = df.dropna(subset=["salaire_annuel"])
+
+    median_salary = df["salaire_annuel"].median()
+    df["categorie_salaire"] = df["salaire_annuel"].apply(
+        lambda x: "Bas salaire" if x < median_salary else "Haut salaire"
+    )
+    df = df.drop(columns=['description', 'salaire'])
+
+    Q1 = df["salaire_annuel"].quantile(0.25)
+    Q3 = df["salaire_annuel"].quantile(0.75)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+
+    df = df[df['salaire_annuel'] > 0]
+    df['salaire_annuel'] = df['salaire_annuel'].clip(lower_bound, upper_bound)
+
+    df = df.rename(columns={'titre': 'emploi'})
+    df["categorie_salaire"] = df["categorie_salaire"].map({"Bas salaire": 0, "Haut salaire": 1})
+    df["temps_travail"] = df["temps_travail"].map({"Temps partiel": 0, "Temps plein": 1})
+
+    df = split_localisation(df, 'localisation')
+    return df[etl.OUTPUT_COLUMNS]
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+def timed(transform, df):
+    start = time.perf_counter()
+    out = transform(df.copy())
+    return out, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark ETL notebook vs module")
+    arg_parser.add_argument("input", nargs="?", default=etl.DEFAULT_INPUT)
+    arg_parser.add_argument("--scale", type=int, default=1)
+    args = arg_parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    df = pd.concat([df] * args.scale, ignore_index=True)
+
+    pd.options.mode.chained_assignment = None
+    reference, t_notebook = timed(transform_notebook, df)
+    vectorized, t_module = timed(etl.transform, df)
+
+    pd.testing.assert_frame_equal(
+        reference.reset_index(drop=True),
+        vectorized.reset_index(drop=True),
+        check_dtype=False
+    )
+
+    print("=" * 60)
+    print(f"⏱️ ETL : {len(df)} lignes en entrée")
+    print("=" * 60)
+    print(f"   notebook (.apply)   {t_notebook:7.3f}s → {len(df) / t_notebook:>12,.0f} lignes/s")
+    print(f"   module (vectorisé)  {t_module:7.3f}s → {len(df) / t_module:>12,.0f} lignes/s")
+    print(f"\n🚀 Speed-up : x{t_notebook / t_module:.1f} (résultats identiques ✅)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
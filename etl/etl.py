@@ -0,0 +1,215 @@
+"""
+Phase 2 : ETL des offres scrapées (version module de etl.ipynb)
+
+    python etl.py [entree.csv] [sortie.csv]
+
+Reproduit hellowork_etl.csv à partir de hellowork_400pages.csv, avec des
+opérations vectorisées (str.contains / str.extract / NumPy) à la place
+des .apply ligne par ligne du notebook.
+
+Entrée et sortie peuvent aussi être des artefacts Parquet typés
+(.parquet, ou dossier de ParquetSink en entrée) : voir artifacts.py.
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from salaire import normaliser_salaires
+from localisation import normaliser_localisations
+from artifacts import lire, ecrire, iter_morceaux, ArtifactWriter
+from sketch import QuantileSketch
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INPUT = os.path.join(BASE_DIR, "data", "hellowork_400pages.csv")
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "data", "hellowork_etl.csv")
+
+OUTPUT_COLUMNS = ["emploi", "entreprise", "date_publication", "temps_travail",
+                  "salaire_annuel", "categorie_salaire", "region", "departement"]
+
+
+# -------------------------------------------------
+# TRANSFORMATIONS
+# -------------------------------------------------
+def extraire_temps_travail(description):
+    """
+    Temps de travail depuis la description : 1 = temps plein, 0 = temps partiel,
+    NaN sinon (mi-temps, non spécifié, description absente)
+    """
+    desc = description.str.lower()
+
+    conditions = [
+        desc.str.contains("temps plein", regex=False),
+        desc.str.contains("temps partiel", regex=False),
+        desc.str.contains("plein temps", regex=False),
+        desc.str.contains("partiel", regex=False),
+    ]
+    conditions = [c.fillna(False).to_numpy(dtype=bool) for c in conditions]
+
+    return pd.Series(
+        np.select(conditions, [1, 0, 1, 0], default=np.nan),
+        index=description.index
+    ).astype("Int64")
+
+
+def salaire_to_annuel(salaire):
+    """
+    Salaire annuel brut : moyenne de la fourchette, convertie selon l'unité
+    (heure, mois, an) ou, à défaut, l'ordre de grandeur (voir salaire.py)
+    """
+    return normaliser_salaires(salaire)["salaire_annuel"]
+
+
+def categoriser_salaire(salaire_annuel, median_salary=None):
+    """0 = bas salaire (< médiane), 1 = haut salaire"""
+    if median_salary is None:
+        median_salary = salaire_annuel.median()
+    return pd.Series(
+        np.where(salaire_annuel < median_salary, 0, 1),
+        index=salaire_annuel.index
+    )
+
+
+def bornes_iqr(q1, q3, k=1.5):
+    iqr = q3 - q1
+    return q1 - k * iqr, q3 + k * iqr
+
+
+def statistiques_salaire(salaire_annuel):
+    """Statistiques globales utilisées par transform : médiane et bornes IQR"""
+    lower_bound, upper_bound = bornes_iqr(salaire_annuel.quantile(0.25),
+                                          salaire_annuel.quantile(0.75))
+    return {
+        "median": salaire_annuel.median(),
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound
+    }
+
+
+def split_localisation(localisation):
+    """
+    'Cusset - Vichy - 03' → region 'Cusset - Vichy', departement '03'
+
+    Sans numéro, le département est retrouvé par le nom de ville
+    (voir localisation.py).
+
+    Returns:
+        DataFrame (region, departement)
+    """
+    parts = normaliser_localisations(localisation)
+    return pd.DataFrame({"region": parts["ville"], "departement": parts["departement"]})
+
+
+# -------------------------------------------------
+# PIPELINE
+# -------------------------------------------------
+def transform(df, stats=None):
+    """
+    Offres brutes (sortie du scraper) → offres nettoyées (hellowork_etl.csv)
+
+    Args:
+        stats: statistiques globales (statistiques_salaire), calculées sur df si None
+    """
+    df = df.dropna(subset=["salaire"]).copy()
+
+    df["temps_travail"] = extraire_temps_travail(df["description"])
+    df["salaire_annuel"] = salaire_to_annuel(df["salaire"])
+
+    df = df.dropna(subset=["salaire_annuel"])
+
+    # médiane et bornes calculées avant de retirer les salaires nuls (comme le notebook)
+    if stats is None:
+        stats = statistiques_salaire(df["salaire_annuel"])
+
+    df["categorie_salaire"] = categoriser_salaire(df["salaire_annuel"], stats["median"])
+
+    df = df[df["salaire_annuel"] > 0].copy()
+    df["salaire_annuel"] = df["salaire_annuel"].clip(stats["lower_bound"], stats["upper_bound"])
+
+    df[["region", "departement"]] = split_localisation(df["localisation"])
+
+    df = df.rename(columns={"titre": "emploi"})
+    return df[OUTPUT_COLUMNS]
+
+
+def run(input=DEFAULT_INPUT, output=DEFAULT_OUTPUT):
+    """
+    Exécute l'ETL complet
+
+    Returns:
+        DataFrame écrit dans output
+    """
+    df = lire(input, "brut")
+    print(f"📥 {len(df)} offres lues: {input}")
+
+    df = transform(df)
+
+    ecrire(df, output, "etl")
+    print(f"💾 {len(df)} offres écrites: {output}")
+
+    return df
+
+
+# -------------------------------------------------
+# MODE CHUNKÉ (archives volumineuses)
+# -------------------------------------------------
+def statistiques_salaire_chunked(input, chunksize=100_000, capacity=2000):
+    """
+    1ère passe : médiane et bornes IQR via un QuantileSketch, en ne lisant
+    que la colonne salaire, morceau par morceau
+    """
+    sketch = QuantileSketch(capacity)
+
+    for chunk in iter_morceaux(input, "brut", chunksize, columns=["salaire"]):
+        sketch.update(salaire_to_annuel(chunk["salaire"].dropna()).to_numpy())
+
+    lower_bound, upper_bound = bornes_iqr(sketch.quantile(0.25), sketch.quantile(0.75))
+    return {
+        "median": sketch.median(),
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound
+    }
+
+
+def run_chunked(input=DEFAULT_INPUT, output=DEFAULT_OUTPUT, chunksize=100_000,
+                capacity=2000):
+    """
+    ETL à mémoire bornée, en deux passes sur l'artefact brut :
+    statistiques globales (sketch), puis transformation et écriture
+    incrémentale de chaque morceau
+
+    Returns:
+        int: nombre d'offres écrites
+    """
+    stats = statistiques_salaire_chunked(input, chunksize, capacity)
+    print(f"📊 Médiane {stats['median']:,.0f} € | bornes "
+          f"[{stats['lower_bound']:,.0f} ; {stats['upper_bound']:,.0f}]")
+
+    n_in, n_out = 0, 0
+    with ArtifactWriter(output, "etl") as writer:
+        for chunk in iter_morceaux(input, "brut", chunksize):
+            out = transform(chunk, stats)
+            writer.write(out)
+            n_in += len(chunk)
+            n_out += len(out)
+
+    print(f"📥 {n_in} offres lues: {input}")
+    print(f"💾 {n_out} offres écrites: {output}")
+
+    return n_out
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="ETL des offres HelloWork")
+    arg_parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    arg_parser.add_argument("output", nargs="?", default=DEFAULT_OUTPUT)
+    arg_parser.add_argument("--chunksize", type=int, default=None,
+                            help="mode chunké à mémoire bornée (lignes par morceau)")
+    args = arg_parser.parse_args()
+
+    if args.chunksize:
+        run_chunked(args.input, args.output, chunksize=args.chunksize)
+    else:
+        run(args.input, args.output)
@@ -0,0 +1,162 @@
+"""
+Normalisation des localisations en lot
+
+    'Cusset - Vichy - 03' → ville 'Cusset - Vichy', departement '03',
+                            departement_nom 'Allier',
+                            region_officielle 'Auvergne-Rhône-Alpes'
+
+Le découpage « Ville - Sous-ville - NN » se fait avec une seule regex
+vectorisée, puis département → région officielle via la table locale
+data/departements.csv (aucun appel réseau). Une localisation sans numéro
+est résolue par le nom de ville : l'index est amorcé avec les noms de
+départements et apprend ville → département sur les chaînes qui portent
+un numéro. Chaque chaîne brute distincte n'est analysée qu'une fois.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEPARTEMENTS_CSV = os.path.join(BASE_DIR, "data", "departements.csv")
+
+LOCALISATION_PATTERN = r"^(?P<ville>.*?)-\s*(?P<code>\d+|2[ABab])\s*$"
+
+# anciens codes corses encore présents dans certaines sources
+ALIAS_CODES = {"201": "2A", "202": "2B"}
+
+COLUMNS = ["ville", "departement", "departement_nom", "region_officielle"]
+
+
+def cle_ville(ville):
+    """Clé de recherche : minuscules, sans accents ni tirets/apostrophes"""
+    return (
+        ville.str.normalize("NFKD")
+        .str.encode("ascii", "ignore").str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[-'’\s]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def normaliser_code(code):
+    """'3' → '03', '2a' → '2A', '201' → '2A'"""
+    code = code.str.strip().str.upper().replace(ALIAS_CODES)
+    return code.where(code.str.len() != 1, code.str.zfill(2))
+
+
+def code_texte(departement):
+    """
+    Départements lus en base (6, 6.0, '06', '2A', None) → codes texte
+
+    Une colonne entière qui contient un NULL est lue en float : 75.0 → '75',
+    les valeurs manquantes restent NaN.
+    """
+    numerique = pd.to_numeric(departement, errors="coerce")
+    entier = numerique.notna() & (numerique % 1 == 0)
+    code = departement.astype(str).mask(entier, numerique[entier].astype("Int64").astype(str))
+    return code.where(departement.notna())
+
+
+class LocationIndex:
+    """
+    Index en mémoire ville → département → région officielle, avec cache
+    des chaînes brutes déjà vues
+    """
+
+    def __init__(self, table=DEPARTEMENTS_CSV):
+        self.departements = pd.read_csv(table, dtype=str).set_index("code")
+        self._villes = dict(zip(cle_ville(self.departements["departement"]),
+                                self.departements.index))
+        self._index = {}
+        self._values = np.empty((0, len(COLUMNS)), dtype=object)
+
+    def __len__(self):
+        return len(self._index)
+
+    # -------------------------------------------------
+    # INDEX VILLE → DEPARTEMENT
+    # -------------------------------------------------
+    def apprendre(self, ville, departement):
+        """Ajoute ville → département (ville complète et premier segment)"""
+        connu = departement.isin(self.departements.index)
+        ville, departement = ville[connu], departement[connu]
+
+        premier = ville.str.split(" - ").str[0]
+        for cles in (cle_ville(ville), cle_ville(premier)):
+            for cle, code in zip(cles, departement):
+                self._villes.setdefault(cle, code)
+
+    def departement_de(self, ville):
+        """Département d'une ville d'après l'index, NaN si inconnue"""
+        premier = ville.str.split(" - ").str[0]
+        return (
+            cle_ville(ville).map(self._villes)
+            .fillna(cle_ville(premier).map(self._villes))
+        )
+
+    def region_de(self, departement):
+        """Région officielle d'un code département, NaN si inconnu"""
+        return normaliser_code(code_texte(departement)).map(self.departements["region"])
+
+    # -------------------------------------------------
+    # RESOLUTION
+    # -------------------------------------------------
+    def _parse_new(self, raw):
+        """Analyse les chaînes absentes du cache → tableau (n, 4)"""
+        s = pd.Series(raw, dtype=object)
+        parts = s.str.extract(LOCALISATION_PATTERN)
+
+        ville = parts["ville"].str.strip()
+        sans_numero = parts["code"].isna()
+        ville[sans_numero] = s[sans_numero].str.strip()
+
+        code = normaliser_code(parts["code"])
+        self.apprendre(ville[~sans_numero], code[~sans_numero])
+        code[sans_numero] = self.departement_de(ville[sans_numero])
+
+        nom = code.map(self.departements["departement"])
+        region = code.map(self.departements["region"])
+
+        values = np.column_stack([ville, code, nom, region]).astype(object)
+        values[pd.isna(values)] = None
+        return values
+
+    def resolve(self, localisation):
+        """
+        Args:
+            localisation: Series de localisations brutes (telles que scrapées)
+
+        Returns:
+            DataFrame (ville, departement, departement_nom, region_officielle),
+            None si non résolu
+        """
+        codes, uniques = pd.factorize(localisation)
+
+        new = [raw for raw in uniques if raw not in self._index]
+        if new:
+            start = len(self._index)
+            self._values = np.vstack([self._values, self._parse_new(new)])
+            self._index.update({raw: start + i for i, raw in enumerate(new)})
+
+        positions = np.fromiter((self._index[raw] for raw in uniques), dtype=np.intp,
+                                count=len(uniques))
+        values = np.full((len(codes), len(COLUMNS)), None, dtype=object)
+        valid = codes >= 0
+        values[valid] = self._values[positions[codes[valid]]]
+
+        return pd.DataFrame(values, columns=COLUMNS, index=localisation.index)
+
+
+_default_index = None
+
+
+def normaliser_localisations(localisation, index=None):
+    """Raccourci sur un index partagé par le processus (chargé au premier appel)"""
+    global _default_index
+    if index is None:
+        if _default_index is None:
+            _default_index = LocationIndex()
+        index = _default_index
+    return index.resolve(localisation)
@@ -0,0 +1,101 @@
+"""
+Normalisation des salaires en lot
+
+    '1 850 - 3 000 € / mois' → salaire_min 22200, salaire_max 36000, salaire_annuel 29100
+
+Une seule regex compilée extrait min / max / unité, les multiplicateurs
+sont appliqués en opérations NumPy, et chaque chaîne brute distincte n'est
+analysée qu'une fois (cache partagé entre les appels).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# 35h x 52 semaines
+HEURES_PAR_AN = 1820
+
+SALAIRE_PATTERN = re.compile(
+    r"(?P<min>\d+(?:[.,]\d+)?)"
+    r"(?:-(?P<max>\d+(?:[.,]\d+)?))?"
+    r"(?:.*?(?P<unite>heure|/h|mois|/m|annuel|/a|an))?"
+)
+
+UNITES = {"heure": HEURES_PAR_AN, "/h": HEURES_PAR_AN,
+          "mois": 12, "/m": 12,
+          "annuel": 1, "/a": 1, "an": 1}
+
+COLUMNS = ["salaire_min", "salaire_max", "salaire_annuel"]
+
+
+class SalaryParser:
+    """
+    Parser de salaires avec cache des chaînes brutes déjà vues
+
+    Sans unité, l'ordre de grandeur du montant moyen décide :
+    < 100 → horaire, < 10 000 → mensuel, sinon annuel.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._values = np.empty((0, 3))
+
+    def __len__(self):
+        return len(self._index)
+
+    def _parse_new(self, raw):
+        """Analyse les chaînes absentes du cache → tableau (n, 3) annualisé"""
+        s = (
+            pd.Series(raw, dtype=object)
+            .str.replace("[\u202f\u00a0 €]", "", regex=True)
+            .str.lower()
+        )
+        parts = s.str.extract(SALAIRE_PATTERN)
+
+        montant_min = pd.to_numeric(parts["min"].str.replace(",", ".", regex=False)).to_numpy(float)
+        montant_max = pd.to_numeric(parts["max"].str.replace(",", ".", regex=False)).to_numpy(float)
+        montant_max = np.where(np.isnan(montant_max), montant_min, montant_max)
+        moyenne = (montant_min + montant_max) / 2
+
+        facteur = parts["unite"].map(UNITES).to_numpy(float, copy=True)
+        sans_unite = np.isnan(facteur)
+        facteur[sans_unite] = np.select(
+            [moyenne[sans_unite] < 100, moyenne[sans_unite] < 10000],
+            [HEURES_PAR_AN, 12],
+            default=1
+        )
+
+        return np.column_stack([montant_min, montant_max, moyenne]) * facteur[:, None]
+
+    def parse(self, salaire):
+        """
+        Args:
+            salaire: Series de salaires bruts (tels que scrapés)
+
+        Returns:
+            DataFrame (salaire_min, salaire_max, salaire_annuel), NaN si illisible
+        """
+        codes, uniques = pd.factorize(salaire)
+
+        new = [raw for raw in uniques if raw not in self._index]
+        if new:
+            start = len(self._index)
+            self._values = np.vstack([self._values, self._parse_new(new)])
+            self._index.update({raw: start + i for i, raw in enumerate(new)})
+
+        positions = np.fromiter((self._index[raw] for raw in uniques), dtype=np.intp,
+                                count=len(uniques))
+        values = np.full((len(codes), 3), np.nan)
+        valid = codes >= 0
+        values[valid] = self._values[positions[codes[valid]]]
+
+        return pd.DataFrame(values, columns=COLUMNS, index=salaire.index)
+
+
+_default_parser = SalaryParser()
+
+
+def normaliser_salaires(salaire, parser=None):
+    """Raccourci sur un parser partagé par le processus"""
+    return (parser or _default_parser).parse(salaire)
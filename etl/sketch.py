@@ -0,0 +1,78 @@
+"""
+Sketch de quantiles fusionnable, à mémoire bornée
+
+Le sketch garde des centroïdes (valeur, poids) triés. Tant que le nombre de
+valeurs distinctes reste sous capacity, il est exact : quantile() donne le
+même résultat que pandas (interpolation linéaire). Au-delà, les centroïdes
+sont regroupés par paquets de poids égal (erreur de rang ~ 1 / capacity).
+
+Deux sketchs calculés sur des morceaux différents se fusionnent avec merge().
+"""
+import numpy as np
+
+
+class QuantileSketch:
+
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            uniques, counts = np.unique(values, return_counts=True)
+            self._add(uniques, counts.astype(float))
+        return self
+
+    def merge(self, other):
+        self._add(other.values, other.weights)
+        return self
+
+    def _add(self, values, weights):
+        values = np.concatenate([self.values, values])
+        weights = np.concatenate([self.weights, weights])
+
+        # regroupe les valeurs identiques
+        uniques, inverse = np.unique(values, return_inverse=True)
+        self.values = uniques
+        self.weights = np.bincount(inverse, weights=weights)
+
+        if len(self.values) > 2 * self.capacity:
+            self._compress()
+
+    def _compress(self):
+        cumulative = np.cumsum(self.weights)
+        buckets = np.minimum(
+            (cumulative - self.weights / 2) * self.capacity // cumulative[-1],
+            self.capacity - 1
+        ).astype(int)
+
+        weights = np.bincount(buckets, weights=self.weights)
+        sums = np.bincount(buckets, weights=self.values * self.weights)
+        keep = weights > 0
+
+        self.values = sums[keep] / weights[keep]
+        self.weights = weights[keep]
+
+    def quantile(self, q):
+        """Quantile q (0..1), interpolation linéaire comme pandas.Series.quantile"""
+        if not len(self.values):
+            return np.nan
+
+        # rang (0-indexé) du dernier élément de chaque centroïde
+        last_rank = np.cumsum(self.weights) - 1
+        h = (self.count - 1) * q
+        lo = int(np.floor(h))
+
+        x_lo = self.values[np.searchsorted(last_rank, lo)]
+        x_hi = self.values[np.searchsorted(last_rank, min(lo + 1, self.count - 1))]
+        return float(x_lo + (h - lo) * (x_hi - x_lo))
+
+    def median(self):
+        return self.quantile(0.5)
@@ -0,0 +1,229 @@
+"""
+Validation croisée + recherche d'hyper-paramètres de la régression logistique
+
+    from training import entrainer
+
+    resultat = entrainer(preprocessor, X_train, y_train,
+                         grid={"C": [0.01, 0.1, 1, 10], "solver": ["lbfgs", "newton-cg"]},
+                         cv=StratifiedKFold(n_splits=5, shuffle=True, random_state=42),
+                         report_path="metrics.json")
+    resultat.best_params        # {"C": ..., "solver": ...}
+    resultat.scores             # une ligne par combinaison (moyennes / écarts-types)
+    resultat.pipeline           # Pipeline(preprocessor, classifier) réentraîné sur tout X
+
+Le préprocesseur ne dépend pas des paramètres du classifieur : il est
+entraîné une seule fois par fold (et X transformé mis en cache), puis
+toutes les combinaisons (fold, paramètres) sont entraînées en parallèle
+sur les matrices NumPy (n_jobs processus). Le rapport JSON contient les
+scores par fold, les temps de fit et les meilleurs paramètres : les
+graphiques du notebook le lisent au lieu de valeurs en dur.
+"""
+import json
+import time
+import hashlib
+import itertools
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
+
+
+DEFAULT_GRID = {
+    "C": [0.001, 0.01, 0.1, 1, 10, 100, 1000],
+    "solver": ["lbfgs", "newton-cg"],
+}
+
+
+def hash_donnees(X, y):
+    """sha256 des données d'entraînement (reproductibilité du rapport)"""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(np.asarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def _python(value):
+    """Scalaire NumPy (np.logspace...) → type Python, sérialisable en JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _scores(y_true, y_pred):
+    return {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "f1": f1_score(y_true, y_pred, average="weighted"),
+    }
+
+
+def _fit_params(fold, params, Xt_train, y_train, Xt_val, y_val, base_params):
+    """Un fit du classifieur sur un fold déjà transformé (exécuté dans un worker)"""
+    from threadpoolctl import threadpool_limits
+
+    # un cœur par worker : c'est Parallel qui parallélise
+    with threadpool_limits(limits=1):
+        model = LogisticRegression(**base_params, **params)
+        start = time.perf_counter()
+        model.fit(Xt_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        train = _scores(y_train, model.predict(Xt_train))
+        val = _scores(y_val, model.predict(Xt_val))
+
+    return {
+        "fold": fold,
+        "params": params,
+        "temps_fit": fit_time,
+        "n_iter": int(np.max(model.n_iter_)),
+        **{f"train_{k}": v for k, v in train.items()},
+        **{f"val_{k}": v for k, v in val.items()},
+    }
+
+
+class ResultatEntrainement:
+    """Résultat de entrainer : rapport, scores par combinaison, pipeline final"""
+
+    def __init__(self, report, pipeline):
+        self.report = report
+        self.pipeline = pipeline
+
+    @property
+    def best_params(self):
+        return self.report["best_params"]
+
+    @property
+    def best(self):
+        """Scores moyens de la meilleure combinaison"""
+        return self.report["best"]
+
+    @property
+    def scores(self):
+        rows = [{**row["params"], **{k: v for k, v in row.items() if k != "params"}}
+                for row in self.report["resultats"]]
+        return pd.DataFrame(rows)
+
+    @property
+    def folds(self):
+        return pd.DataFrame([{**row["params"], **{k: v for k, v in row.items() if k != "params"}}
+                             for row in self.report["folds"]])
+
+    def save(self, path):
+        save_report(self.report, path)
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Rapport: {path}")
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def entrainer(preprocessor, X, y, grid=None, cv=None, scoring="f1",
+              base_params=None, n_jobs=-1, report_path=None, refit=True):
+    """
+    Validation croisée de LogisticRegression sur chaque combinaison de grid
+
+    Args:
+        preprocessor: ColumnTransformer non entraîné (cloné pour chaque fold)
+        grid: dict paramètre → valeurs (DEFAULT_GRID si None)
+        cv: splitter sklearn (StratifiedKFold(5, shuffle, 42) si None)
+        scoring: "f1" (pondéré) ou "accuracy", pour choisir la meilleure combinaison
+        base_params: paramètres communs du classifieur (max_iter, random_state)
+        n_jobs: nombre de workers joblib (-1 : tous les cœurs)
+        report_path: fichier JSON du rapport (None : pas d'écriture)
+        refit: réentraîne le meilleur pipeline sur tout X
+
+    Returns:
+        ResultatEntrainement
+    """
+    import sklearn
+
+    grid = {name: [_python(value) for value in values]
+            for name, values in (grid or DEFAULT_GRID).items()}
+    cv = cv or StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    base_params = {name: _python(value) for name, value in
+                   (base_params or {"max_iter": 1000, "random_state": 42}).items()}
+    y = np.asarray(y)
+
+    combinaisons = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    print(f"🔄 {len(combinaisons)} combinaisons x {cv.get_n_splits()} folds ({len(X)} lignes)")
+
+    # préprocesseur entraîné une fois par fold, partagé par toutes les combinaisons
+    start = time.perf_counter()
+    folds = []
+    for train_idx, val_idx in cv.split(X, y):
+        fold_preprocessor = clone(preprocessor).fit(X.iloc[train_idx], y[train_idx])
+        folds.append((fold_preprocessor.transform(X.iloc[train_idx]), y[train_idx],
+                      fold_preprocessor.transform(X.iloc[val_idx]), y[val_idx]))
+    preprocess_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_params)(i, params, *fold, base_params)
+        for params, (i, fold) in itertools.product(combinaisons, enumerate(folds))
+    )
+    search_time = time.perf_counter() - start
+
+    metrics = ["train_accuracy", "train_f1", "val_accuracy", "val_f1", "temps_fit"]
+    resultats = []
+    for params in combinaisons:
+        fold_rows = [row for row in rows if row["params"] == params]
+        entry = {"params": params}
+        for metric in metrics:
+            values = np.array([row[metric] for row in fold_rows])
+            entry[f"{metric}_mean"] = float(values.mean())
+            entry[f"{metric}_std"] = float(values.std())
+        entry["gap"] = entry["train_f1_mean"] - entry["val_f1_mean"]
+        resultats.append(entry)
+
+    best = max(resultats, key=lambda entry: entry[f"val_{scoring}_mean"])
+    for entry in resultats:
+        print(f"   {entry['params']} → val F1 {entry['val_f1_mean']:.4f} "
+              f"(±{entry['val_f1_std']:.4f}) | gap {entry['gap']:.4f} | "
+              f"{entry['temps_fit_mean']:.3f}s")
+
+    pipeline, refit_time = None, None
+    if refit:
+        pipeline = Pipeline([
+            ("preprocessor", clone(preprocessor)),
+            ("classifier", LogisticRegression(**base_params, **best["params"])),
+        ])
+        start = time.perf_counter()
+        pipeline.fit(X, y)
+        refit_time = time.perf_counter() - start
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "data_sha256": hash_donnees(X, y),
+        "n_samples": len(X),
+        "features": list(X.columns),
+        "cv": {"splitter": type(cv).__name__, "n_splits": cv.get_n_splits(),
+               **{k: v for k, v in vars(cv).items() if k in ("shuffle", "random_state")}},
+        "scoring": scoring,
+        "base_params": base_params,
+        "grid": grid,
+        "best_params": best["params"],
+        "best": best,
+        "resultats": resultats,
+        "folds": [{k: (float(v) if isinstance(v, np.floating) else v) for k, v in row.items()}
+                  for row in rows],
+        "temps": {"preprocessing": preprocess_time, "recherche": search_time,
+                  "refit": refit_time},
+    }
+
+    print(f"🏆 Meilleurs paramètres: {best['params']} (val F1 {best['val_f1_mean']:.4f}) "
+          f"| recherche {search_time:.2f}s")
+
+    if report_path:
+        save_report(report, report_path)
+
+    return ResultatEntrainement(report, pipeline)
@@ -0,0 +1,160 @@
+"""
+Choix du nombre de clusters KMeans (coude + silhouette) en une seule passe
+
+    from model_selection import selection_k
+
+    selection = selection_k(X_prepared, k_range=range(1, 11))
+    selection.scores          # k, inertie, silhouette, n_iter, temps de fit
+    selection.plot()          # méthode du coude + silhouette
+    kmeans = selection.models[3]
+
+Chaque k n'est entraîné qu'une fois (pool de processus, un k par tâche) :
+l'inertie, la silhouette et le modèle final viennent du même fit. La
+silhouette (O(n²)) est calculée sur un échantillon, sauf exact=True.
+Les résultats sont mis en cache sur disque, par hash des données et des
+paramètres : relancer le notebook sur les mêmes données ne refait aucun fit.
+"""
+import os
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def hash_donnees(X):
+    """sha256 du contenu, de la forme et du type de X"""
+    X = np.ascontiguousarray(X)
+    digest = hashlib.sha256()
+    digest.update(f"{X.shape}|{X.dtype.str}".encode())
+    digest.update(X.data)
+    return digest.hexdigest()
+
+
+def _fit_k(X, k, n_init, random_state, silhouette_sample, exact):
+    """Un fit KMeans + sa silhouette (exécuté dans un processus du pool)"""
+    from threadpoolctl import threadpool_limits
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    # un cœur par processus : c'est le pool qui parallélise
+    with threadpool_limits(limits=1):
+        start = time.perf_counter()
+        kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=n_init).fit(X)
+        fit_time = time.perf_counter() - start
+
+        silhouette = np.nan
+        if 1 < k < len(X):
+            sample_size = None if exact or len(X) <= silhouette_sample else silhouette_sample
+            silhouette = silhouette_score(X, kmeans.labels_, sample_size=sample_size,
+                                          random_state=random_state)
+
+    return kmeans, {
+        "k": k,
+        "inertie": kmeans.inertia_,
+        "silhouette": float(silhouette),
+        "n_iter": kmeans.n_iter_,
+        "temps_fit": fit_time,
+    }
+
+
+class SelectionK:
+    """Résultat de selection_k : scores par k et modèles entraînés"""
+
+    def __init__(self, scores, models, data_hash):
+        self.scores = scores
+        self.models = models
+        self.data_hash = data_hash
+
+    def meilleur_k(self):
+        """k de meilleure silhouette"""
+        return int(self.scores.loc[self.scores["silhouette"].idxmax(), "k"])
+
+    def labels(self, k):
+        return self.models[k].labels_
+
+    def plot(self):
+        import matplotlib.pyplot as plt
+
+        fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+
+        axes[0].plot(self.scores["k"], self.scores["inertie"], 'bo-', markersize=8)
+        axes[0].set_xlabel('Nombre de clusters (k)')
+        axes[0].set_ylabel('Inertie (Coût)')
+        axes[0].set_title('Méthode du Coude (Elbow Method)')
+        axes[0].grid(True)
+
+        silhouette = self.scores.dropna(subset=["silhouette"])
+        axes[1].plot(silhouette["k"], silhouette["silhouette"], 'ro-', markersize=8)
+        axes[1].set_xlabel('Nombre de clusters (k)')
+        axes[1].set_ylabel('Score de Silhouette')
+        axes[1].set_title('Méthode de la Silhouette (Plus c\'est haut, mieux c\'est)')
+        axes[1].grid(True)
+
+        plt.tight_layout()
+        plt.show()
+
+
+def selection_k(X, k_range=range(1, 11), n_init=10, random_state=42,
+                silhouette_sample=5000, exact=False, n_jobs=None, cache_dir=CACHE_DIR):
+    """
+    Entraîne KMeans pour chaque k de k_range (une fois chacun) et calcule
+    inertie + silhouette
+
+    Args:
+        silhouette_sample: taille de l'échantillon pour la silhouette
+        exact: silhouette sur toutes les lignes (O(n²))
+        n_jobs: nombre de processus (nombre de cœurs si None)
+        cache_dir: dossier du cache disque (None : pas de cache)
+
+    Returns:
+        SelectionK
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    k_range = list(k_range)
+    data_hash = hash_donnees(X)
+
+    params = f"{k_range}|{n_init}|{random_state}|{silhouette_sample}|{exact}"
+    cache_key = f"{data_hash[:16]}_{hashlib.sha256(params.encode()).hexdigest()[:8]}"
+    cache_path = os.path.join(cache_dir, f"{cache_key}.joblib") if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        print(f"♻️ Résultats en cache: {cache_path}")
+        scores, models = joblib.load(cache_path)
+        return SelectionK(scores, models, data_hash)
+
+    print(f"🔄 KMeans k={k_range[0]}..{k_range[-1]} ({len(X)} lignes, "
+          f"silhouette {'exacte' if exact else f'sur {min(silhouette_sample, len(X))} lignes'})")
+
+    models, rows = {}, []
+    n_jobs = n_jobs or os.cpu_count() or 1
+    # les k les plus coûteux d'abord
+    ordre = sorted(k_range, reverse=True)
+
+    if n_jobs == 1:
+        results = [_fit_k(X, k, n_init, random_state, silhouette_sample, exact) for k in ordre]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(ordre))) as pool:
+            futures = [pool.submit(_fit_k, X, k, n_init, random_state, silhouette_sample, exact)
+                       for k in ordre]
+            results = [future.result() for future in futures]
+
+    for kmeans, row in results:
+        models[row["k"]] = kmeans
+        rows.append(row)
+        print(f"   k={row['k']:>2} → inertie {row['inertie']:,.1f} | "
+              f"silhouette {row['silhouette']:.3f} | {row['temps_fit']:.2f}s")
+
+    scores = pd.DataFrame(rows).sort_values("k").reset_index(drop=True)
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        joblib.dump((scores, models), cache_path)
+        print(f"💾 Cache: {cache_path}")
+
+    return SelectionK(scores, models, data_hash)
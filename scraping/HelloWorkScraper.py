@@ -1,7 +1,11 @@
 import time
+import queue
 import random
+import hashlib
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
@@ -9,72 +13,308 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+OFFERS_LIST_SELECTOR = 'ul[aria-label="liste des offres"]'
+
+COLUMNS = ["titre", "entreprise", "localisation", "salaire",
+           "date_publication", "description", "offre_id"]
+
+
+def offer_fingerprint(url, titre, entreprise, localisation):
+    """
+    Clé stable d'une offre : chemin de l'URL de l'offre,
+    ou titre + entreprise + localisation si l'URL est absente
+    """
+    if url:
+        key = urlparse(url).path
+    else:
+        key = "|".join((v or "").strip().lower() for v in (titre, entreprise, localisation))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
 
 class HelloWorkScraper:
 
-    def __init__(self, driver, base_url, wait_time=10):
+    def __init__(self, driver, base_url, wait_time=10, http_fetcher=None,
+                 sink=None, parser="html.parser", seen_index=None, archive=None,
+                 scheduler=None):
         self.driver = driver
         self.base_url = base_url
         self.wait = WebDriverWait(driver, wait_time)
 
-        self.data = {
-            "titre": [],
-            "entreprise": [],
-            "localisation": [],
-            "salaire": [],
-            "date_publication": [],
-            "description": []
-        }
+        # fast path : HTML brut sans navigateur, Selenium en secours
+        self.http_fetcher = http_fetcher
+
+        # sortie en flux (CsvSink, SqliteSink, ParquetSink) au lieu de self.data
+        self.sink = sink
+
+        # "lxml" : parser en une passe avec sélecteurs précompilés
+        self.parser = parser
+        self._fast_parser = None
+        if parser == "lxml":
+            try:
+                from offer_parser import LxmlOfferParser
+            except ImportError:
+                raise ImportError("lxml requis: pip install lxml")
+            self._fast_parser = LxmlOfferParser(self._normalize_date)
+
+        # crawl incrémental : arrêt dès qu'une page ne contient que des offres connues
+        self.seen_index = seen_index
+        if sink is not None and seen_index is not None:
+            # empreintes persistées à chaque lot écrit par le sink, pas
+            # seulement en fin de crawl : un crash ne fait pas réécrire
+            # au crawl suivant des offres déjà sur disque
+            sink.on_flush = seen_index.commit
+        self.stop_reached = False
+        # première page abandonnée (avec un sink) : le checkpoint reste avant elle
+        self.failed_page = None
+
+        # HtmlArchive : copie compressée de chaque page pour re-parse hors-ligne
+        self.archive = archive
+        # date de référence des dates relatives (None → maintenant)
+        self.reference_time = None
+
+        # politesse + retries (voir scheduler.py)
+        if scheduler is None:
+            from scheduler import AdaptiveScheduler
+            scheduler = AdaptiveScheduler()
+        self.scheduler = scheduler
+
+        self.data = {col: [] for col in COLUMNS}
 
     # -------------------------------------------------
     # MAIN SCRAPING
     # -------------------------------------------------
     def scrape_page(self, page):
+        """Scrape une page avec retries, True si la page a été récupérée"""
         url = self.base_url.format(page)
 
+        for attempt in range(self.scheduler.max_retries + 1):
+            self.scheduler.wait(url)
+
+            html, latency = self._fetch_page(page, url)
+            self.scheduler.record(page, attempt, latency, html is not None)
+
+            if html is not None:
+                rows = self._parse_checked(page, attempt, url, html)
+                if rows is not None:
+                    self._commit_page(page, rows)
+                return rows is not None
+
+            if attempt < self.scheduler.max_retries:
+                delay = self.scheduler.retry_delay(attempt)
+                print(f"🔁 Page {page} : nouvel essai dans {delay:.1f}s")
+                time.sleep(delay)
+
+        return False
+
+    def _fetch_page(self, page, url):
+        """
+        HTML de la page : HTML brut si la liste des offres y est, Selenium
+        sinon
+
+        Returns:
+            (html, temps de réponse) : html None si la page n'a pas pu être
+            récupérée ; le temps ne compte que les requêtes (ni la pause
+            après le scroll, ni le parsing)
+        """
+        from fetchers import has_offers_list
+
+        latency = 0.0
+        if self.http_fetcher:
+            start = time.monotonic()
+            try:
+                html = self.http_fetcher.fetch(url)
+            except Exception as e:
+                print(f"⚠️ HTTP error page {page} → {e}")
+                html = None
+            latency += time.monotonic() - start
+
+            if has_offers_list(html):
+                return html, latency
+            if html is not None:
+                print(f"🐢 Page {page} : liste absente du HTML brut → Selenium")
+
+        start = time.monotonic()
         try:
             self.driver.get(url)
 
             # attendre la liste des offres
             self.wait.until(
                 EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, 'ul[aria-label="liste des offres"]')
+                    (By.CSS_SELECTOR, OFFERS_LIST_SELECTOR)
                 )
             )
+            latency += time.monotonic() - start
 
             self._human_behavior()
+            return self.driver.page_source, latency
 
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+        except Exception as e:
+            self._fetch_failed(page, e)
+            return None, latency + time.monotonic() - start
 
-            offers_list = soup.find(
-                "ul",
-                attrs={"aria-label": "liste des offres"}
-            )
+    def scrape_all_pages(self, start_page=1, end_page=50, resume=False):
+        start_page = self._resume_page(start_page, resume)
+        self.stop_reached = False
+        self.failed_page = None
 
-            if not offers_list:
-                print(f"⚠️ Page {page} : liste des offres introuvable")
-                return
+        for page in range(start_page, end_page + 1):
+            print(f"\n📄 Scraping page {page}")
+            if not self.scrape_page(page):
+                self._page_failed(page)
 
-            offres = offers_list.find_all("li", recursive=False)
+            if self.stop_reached:
+                print(f"🛑 Page {page} : uniquement des offres déjà connues, arrêt")
+                break
+            if self.failed_page is not None:
+                break
 
-            if not offres:
-                print(f"⚠️ Page {page} : aucune offre trouvée")
+        self._flush_sink()
 
-            for offre_li in offres:
-                self._extract_offer(offre_li)
-
-        except TimeoutException:
+    def _fetch_failed(self, page, e):
+        if isinstance(e, TimeoutException):
             print(f"⏱️ Timeout page {page}")
-        except WebDriverException as e:
+        elif isinstance(e, WebDriverException):
             print(f"🚨 Selenium error page {page} → {e}")
-        except Exception as e:
+        else:
             print(f"❌ Unknown error page {page} → {e}")
 
-    def scrape_all_pages(self, start_page=1, end_page=50):
-        for page in range(start_page, end_page + 1):
-            print(f"\n📄 Scraping page {page}")
-            self.scrape_page(page)
-            time.sleep(random.uniform(1.5, 3.5))
+    def _parse_checked(self, page, attempt, url, html):
+        """
+        _parse_fetched, None si le parser lève une exception : l'erreur est
+        enregistrée à part (scheduler.record_parse_error), elle ne ralentit
+        pas le crawl et la page n'est pas re-téléchargée
+        """
+        try:
+            return self._parse_fetched(page, url, html)
+        except Exception as e:
+            print(f"🐛 Page {page} : erreur du parser → {e}")
+            self.scheduler.record_parse_error(page, attempt, e)
+            return None
+
+    def _parse_fetched(self, page, url, html, warn=True):
+        if self.archive is not None:
+            self.archive.put(page, url, html)
+        return self.parse_page(html, page, warn=warn)
+
+    def parse_page(self, html, page, warn=True):
+        """
+        Parse le HTML d'une page de résultats
+
+        Returns:
+            list: une ligne (dict) par offre, None si la liste des offres est absente
+        """
+        if self._fast_parser is not None:
+            rows = self._fast_parser.parse(html)
+            if rows is None and warn:
+                print(f"⚠️ Page {page} : liste des offres introuvable")
+            elif rows == []:
+                print(f"⚠️ Page {page} : aucune offre trouvée")
+            return rows
+
+        soup = BeautifulSoup(html, "html.parser")
+
+        offers_list = soup.find(
+            "ul",
+            attrs={"aria-label": "liste des offres"}
+        )
+
+        if not offers_list:
+            if warn:
+                print(f"⚠️ Page {page} : liste des offres introuvable")
+            return None
+
+        offres = offers_list.find_all("li", recursive=False)
+
+        if not offres:
+            print(f"⚠️ Page {page} : aucune offre trouvée")
+
+        return [self._extract_offer(offre_li) for offre_li in offres]
+
+    # -------------------------------------------------
+    # CONCURRENT SCRAPING
+    # -------------------------------------------------
+    def scrape_all_pages_concurrent(self, fetchers, start_page=1, end_page=50,
+                                    resume=False):
+        """
+        Scrape les pages en parallèle sur un pool de fetchers
+
+        Args:
+            fetchers: liste de fetchers (SeleniumFetcher, HttpFetcher...),
+                      un worker par fetcher
+            resume: reprendre après la dernière page du checkpoint du sink
+
+        Les offres sont écrites dans l'ordre des pages, dès que toutes
+        les pages précédentes sont terminées. Avec un sink, la première
+        page en échec arrête l'écriture (voir _page_failed). Les délais par
+        hôte et les retries viennent de self.scheduler, partagé par tous
+        les workers (FixedDelayScheduler pour un intervalle fixe).
+        """
+        start_page = self._resume_page(start_page, resume)
+        self.stop_reached = False
+        self.failed_page = None
+
+        pool = queue.Queue()
+        for fetcher in fetchers:
+            pool.put(fetcher)
+
+        pending = {}
+        next_page = start_page
+
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {
+                executor.submit(self._fetch_and_parse, page, pool): page
+                for page in range(start_page, end_page + 1)
+            }
+            for future in as_completed(futures):
+                pending[futures[future]] = future.result()
+
+                while (next_page in pending and not self.stop_reached
+                       and self.failed_page is None):
+                    rows = pending.pop(next_page)
+                    if rows is None:
+                        self._page_failed(next_page)
+                    else:
+                        self._commit_page(next_page, rows)
+                    next_page += 1
+
+                if self.stop_reached or self.failed_page is not None:
+                    if self.stop_reached:
+                        print(f"🛑 Page {next_page - 1} : uniquement des offres déjà connues, arrêt")
+                    for pending_future in futures:
+                        pending_future.cancel()
+                    break
+
+        self._flush_sink()
+
+    def _fetch_and_parse(self, page, pool):
+        url = self.base_url.format(page)
+        print(f"📄 Scraping page {page}")
+
+        for attempt in range(self.scheduler.max_retries + 1):
+            self.scheduler.wait(url)
+
+            # seul fetch() est chronométré : latence du serveur pour le scheduler
+            fetcher = pool.get()
+            start = time.monotonic()
+            try:
+                html = fetcher.fetch(url)
+            except Exception as e:
+                self._fetch_failed(page, e)
+                html = None
+            finally:
+                latency = time.monotonic() - start
+                pool.put(fetcher)
+
+            self.scheduler.record(page, attempt, latency, html is not None)
+            if html is not None:
+                return self._parse_checked(page, attempt, url, html)
+
+            if attempt < self.scheduler.max_retries:
+                delay = self.scheduler.retry_delay(attempt)
+                print(f"🔁 Page {page} : nouvel essai dans {delay:.1f}s")
+                time.sleep(delay)
+
+        return None
 
     # -------------------------------------------------
     # OFFER EXTRACTION (1 <li> = 1 offre)
@@ -89,13 +329,81 @@ class HelloWorkScraper:
         offre_a = offre_li.select_one("a.tw-no-underline.tw-outline-none.tw-inline")
         description = self._safe_description(offre_a) if offre_a else None
         salaire = self._safe_salary(offre_a) if offre_a else None
+        url = self._safe_url(offre_li, offre_a)
+
+        return {
+            "titre": titre,
+            "entreprise": entreprise,
+            "localisation": localisation,
+            "salaire": salaire,
+            "date_publication": date_publication,
+            "description": description,
+            "offre_id": offer_fingerprint(url, titre, entreprise, localisation)
+        }
 
-        self.data["titre"].append(titre)
-        self.data["entreprise"].append(entreprise)
-        self.data["localisation"].append(localisation)
-        self.data["salaire"].append(salaire)
-        self.data["date_publication"].append(date_publication)
-        self.data["description"].append(description)
+    def _store_offer(self, row):
+        for key, values in self.data.items():
+            values.append(row[key])
+
+    # -------------------------------------------------
+    # STREAMING OUTPUT
+    # -------------------------------------------------
+    def _commit_page(self, page, rows):
+        if self.seen_index is not None:
+            rows = self._new_offers(rows)
+
+        if self.sink is None:
+            for row in rows:
+                self._store_offer(row)
+        else:
+            self.sink.write_page(page, rows)
+
+    def _page_failed(self, page):
+        """
+        Page abandonnée après ses retries. Sans sink, le crawl continue ;
+        avec un sink, il s'arrête : aucune page suivante n'est écrite, le
+        checkpoint reste sur la page précédente et une reprise (resume=True)
+        repart de la page en échec au lieu de la sauter.
+        """
+        print(f"❌ Page {page} abandonnée")
+        if self.sink is not None and self.failed_page is None:
+            self.failed_page = page
+            print(f"🛑 Arrêt : checkpoint conservé avant la page {page}, "
+                  f"relancer avec resume=True")
+
+    def _flush_sink(self):
+        if self.sink is not None:
+            self.sink.flush()
+
+        # les empreintes ne sont persistées qu'une fois les offres écrites
+        if self.seen_index is not None:
+            self.seen_index.commit()
+
+    def _new_offers(self, rows):
+        """Filtre les offres déjà vues (index + doublons de la page)"""
+        known = self.seen_index.known([row["offre_id"] for row in rows])
+
+        new_rows = []
+        for row in rows:
+            if row["offre_id"] in known:
+                continue
+            known.add(row["offre_id"])
+            self.seen_index.add(row["offre_id"])
+            new_rows.append(row)
+
+        if rows and not new_rows:
+            self.stop_reached = True
+
+        return new_rows
+
+    def _resume_page(self, start_page, resume):
+        if not resume or self.sink is None:
+            return start_page
+
+        last_page = self.sink.last_page()
+        if last_page >= start_page:
+            print(f"♻️ Reprise après la page {last_page}")
+        return max(start_page, last_page + 1)
 
     # -------------------------------------------------
     # SAFE METHODS
@@ -113,6 +421,13 @@ class HelloWorkScraper:
         except Exception:
             return None, None
 
+    def _safe_url(self, offre_li, offre_a):
+        try:
+            a = offre_li.select_one("a[data-cy='offerTitle']") or offre_a
+            return a.get("href") if a else None
+        except Exception:
+            return None
+
     def _safe_localisation(self, offre_li):
         try:
             loc = offre_li.find("div", attrs={"data-cy": "localisationCard"})
@@ -172,7 +487,7 @@ class HelloWorkScraper:
         if not text:
             return None
 
-        now = datetime.now()
+        now = self.reference_time or datetime.now()
         text = text.lower()
 
         try:
@@ -197,10 +512,13 @@ class HelloWorkScraper:
         self.driver.execute_script(
             f"window.scrollBy(0, {scroll_height});"
         )
-        time.sleep(random.uniform(0.3, 0.8))
+        time.sleep(self.scheduler.render_pause())
 
     # -------------------------------------------------
     # DATAFRAME
     # -------------------------------------------------
     def to_dataframe(self):
+        if self.sink is not None:
+            self._flush_sink()
+            return self.sink.to_dataframe()
         return pd.DataFrame(self.data)
\ No newline at end of file
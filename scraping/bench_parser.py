@@ -0,0 +1,83 @@
+"""
+Micro-benchmark du parsing des pages de résultats sauvegardées
+
+Compare le parser BeautifulSoup (html.parser) et le parser lxml
+précompilé, vérifie qu'ils produisent les mêmes lignes et affiche
+le débit en offres/seconde.
+
+    python bench_parser.py [dossier_html] [--repeat 20]
+"""
+import os
+import glob
+import time
+import argparse
+
+from HelloWorkScraper import HelloWorkScraper
+from fixture_server import FIXTURES_DIR
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def run(scraper, pages, repeat):
+    n_offers = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i, html in enumerate(pages):
+            n_offers += len(scraper.parse_page(html, i, warn=False) or [])
+    elapsed = time.perf_counter() - start
+    return n_offers, elapsed
+
+
+def comparable(rows):
+    # date_publication dépend de datetime.now() → comparée à la minute
+    return [
+        {**row, "date_publication": row["date_publication"].replace(second=0, microsecond=0)
+         if row["date_publication"] else None}
+        for row in rows
+    ]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("directory", nargs="?", default=FIXTURES_DIR)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.directory)
+    if not pages:
+        print(f"❌ Aucune page HTML dans {args.directory}")
+        return
+
+    scrapers = {
+        parser: HelloWorkScraper(driver=None, base_url="", parser=parser)
+        for parser in ("html.parser", "lxml")
+    }
+
+    for i, html in enumerate(pages):
+        reference, fast = (scrapers[p].parse_page(html, i, warn=False) for p in scrapers)
+        if comparable(reference or []) != comparable(fast or []):
+            print(f"⚠️ Page {i} : résultats différents entre les parsers")
+
+    print("=" * 60)
+    print(f"⏱️ PARSING : {len(pages)} pages x {args.repeat}")
+    print("=" * 60)
+
+    results = {}
+    for parser, scraper in scrapers.items():
+        n_offers, elapsed = run(scraper, pages, args.repeat)
+        results[parser] = n_offers / elapsed if elapsed else float("inf")
+        print(f"   {parser:<12} {n_offers:>7} offres en {elapsed:6.2f}s "
+              f"→ {results[parser]:,.0f} offres/s")
+
+    print(f"\n🚀 Speed-up lxml : x{results['lxml'] / results['html.parser']:.1f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import re
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from HelloWorkScraper import OFFERS_LIST_SELECTOR
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept-Language": "fr-FR,fr;q=0.9",
+}
+
+# présence de la liste des offres dans le HTML brut (rendu serveur)
+OFFERS_LIST_PATTERN = re.compile(r"""<ul[^>]*aria-label=["']liste des offres["']""")
+
+
+def has_offers_list(html):
+    return bool(html) and OFFERS_LIST_PATTERN.search(html) is not None
+
+
+# -------------------------------------------------
+# FETCHERS (url → HTML)
+# -------------------------------------------------
+class SeleniumFetcher:
+    """Récupère une page rendue par un driver Selenium (1 driver = 1 worker)"""
+
+    def __init__(self, driver, wait_time=10):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, wait_time)
+
+    def fetch(self, url):
+        self.driver.get(url)
+
+        # attendre la liste des offres
+        self.wait.until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, OFFERS_LIST_SELECTOR)
+            )
+        )
+
+        scroll_height = random.randint(300, 800)
+        self.driver.execute_script(
+            f"window.scrollBy(0, {scroll_height});"
+        )
+
+        return self.driver.page_source
+
+
+class HttpFetcher:
+    """
+    Récupère le HTML brut d'une page, sans navigateur (pages sans JS)
+
+    Les connexions keep-alive sont mises en pool : une seule instance
+    peut être partagée entre plusieurs workers (pool_size connexions par hôte).
+    """
+
+    def __init__(self, timeout=15, headers=None, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class StaticFirstFetcher:
+    """
+    Essaie d'abord le HTML brut (HttpFetcher), puis le navigateur
+    uniquement si la liste des offres n'est pas rendue côté serveur
+    """
+
+    def __init__(self, http_fetcher, fallback=None):
+        self.http_fetcher = http_fetcher
+        self.fallback = fallback
+
+    def fetch(self, url):
+        try:
+            html = self.http_fetcher.fetch(url)
+            if has_offers_list(html) or self.fallback is None:
+                return html
+        except requests.RequestException as e:
+            if self.fallback is None:
+                raise
+            print(f"⚠️ HTTP error {url} → {e}")
+
+        return self.fallback.fetch(url)
@@ -0,0 +1,70 @@
+"""
+Serveur local de substitution pour scraper hors-ligne
+
+Sert les pages HTML sauvegardées dans fixtures/ (page_1.html, page_2.html...)
+sur la même URL que HelloWork : .../recherche.html?page=N
+"""
+import os
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_PATH = "/fr-fr/emploi/recherche.html"
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """?page=N → fixtures/page_N.html (404 si la page n'est pas sauvegardée)"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = parse_qs(url.query).get("page", ["1"])[0]
+        path = os.path.join(self.directory, f"page_{page}.html")
+
+        if url.path != SEARCH_PATH or not os.path.exists(path):
+            self.send_error(404)
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_fixtures(directory=FIXTURES_DIR, port=0):
+    """
+    Lance le serveur dans un thread
+
+    Yields:
+        str: base_url à passer à HelloWorkScraper (avec {} pour le numéro de page)
+    """
+    handler = partial(FixtureHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f"http://127.0.0.1:{server.server_port}{SEARCH_PATH}?page={{}}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    with serve_fixtures(port=8000) as base_url:
+        print(f"🌐 Fixtures servies sur {base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
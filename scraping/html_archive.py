@@ -0,0 +1,154 @@
+"""
+Archive locale des pages HTML scrapées
+
+Chaque page est stockée compressée (gzip) sous le sha256 de son contenu
+(objects/ab/cdef....html.gz, une page identique n'est stockée qu'une fois),
+et référencée dans manifest.jsonl (page, url, sha256, date de récupération).
+
+reparse() ré-extrait les offres de l'archive sans toucher au réseau (une
+fois par page, dans l'ordre des pages), en parallèle sur plusieurs processus :
+
+    python html_archive.py <archive> <sortie.csv> [--parser lxml] [--workers 8]
+"""
+import os
+import gzip
+import json
+import mmap
+import zlib
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+class HtmlArchive:
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifest_path = os.path.join(root, "manifest.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest[2:]}.html.gz")
+
+    def put(self, page, url, html):
+        """Archive une page, retourne son sha256"""
+        content = html.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(content))
+            os.replace(tmp_path, path)
+
+        entry = {
+            "page": page,
+            "url": url,
+            "sha256": digest,
+            "fetched_at": datetime.now().isoformat(sep=" ")
+        }
+        with self._lock, open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+        return digest
+
+    def entries(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def latest_entries(self):
+        """
+        Dernière récupération de chaque page, triées par numéro de page
+
+        Le manifest garde chaque récupération (retries, repli Selenium) dans
+        l'ordre où elles se terminent, crawl concurrent compris.
+        """
+        latest = {}
+        for entry in self.entries():
+            current = latest.get(entry["page"])
+            if current is None or entry["fetched_at"] >= current["fetched_at"]:
+                latest[entry["page"]] = entry
+        return [latest[page] for page in sorted(latest)]
+
+    def read(self, digest):
+        """Décompresse une page directement depuis le fichier mappé en mémoire"""
+        with open(self._object_path(digest), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return zlib.decompress(mm, wbits=31).decode("utf-8")
+
+
+# -------------------------------------------------
+# RE-PARSE
+# -------------------------------------------------
+def _reparse_entry(task):
+    root, entry, parser = task
+
+    # import dans le worker : chaque processus a son propre scraper
+    from HelloWorkScraper import HelloWorkScraper
+
+    scraper = HelloWorkScraper(driver=None, base_url="", parser=parser)
+    # les dates relatives ("il y a 2 heures") sont résolues à la date de récupération
+    scraper.reference_time = datetime.fromisoformat(entry["fetched_at"])
+
+    html = HtmlArchive(root).read(entry["sha256"])
+    return scraper.parse_page(html, entry["page"]) or []
+
+
+def reparse(root, output=None, parser="html.parser", workers=None):
+    """
+    Ré-extrait les offres de l'archive, page par page (dernière
+    récupération de chaque page)
+
+    Args:
+        root: dossier de l'archive
+        output: chemin CSV de sortie (optionnel)
+        parser: "html.parser" (_extract_offer) ou "lxml"
+        workers: nombre de processus (défaut: nombre de CPU)
+
+    Returns:
+        DataFrame des offres
+    """
+    from HelloWorkScraper import COLUMNS
+
+    entries = HtmlArchive(root).latest_entries()
+    print(f"📦 {len(entries)} pages archivées")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _reparse_entry,
+            [(root, entry, parser) for entry in entries],
+            chunksize=8
+        )
+        df = pd.DataFrame(
+            [row for rows in results for row in rows],
+            columns=COLUMNS
+        )
+
+    print(f"✅ {len(df)} offres ré-extraites")
+
+    if output:
+        df.to_csv(output, index=False, encoding="utf-8")
+        print(f"💾 {output}")
+
+    return df
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Re-parse de l'archive HTML")
+    arg_parser.add_argument("archive")
+    arg_parser.add_argument("output")
+    arg_parser.add_argument("--parser", default="html.parser", choices=["html.parser", "lxml"])
+    arg_parser.add_argument("--workers", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    reparse(args.archive, args.output, parser=args.parser, workers=args.workers)
@@ -0,0 +1,119 @@
+"""
+Parser rapide des pages de résultats (lxml)
+
+L'arbre est construit une seule fois par page avec lxml, et tous les champs
+d'une offre sont extraits en une passe avec des XPath précompilés.
+Produit les mêmes lignes que HelloWorkScraper._extract_offer.
+"""
+from lxml import etree, html as lxml_html
+
+from HelloWorkScraper import offer_fingerprint
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# -------------------------------------------------
+# SELECTEURS PRECOMPILES
+# -------------------------------------------------
+OFFERS_XPATH = etree.XPath("(//ul[@aria-label='liste des offres'])[1]")
+ITEMS_XPATH = etree.XPath("./li")
+
+TITLE_XPATH = etree.XPath("(.//a[@data-cy='offerTitle'])[1]")
+H3_XPATH = etree.XPath("(.//h3)[1]")
+P_XPATH = etree.XPath(".//p")
+# libxml2 ferme <h3> devant un <p> : les <p> deviennent ses frères dans le lien
+HOISTED_P_XPATH = etree.XPath("following-sibling::p")
+LOCALISATION_XPATH = etree.XPath("(.//div[@data-cy='localisationCard'])[1]")
+DATE_XPATH = etree.XPath(
+    "(.//div[@class='tw-typo-s tw-text-grey-500 tw-pl-1 tw-pt-1'])[1]"
+)
+OFFER_LINK_XPATH = etree.XPath(
+    "(.//a[{}])[1]".format(" and ".join(
+        _has_class(name) for name in ("tw-no-underline", "tw-outline-none", "tw-inline")
+    ))
+)
+
+
+def _text(el, separator=""):
+    """Equivalent de BeautifulSoup get_text(separator, strip=True)"""
+    return separator.join(s.strip() for s in el.itertext() if s.strip())
+
+
+class LxmlOfferParser:
+    """
+    Args:
+        normalize_date: fonction texte brut → datetime (HelloWorkScraper._normalize_date)
+    """
+
+    def __init__(self, normalize_date):
+        self.normalize_date = normalize_date
+
+    def parse(self, html):
+        """
+        Returns:
+            list: une ligne (dict) par offre, None si la liste des offres est absente
+        """
+        root = lxml_html.document_fromstring(html)
+
+        offers_list = OFFERS_XPATH(root)
+        if not offers_list:
+            return None
+
+        return [self.extract_offer(li) for li in ITEMS_XPATH(offers_list[0])]
+
+    def extract_offer(self, li):
+        titre, entreprise = None, None
+        title = TITLE_XPATH(li)
+        if title:
+            h3 = H3_XPATH(title[0])
+            p = (P_XPATH(h3[0]) or HOISTED_P_XPATH(h3[0])) if h3 else []
+            if len(p) >= 2:
+                titre, entreprise = _text(p[0]), _text(p[1])
+
+        loc = LOCALISATION_XPATH(li)
+        localisation = _text(loc[0]) if loc else None
+
+        date_div = DATE_XPATH(li)
+        date_publication = self.normalize_date(_text(date_div[0]) if date_div else None)
+
+        description, salaire = None, None
+        offre_a = OFFER_LINK_XPATH(li)
+        if offre_a:
+            aria = offre_a[0].get("aria-label", "")
+            description = self._description(offre_a[0], aria)
+            salaire = self._salary(aria)
+
+        link = title or offre_a
+        url = link[0].get("href") if link else None
+
+        return {
+            "titre": titre,
+            "entreprise": entreprise,
+            "localisation": localisation,
+            "salaire": salaire,
+            "date_publication": date_publication,
+            "description": description,
+            "offre_id": offer_fingerprint(url, titre, entreprise, localisation)
+        }
+
+    @staticmethod
+    def _description(offre_a, aria):
+        if aria:
+            if aria.startswith("Voir offre de"):
+                aria = aria.replace("Voir offre de", "").strip()
+            return aria
+
+        all_text = _text(offre_a, separator=" ")
+        return all_text if all_text else None
+
+    @staticmethod
+    def _salary(aria):
+        if "€" not in aria:
+            return None
+
+        parts = aria.split("avec un salaire de")
+        if len(parts) < 2:
+            return None
+        return parts[1].split(",")[0].strip()
@@ -0,0 +1,169 @@
+"""
+Ordonnanceurs de politesse pour HelloWorkScraper
+
+Un scheduler décide du délai avant chaque requête (par hôte), du délai
+avant un nouvel essai d'une page en échec, et enregistre les temps de
+chaque page :
+
+- FixedDelayScheduler : ancien comportement (pause aléatoire fixe, pas de retry)
+- AdaptiveScheduler : délai ajusté à la latence et au taux d'erreur observés,
+  retries avec backoff exponentiel
+"""
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+
+class Scheduler:
+    """
+    Classe de base abstraite : les sous-classes définissent current_delay()
+    et, au besoin, retry_delay(), render_pause() et _update() (réaction aux
+    temps de réponse). wait() et record() sont partagés et thread-safe : un
+    même scheduler sert tous les workers d'un crawl concurrent.
+    """
+
+    max_retries = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self.metrics = []
+        self.parse_errors = []
+
+    def current_delay(self):
+        """Délai minimal entre deux requêtes vers un même hôte"""
+        raise NotImplementedError
+
+    def retry_delay(self, attempt):
+        return 0.0
+
+    def render_pause(self):
+        """Pause après le scroll Selenium, avant de lire page_source"""
+        return 0.0
+
+    def _update(self, latency, ok):
+        pass
+
+    def wait(self, url):
+        """Attend le prochain créneau libre pour l'hôte de url (thread-safe)"""
+        host = urlparse(url).netloc
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.current_delay()
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, page, attempt, latency, ok):
+        with self._lock:
+            self._update(latency, ok)
+            self.metrics.append({
+                "page": page,
+                "attempt": attempt,
+                "latency": latency,
+                "ok": ok,
+                "delay": self.current_delay()
+            })
+
+    def record_parse_error(self, page, attempt, error):
+        """Exception du parser : sans effet sur le délai (ce n'est pas le serveur)"""
+        with self._lock:
+            self.parse_errors.append({"page": page, "attempt": attempt, "error": repr(error)})
+
+    def metrics_dataframe(self):
+        return pd.DataFrame(self.metrics, columns=["page", "attempt", "latency", "ok", "delay"])
+
+    def summary(self):
+        if not self.metrics:
+            return {}
+
+        df = self.metrics_dataframe()
+        latencies = df.loc[df["ok"], "latency"].to_numpy()
+
+        return {
+            "requetes": len(df),
+            "pages_ok": int(df.loc[df["ok"], "page"].nunique()),
+            "retries": int((df["attempt"] > 0).sum()),
+            "taux_erreur": float(1 - df["ok"].mean()),
+            "erreurs_parse": len(self.parse_errors),
+            "latence_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latence_p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            "delai_final": self.current_delay()
+        }
+
+
+class FixedDelayScheduler(Scheduler):
+    """Pause aléatoire fixe entre deux pages, sans retry (comportement historique)"""
+
+    def __init__(self, min_delay=1.5, max_delay=3.5, render_pause=(0.3, 0.8)):
+        super().__init__()
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.render_pause_range = render_pause
+
+    def current_delay(self):
+        return random.uniform(self.min_delay, self.max_delay)
+
+    def render_pause(self):
+        return random.uniform(*self.render_pause_range)
+
+
+class AdaptiveScheduler(Scheduler):
+    """
+    Délai adaptatif (AIMD) :
+
+    - succès : le délai diminue (x decrease) sans descendre sous
+      min_delay ni sous latency_factor x latence moyenne du site
+    - erreur : le délai double (jusqu'à max_delay)
+    - taux d'erreur (moyenne mobile) : pénalité multiplicative
+
+    Les pages en échec sont ré-essayées max_retries fois, avec un backoff
+    exponentiel backoff_base x 2^attempt (+ jitter).
+    """
+
+    def __init__(self, initial_delay=1.5, min_delay=0.5, max_delay=60.0,
+                 latency_factor=1.0, decrease=0.85, smoothing=0.2,
+                 max_retries=3, backoff_base=2.0, jitter=0.25):
+        super().__init__()
+        self.delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.smoothing = smoothing
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.jitter = jitter
+
+        self.latency_avg = None
+        self.error_rate = 0.0
+
+    def current_delay(self):
+        delay = self.delay * (1 + 4 * self.error_rate)
+        return min(self.max_delay, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def retry_delay(self, attempt):
+        delay = self.backoff_base * 2 ** attempt
+        return min(self.max_delay, delay * random.uniform(1, 1 + self.jitter))
+
+    def _update(self, latency, ok):
+        self.error_rate += self.smoothing * ((0.0 if ok else 1.0) - self.error_rate)
+
+        if not ok:
+            self.delay = min(self.max_delay, self.delay * 2)
+            return
+
+        if self.latency_avg is None:
+            self.latency_avg = latency
+        else:
+            self.latency_avg += self.smoothing * (latency - self.latency_avg)
+
+        floor = max(self.min_delay, self.latency_factor * self.latency_avg)
+        self.delay = min(self.max_delay, max(floor, self.delay * self.decrease))
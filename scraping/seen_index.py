@@ -0,0 +1,78 @@
+import sqlite3
+from datetime import datetime
+
+
+class SeenIndex:
+    """
+    Index persistant (SQLite) des offres déjà collectées, par offre_id
+
+    Les nouvelles empreintes restent en attente jusqu'à commit(), appelé
+    par le scraper une fois les offres écrites : un crawl interrompu
+    ne marque jamais comme vues des offres perdues.
+    """
+
+    def __init__(self, path="seen_offers.db"):
+        self.path = path
+        self._pending = set()
+
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS seen_offers (
+                        offre_id TEXT PRIMARY KEY,
+                        first_seen TEXT NOT NULL
+                    )
+                """)
+        finally:
+            conn.close()
+
+    def known(self, offre_ids):
+        """Sous-ensemble des offre_ids déjà vus"""
+        offre_ids = list(set(offre_ids))
+        known = self._pending.intersection(offre_ids)
+
+        conn = sqlite3.connect(self.path)
+        try:
+            # par paquets pour rester sous la limite de paramètres SQLite
+            for i in range(0, len(offre_ids), 500):
+                chunk = offre_ids[i:i + 500]
+                cursor = conn.execute(
+                    f"SELECT offre_id FROM seen_offers WHERE offre_id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                known.update(row[0] for row in cursor)
+        finally:
+            conn.close()
+
+        return known
+
+    def __contains__(self, offre_id):
+        return bool(self.known([offre_id]))
+
+    def add(self, offre_id):
+        self._pending.add(offre_id)
+
+    def commit(self):
+        if not self._pending:
+            return
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO seen_offers (offre_id, first_seen) VALUES (?, ?)",
+                    [(offre_id, now) for offre_id in self._pending]
+                )
+        finally:
+            conn.close()
+
+        self._pending.clear()
+
+    def __len__(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM seen_offers").fetchone()[0]
+        finally:
+            conn.close()
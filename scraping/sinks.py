@@ -0,0 +1,291 @@
+"""
+Sorties en flux pour HelloWorkScraper
+
+Chaque page est écrite sur disque dès qu'elle est scrapée (append-only),
+avec un checkpoint de reprise : la mémoire reste constante quel que soit
+le nombre de pages, et un crawl interrompu repart de la dernière page écrite.
+"""
+import os
+import csv
+import json
+import sqlite3
+
+import pandas as pd
+
+from HelloWorkScraper import COLUMNS
+
+
+class _CheckpointedSink:
+    """
+    Bufferise les pages et les écrit par lots de batch_pages pages
+
+    on_flush (callable sans argument) est appelé après chaque lot écrit et
+    checkpointé : le scraper y persiste les offre_id vus (SeenIndex.commit).
+    """
+
+    def __init__(self, batch_pages=1):
+        self.batch_pages = batch_pages
+        self.on_flush = None
+        self._buffer = []
+        self._buffer_pages = 0
+        self._buffer_last_page = None
+
+    def write_page(self, page, rows):
+        self._buffer.extend(rows)
+        self._buffer_pages += 1
+        self._buffer_last_page = page
+
+        if self._buffer_pages >= self.batch_pages:
+            self.flush()
+
+    def flush(self):
+        if self._buffer_last_page is None:
+            return
+
+        self._write_batch(self._buffer, self._buffer_last_page)
+
+        self._buffer = []
+        self._buffer_pages = 0
+        self._buffer_last_page = None
+
+        if self.on_flush is not None:
+            self.on_flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_batch(self, rows, last_page):
+        raise NotImplementedError
+
+    def last_page(self):
+        """Dernière page écrite sur disque (0 si aucune)"""
+        raise NotImplementedError
+
+    def to_dataframe(self):
+        raise NotImplementedError
+
+
+class _JsonCheckpointMixin:
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, state):
+        # écriture atomique : un crash ne laisse jamais un checkpoint tronqué
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def last_page(self):
+        return self._load_checkpoint().get("last_page", 0)
+
+
+# -------------------------------------------------
+# CSV
+# -------------------------------------------------
+class CsvSink(_JsonCheckpointMixin, _CheckpointedSink):
+    """
+    CSV append-only + checkpoint JSON (<path>.checkpoint)
+
+    Le checkpoint mémorise la taille du fichier après chaque lot : à la
+    reprise, les lignes écrites après le dernier checkpoint sont tronquées.
+    Un fichier écrit avec moins de colonnes (avant offre_id) est réécrit
+    avec l'en-tête courant, les colonnes ajoutées restant vides.
+    """
+
+    def __init__(self, path, batch_pages=1):
+        super().__init__(batch_pages)
+        self.path = path
+        self.checkpoint_path = f"{path}.checkpoint"
+
+        offset = self._load_checkpoint().get("offset")
+        if offset is not None and os.path.exists(path) and os.path.getsize(path) > offset:
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+        self._upgrade_header()
+
+    def _upgrade_header(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+
+        with open(self.path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header == COLUMNS:
+            return
+
+        unknown = [col for col in header if col not in COLUMNS]
+        if unknown:
+            raise ValueError(f"{self.path} : colonnes inconnues {unknown}, reprise impossible "
+                             f"(attendu : {', '.join(COLUMNS)})")
+
+        tmp_path = f"{self.path}.tmp"
+        with open(self.path, newline="", encoding="utf-8") as src, \
+                open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+            writer = csv.DictWriter(dst, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(csv.DictReader(src))
+            dst.flush()
+            os.fsync(dst.fileno())
+            offset = dst.tell()
+
+        # checkpoint d'abord : un crash avant le remplacement laisse un offset
+        # plus grand que l'ancien fichier, qui n'est donc pas tronqué
+        state = self._load_checkpoint()
+        if state:
+            self._save_checkpoint({**state, "offset": offset})
+        os.replace(tmp_path, self.path)
+
+        missing = [col for col in COLUMNS if col not in header]
+        print(f"🛠️ {self.path} : colonnes ajoutées ({', '.join(missing)})")
+
+    def _write_batch(self, rows, last_page):
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            if is_new:
+                writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+
+        self._save_checkpoint({"last_page": last_page, "offset": offset})
+
+    def to_dataframe(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.read_csv(self.path)
+
+
+# -------------------------------------------------
+# SQLITE
+# -------------------------------------------------
+class SqliteSink(_CheckpointedSink):
+    """
+    Table SQLite append-only, le checkpoint est écrit dans la même
+    transaction que les offres (jamais de doublon à la reprise). Les
+    colonnes manquantes d'une table existante (offre_id) sont ajoutées.
+    """
+
+    def __init__(self, path, table="offres_brutes", batch_pages=1):
+        super().__init__(batch_pages)
+        self.path = path
+        self.table = table
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"({', '.join(f'{col} TEXT' for col in COLUMNS)})"
+                )
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS scraping_checkpoint (
+                        sink TEXT PRIMARY KEY,
+                        last_page INTEGER NOT NULL
+                    )
+                """)
+
+                existing = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+                for col in COLUMNS:
+                    if col not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT")
+                        print(f"🛠️ {table} : colonne {col} ajoutée")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def _write_batch(self, rows, last_page):
+        params = [
+            tuple(
+                str(row[col]) if col == "date_publication" and row[col] is not None
+                else row[col]
+                for col in COLUMNS
+            )
+            for row in rows
+        ]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {self.table} ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    params
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO scraping_checkpoint (sink, last_page) VALUES (?, ?)",
+                    (self.table, last_page)
+                )
+        finally:
+            conn.close()
+
+    def last_page(self):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT last_page FROM scraping_checkpoint WHERE sink = ?",
+                (self.table,)
+            ).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    def to_dataframe(self):
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(f"SELECT * FROM {self.table}", conn)
+        finally:
+            conn.close()
+
+
+# -------------------------------------------------
+# PARQUET
+# -------------------------------------------------
+class ParquetSink(_JsonCheckpointMixin, _CheckpointedSink):
+    """
+    Dataset Parquet : un fichier part-<page>.parquet par lot dans le dossier
+    path, checkpoint JSON dans path/_checkpoint.json (nécessite pyarrow)
+    """
+
+    def __init__(self, path, batch_pages=5):
+        super().__init__(batch_pages)
+        self.path = path
+        self.checkpoint_path = os.path.join(path, "_checkpoint.json")
+        os.makedirs(path, exist_ok=True)
+
+        # lots écrits après le dernier checkpoint (crash) → supprimés
+        last = self.last_page()
+        for name in os.listdir(path):
+            if name.startswith("part-") and int(name[5:10]) > last:
+                os.remove(os.path.join(path, name))
+
+    def _write_batch(self, rows, last_page):
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df.to_parquet(os.path.join(self.path, f"part-{last_page:05d}.parquet"), index=False)
+        self._save_checkpoint({"last_page": last_page})
+
+    def to_dataframe(self):
+        parts = sorted(name for name in os.listdir(self.path) if name.startswith("part-"))
+        if not parts:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(
+            [pd.read_parquet(os.path.join(self.path, name)) for name in parts],
+            ignore_index=True
+        )
@@ -0,0 +1,39 @@
+"""
+Tests hors-ligne : pages de scraping/fixtures, CSV de data/ et bases SQLite
+temporaires (la base dash/hellowork.db n'est jamais modifiée)
+
+Les modules du dépôt sont importés par leur nom, comme depuis leur dossier.
+"""
+import os
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+
+for folder in ("scraping", "etl", "dash",
+               os.path.join("ml", "classification"), os.path.join("ml", "clustering")):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+
+@pytest.fixture
+def offres_clusterisees():
+    """Offres de la table offres (sortie de l'ETL + cluster)"""
+    import pandas as pd
+    return pd.read_csv(os.path.join(DATA_DIR, "hellowork_clustered.csv"))
+
+
+@pytest.fixture
+def base_offres(tmp_path, offres_clusterisees):
+    """Base SQLite temporaire migrée, chargée avec les offres de data/"""
+    from connection_pool import connect
+    from ingestion import inserer_offres
+    from migrations import COLUMNS, migrer
+
+    conn = connect(str(tmp_path / "offres.db"))
+    migrer(conn, verbose=False)
+    inserer_offres(conn, offres_clusterisees[COLUMNS])
+    yield conn
+    conn.close()
@@ -0,0 +1,28 @@
+"""Rechargement de la table offres (db.py) depuis un CSV ou un Parquet"""
+import os
+import sqlite3
+
+import pandas as pd
+
+from artifacts import ecrire, lire
+from conftest import DATA_DIR
+
+import db
+
+
+def test_csv_et_parquet_identiques(tmp_path):
+    csv = os.path.join(DATA_DIR, "hellowork_clustered.csv")
+    parquet = str(tmp_path / "hellowork_clustered.parquet")
+    ecrire(lire(csv, "clustered"), parquet, "clustered")
+
+    tables = []
+    for fichier in (csv, parquet):
+        db_file = str(tmp_path / f"{os.path.basename(fichier)}.db")
+        assert db.recharger(fichier, db_file)
+
+        conn = sqlite3.connect(db_file)
+        tables.append(pd.read_sql("SELECT * FROM offres ORDER BY id", conn))
+        conn.close()
+
+    assert len(tables[0]) == len(pd.read_csv(csv))
+    pd.testing.assert_frame_equal(tables[0], tables[1])
@@ -0,0 +1,17 @@
+"""Module etl vectorisé vs cellules ligne par ligne du notebook"""
+import pandas as pd
+
+import etl
+from bench_etl import transform_notebook
+
+
+def test_transform_identique_au_notebook():
+    df = pd.read_csv(etl.DEFAULT_INPUT)
+
+    with pd.option_context("mode.chained_assignment", None):
+        reference = transform_notebook(df.copy())
+    vectorized = etl.transform(df.copy())
+
+    pd.testing.assert_frame_equal(reference.reset_index(drop=True),
+                                  vectorized.reset_index(drop=True),
+                                  check_dtype=False)
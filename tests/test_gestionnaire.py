@@ -0,0 +1,56 @@
+"""GestionnaireOffres : la base n'est migrée que sur demande"""
+import hashlib
+import os
+import shutil
+
+from conftest import ROOT
+from connection_pool import connect
+from gestionnaire import GestionnaireOffres
+from migrations import MIGRATIONS, schema_a_jour, version
+
+
+BASE = os.path.join(ROOT, "dash", "hellowork.db")
+
+
+def md5(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def test_lecture_ne_modifie_pas_la_base(tmp_path, base_offres):
+    base_offres.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    chemin = str(tmp_path / "offres.db")
+    avant = md5(chemin)
+
+    with GestionnaireOffres(chemin) as db:
+        assert db.get_stats()["total_offres"] > 0
+        db.tableau_de_bord(clusters=[1])
+        db.valeurs_distinctes("region", limit=5)
+
+    assert md5(chemin) == avant
+
+
+def test_base_non_migree(tmp_path, capsys):
+    chemin = str(tmp_path / "vide.db")
+
+    with GestionnaireOffres(chemin) as db:
+        assert "migrations.py" in capsys.readouterr().out
+        with db.connexion() as conn:
+            assert version(conn) == 0
+
+        db.init_db()
+        with db.connexion() as conn:
+            assert version(conn) == MIGRATIONS[-1][0]
+
+
+def test_base_livree_a_jour(tmp_path):
+    copie = str(tmp_path / "hellowork.db")
+    shutil.copy(BASE, copie)
+    avant = md5(copie)
+
+    conn = connect(copie)
+    try:
+        assert schema_a_jour(conn)
+    finally:
+        conn.close()
+    assert md5(copie) == avant
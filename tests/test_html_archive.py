@@ -0,0 +1,25 @@
+"""Archive HTML : re-parse hors-ligne"""
+from bench_parser import load_pages
+from fixture_server import FIXTURES_DIR
+from html_archive import HtmlArchive, reparse
+
+from test_parsers import scraper
+
+
+def test_reparse_derniere_recuperation_par_page(tmp_path):
+    root = str(tmp_path / "archive")
+    archive = HtmlArchive(root)
+    pages = load_pages(FIXTURES_DIR)[:3]
+
+    # ordre de fin d'un crawl concurrent, page 2 récupérée deux fois
+    # (première réponse invalide, puis le retry)
+    archive.put(2, "url-2", pages[2])
+    archive.put(3, "url-3", pages[2])
+    archive.put(1, "url-1", pages[0])
+    archive.put(2, "url-2", pages[1])
+
+    assert [entry["page"] for entry in archive.latest_entries()] == [1, 2, 3]
+
+    expected = [row["offre_id"] for i, html in enumerate(pages, 1)
+                for row in scraper().parse_page(html, i)]
+    assert reparse(root, workers=1)["offre_id"].tolist() == expected
@@ -0,0 +1,23 @@
+"""Clustering incrémental : identifiants de clusters conservés"""
+import numpy as np
+import pytest
+
+from incremental_clustering import IncrementalClusterer
+
+
+@pytest.mark.parametrize("n_manquants", [0, 1, 50])
+def test_centres_initialises_sur_les_clusters_existants(offres_clusterisees, n_manquants):
+    df = offres_clusterisees.copy()
+    df.loc[df.index[:n_manquants], "salaire_annuel"] = np.nan
+
+    clusterer = IncrementalClusterer().partial_fit(df, df["cluster"].to_numpy())
+
+    valid = df["salaire_annuel"].notna().to_numpy()
+    predicted = clusterer.predict(df)[valid]
+    assert (predicted == df["cluster"].to_numpy()[valid]).mean() > 0.99
+
+
+def test_labels_de_longueur_differente(offres_clusterisees):
+    df = offres_clusterisees.iloc[:100]
+    with pytest.raises(ValueError):
+        IncrementalClusterer().partial_fit(df, df["cluster"].to_numpy()[:50])
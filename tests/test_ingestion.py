@@ -0,0 +1,95 @@
+"""Ingestion en masse : compteurs, clé naturelle, normalisation du département"""
+import pytest
+
+from connection_pool import connect
+from ingestion import inserer_offres
+from migrations import COLUMNS, migrer
+
+
+def offre(emploi="Dev", date="2025-12-16 10:00:00", region="Lyon", departement=69,
+          salaire=40000.0, cluster=0):
+    return {"emploi": emploi, "entreprise": "ACME", "date_publication": date,
+            "temps_travail": 1, "salaire_annuel": salaire, "categorie_salaire": 1,
+            "region": region, "departement": departement, "cluster": cluster}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "offres.db"))
+    migrer(conn, verbose=False)
+    yield conn
+    conn.close()
+
+
+def compteurs(stats):
+    return {k: stats[k] for k in ("lues", "inserees", "mises_a_jour", "ignorees")}
+
+
+def test_doublons_dans_un_lot(conn):
+    offres = [offre("A", salaire=1), offre("B"), offre("A", salaire=2), offre("C")]
+
+    stats = inserer_offres(conn, offres, mode="update")
+    assert compteurs(stats) == {"lues": 4, "inserees": 3, "mises_a_jour": 0, "ignorees": 1}
+    # mode update : la dernière occurrence du lot l'emporte
+    assert conn.execute("SELECT salaire_annuel FROM offres WHERE emploi = 'A'").fetchall() == [(2,)]
+
+    stats = inserer_offres(conn, offres, mode="update")
+    assert compteurs(stats) == {"lues": 4, "inserees": 0, "mises_a_jour": 3, "ignorees": 1}
+
+    stats = inserer_offres(conn, offres + [offre("D")])
+    assert compteurs(stats) == {"lues": 5, "inserees": 1, "mises_a_jour": 0, "ignorees": 4}
+
+
+def test_mode_ignore_garde_la_premiere_occurrence(conn):
+    inserer_offres(conn, [offre("A", salaire=1), offre("A", salaire=2)])
+    assert conn.execute("SELECT salaire_annuel FROM offres").fetchall() == [(1,)]
+
+
+def test_sans_count_sur_offres(conn):
+    requetes = []
+    conn.set_trace_callback(requetes.append)
+    inserer_offres(conn, [offre("A"), offre("B")], mode="update", chunksize=1)
+    conn.set_trace_callback(None)
+    assert not [sql for sql in requetes if "COUNT(*) FROM offres" in sql]
+
+
+def test_date_et_region_vides_dans_la_cle(conn):
+    offres = [offre(date=None), offre(date=None, salaire=1), offre(region=None, date=None)]
+
+    stats = inserer_offres(conn, offres)
+    assert (stats["inserees"], stats["ignorees"]) == (2, 1)
+
+    stats = inserer_offres(conn, offres)
+    assert (stats["inserees"], stats["ignorees"]) == (0, 3)
+    assert conn.execute("SELECT COUNT(*) FROM offres").fetchone()[0] == 2
+
+
+def test_departement_stocke_en_entier(conn):
+    valeurs = ["06", "6", 6, "6.0", 6.0, " 06 ", "", None, "2A"]
+    inserer_offres(conn, [offre(str(i), departement=v) for i, v in enumerate(valeurs)])
+
+    rows = conn.execute("SELECT departement, typeof(departement) FROM offres "
+                        "ORDER BY CAST(emploi AS INTEGER)").fetchall()
+    assert rows == [(6, "integer")] * 6 + [(None, "null")] * 2 + [("2A", "text")]
+
+
+def test_migration_cle_naturelle(tmp_path):
+    conn = connect(str(tmp_path / "v4.db"))
+    migrer(conn, verbose=False)
+
+    # base en version 4 : index unique sur les colonnes brutes (NULL distincts)
+    conn.execute("DROP INDEX idx_offres_cle")
+    conn.execute("CREATE UNIQUE INDEX idx_offres_cle "
+                 "ON offres(emploi, entreprise, region, date_publication)")
+    conn.execute("PRAGMA user_version = 4")
+    conn.executemany(f"INSERT INTO offres ({', '.join(COLUMNS)}) "
+                     f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                     [tuple(offre(date=None, salaire=s).values()) for s in (1, 2, 3)])
+
+    assert migrer(conn, verbose=False) == 5
+    assert conn.execute("SELECT salaire_annuel FROM offres").fetchall() == [(1,)]
+    assert conn.execute("SELECT salaire_annuel FROM offres_doublons "
+                        "ORDER BY id").fetchall() == [(2,), (3,)]
+    assert conn.execute("SELECT SUM(n) FROM offres_resume").fetchone()[0] == 1
+    assert inserer_offres(conn, [offre(date=None)])["ignorees"] == 1
+    conn.close()
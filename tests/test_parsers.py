@@ -0,0 +1,53 @@
+"""Parser lxml précompilé vs BeautifulSoup, crawl hors-ligne sur les fixtures"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from HelloWorkScraper import HelloWorkScraper
+from bench_parser import load_pages
+from fetchers import HttpFetcher
+from fixture_server import FIXTURES_DIR, serve_fixtures
+from scheduler import FixedDelayScheduler
+
+
+REFERENCE_TIME = datetime(2025, 12, 16, 17, 0)
+
+
+def scraper(parser="html.parser", base_url="", **kwargs):
+    scraper = HelloWorkScraper(driver=None, base_url=base_url, parser=parser,
+                               scheduler=FixedDelayScheduler(0, 0, (0, 0)), **kwargs)
+    scraper.reference_time = REFERENCE_TIME
+    return scraper
+
+
+@pytest.fixture(scope="module")
+def pages():
+    # page_4.html : liste des offres rendue en JS, absente du HTML brut
+    return load_pages(FIXTURES_DIR)[:3]
+
+
+def test_lxml_identique_a_beautifulsoup(pages):
+    reference, fast = scraper("html.parser"), scraper("lxml")
+    for i, html in enumerate(pages, 1):
+        rows = reference.parse_page(html, i)
+        assert rows, f"page {i} vide"
+        assert fast.parse_page(html, i) == rows
+
+
+def test_liste_absente():
+    html = load_pages(FIXTURES_DIR)[3]
+    assert scraper("html.parser").parse_page(html, 4, warn=False) is None
+    assert scraper("lxml").parse_page(html, 4, warn=False) is None
+
+
+def test_crawl_concurrent_hors_ligne(pages):
+    expected = [row for i, html in enumerate(pages, 1)
+                for row in scraper().parse_page(html, i)]
+
+    with serve_fixtures() as base_url:
+        crawler = scraper(base_url=base_url)
+        fetchers = [HttpFetcher(), HttpFetcher()]
+        crawler.scrape_all_pages_concurrent(fetchers, 1, len(pages))
+
+    assert pd.DataFrame(expected).equals(crawler.to_dataframe())
@@ -0,0 +1,65 @@
+"""Prédiction en lot vs offre par offre (pipeline sklearn, prédicteur compilé)"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from model_predictor import ClusterPredictor
+from model_registry import REGISTRY_DIR
+
+
+COLUMNS = ['emploi', 'entreprise', 'region', 'departement',
+           'salaire_annuel', 'categorie_salaire', 'temps_travail']
+
+MODEL_PATH = os.path.join(os.path.dirname(REGISTRY_DIR), "model_class")
+
+
+@pytest.fixture(scope="module", params=["joblib", "registre"])
+def predictor(request):
+    if request.param == "joblib":
+        return ClusterPredictor(MODEL_PATH, verbose=False, cache_size=0)
+    return ClusterPredictor.from_registry(verbose=False, cache_size=0)
+
+
+@pytest.fixture
+def offres(offres_clusterisees):
+    return offres_clusterisees[COLUMNS].iloc[:500]
+
+
+def test_batch_identique_a_l_unitaire(predictor, offres):
+    assert predictor.compiled is not None
+
+    batch = predictor.predict_batch(offres)
+    probas = predictor.predict_proba_batch(offres)
+
+    for i, offre in enumerate(offres.itertuples(index=False, name=None)):
+        cluster, probas_dict = predictor.predict_cluster_with_proba(*offre)
+        assert batch[i] == cluster == predictor.predict_cluster(*offre)
+        np.testing.assert_allclose(probas[i] * 100, list(probas_dict.values()), rtol=1e-9)
+
+        X = predictor.preprocess_input(*offre)
+        assert int(predictor.model.predict(X)[0]) == cluster
+
+
+def test_batch_lignes_non_predictibles(predictor, offres):
+    offres = offres.copy()
+    offres.loc[offres.index[:3], 'salaire_annuel'] = np.nan
+
+    clusters = predictor.predict_batch(offres, default=-1)
+    assert (clusters[:3] == -1).all()
+    assert np.isnan(predictor.predict_proba_batch(offres)[:3]).all()
+
+
+def test_registre_sans_sklearn():
+    # processus neuf : sklearn est déjà importé par les autres tests
+    csv = os.path.join(ROOT, "data", "hellowork_clustered.csv")
+    code = ("import sys, pandas as pd\n"
+            "from model_predictor import ClusterPredictor\n"
+            "p = ClusterPredictor.from_registry(verbose=False)\n"
+            f"p.predict_proba_batch(pd.read_csv({csv!r}, nrows=50))\n"
+            "assert 'sklearn' not in sys.modules, 'sklearn importé'\n")
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.join(ROOT, "dash"), check=True,
+                   capture_output=True)
@@ -0,0 +1,103 @@
+"""Agrégats SQL du dashboard vs le même calcul en pandas"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+from ingestion import inserer_offres
+from requetes import (Filtre, offres_par_region, regions_officielles, tableau_de_bord,
+                      villes_de_region)
+
+
+@pytest.fixture(scope="module")
+def region_par_departement():
+    table = pd.read_csv(os.path.join(DATA_DIR, "departements.csv"), dtype=str)
+    return table.set_index("code")["region"]
+
+
+@pytest.fixture
+def offres(base_offres, region_par_departement):
+    df = pd.read_sql("SELECT * FROM offres", base_offres)
+    df["region_officielle"] = (df["departement"].astype(str).str.zfill(2)
+                               .map(region_par_departement).fillna("Autre"))
+    return df
+
+
+def test_regions_officielles():
+    departements = pd.Series([6, "06", " 6", 75, 201, "2b", None, 999], dtype=object)
+    assert regions_officielles(departements).tolist() == [
+        "Provence-Alpes-Côte d'Azur", "Provence-Alpes-Côte d'Azur",
+        "Provence-Alpes-Côte d'Azur", "Île-de-France", "Corse", "Corse", "Autre", "Autre"]
+
+    # colonne entière avec un NULL, lue en float
+    assert regions_officielles(pd.Series([75.0, 3.0, np.nan])).tolist() == [
+        "Île-de-France", "Auvergne-Rhône-Alpes", "Autre"]
+
+
+def filtres(df):
+    cities = df["region"].value_counts().index[:3].tolist()
+    companies = df["entreprise"].value_counts().index[:5].tolist()
+    return [{}, {"cities": cities}, {"depts": [75, 69, 13]}, {"clusters": [1, 2]},
+            {"companies": companies, "clusters": [0, 1]}, {"cities": ["nulle part"]}]
+
+
+def filtrer(df, cities=None, depts=None, clusters=None, companies=None):
+    for col, values in (("region", cities), ("departement", depts),
+                        ("cluster", clusters), ("entreprise", companies)):
+        if values:
+            df = df[df[col].isin(values)]
+    return df
+
+
+def test_tableau_de_bord_identique_a_pandas(base_offres, offres):
+    for filtre in filtres(offres):
+        agregats = tableau_de_bord(base_offres, Filtre(**filtre))
+        dff = filtrer(offres, **filtre)
+
+        kpis = agregats["kpis"]
+        assert kpis["count"] == len(dff)
+        if dff.empty:
+            assert agregats["regions"].empty and agregats["salaires_cluster"].empty
+            continue
+        assert kpis["salaire_moyen"] == pytest.approx(dff["salaire_annuel"].mean())
+        assert kpis["nb_departements"] == dff["departement"].nunique()
+
+        regions = (dff.groupby("region_officielle")["salaire_annuel"]
+                   .agg(["count", "mean"]).reset_index())
+        regions.columns = ["region", "count", "avg_salary"]
+        regions = regions[(regions["region"] != "Autre") & (regions["count"] > 0)]
+        pd.testing.assert_frame_equal(agregats["regions"], regions.reset_index(drop=True),
+                                      check_dtype=False)
+
+        assert agregats["temps_travail"][1] == (dff["temps_travail"] == 1).sum()
+        assert agregats["categorie_salaire"][0] == (dff["categorie_salaire"] != 1).sum()
+        assert agregats["top_emplois"]["count"].tolist() == \
+            dff["emploi"].value_counts().head(10).tolist()
+
+        for row in agregats["salaires_cluster"].itertuples():
+            v = np.sort(dff.loc[dff["cluster"] == row.cluster, "salaire_annuel"].dropna())
+            q1, median, q3 = np.percentile(v, [25, 50, 75])
+            inside = v[(v >= q1 - 1.5 * (q3 - q1)) & (v <= q3 + 1.5 * (q3 - q1))]
+            assert row.n == len(v)
+            assert [row.q1, row.median, row.q3, row.lowerfence, row.upperfence] == \
+                pytest.approx([q1, median, q3, inside.min(), inside.max()])
+            assert [row.mean, row.sd] == pytest.approx([v.mean(), v.std(ddof=1)])
+
+
+def test_villes_de_region(base_offres, offres):
+    region = "Auvergne-Rhône-Alpes"
+    expected = offres.loc[offres["region_officielle"] == region, "region"].dropna().unique()
+    assert sorted(villes_de_region(base_offres, region)) == sorted(expected)
+
+
+def test_departement_null(base_offres):
+    region = "Île-de-France"
+    regions, villes = offres_par_region(base_offres, Filtre()), villes_de_region(base_offres, region)
+    assert not regions.empty and villes
+
+    inserer_offres(base_offres, [{"emploi": "Dev", "entreprise": "ACME", "region": "Nulle part",
+                                  "departement": None, "salaire_annuel": 40000.0}])
+    pd.testing.assert_frame_equal(offres_par_region(base_offres, Filtre()), regions)
+    assert villes_de_region(base_offres, region) == villes
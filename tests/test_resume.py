@@ -0,0 +1,62 @@
+"""Table de synthèse offres_resume : triggers vs recalcul complet"""
+import pytest
+
+from ingestion import inserer_offres
+from migrations import COLUMNS, reconstruire_resume
+
+
+def resume(conn):
+    return conn.execute("SELECT * FROM offres_resume").fetchall()
+
+
+def assert_resume_a_jour(conn):
+    incremental = resume(conn)
+    conn.execute("BEGIN")
+    reconstruire_resume(conn)
+    reference = resume(conn)
+    conn.execute("ROLLBACK")
+
+    key = lambda row: tuple((v is None, v) for v in row[:6])
+    incremental, reference = sorted(incremental, key=key), sorted(reference, key=key)
+    assert [row[:8] for row in incremental] == [row[:8] for row in reference]
+    for a, b in zip(incremental, reference):
+        assert a[8:] == pytest.approx(b[8:], rel=1e-9)
+
+
+@pytest.fixture
+def conn(base_offres):
+    return base_offres
+
+
+def test_resume_apres_ingestion(conn):
+    assert conn.execute("SELECT SUM(n) FROM offres_resume").fetchone()[0] == \
+        conn.execute("SELECT COUNT(*) FROM offres").fetchone()[0]
+    assert_resume_a_jour(conn)
+
+
+def test_resume_insert_delete_update(conn):
+    conn.execute("INSERT INTO offres (emploi, entreprise, region, departement, "
+                 "salaire_annuel, temps_travail, categorie_salaire, cluster) "
+                 "VALUES ('Dev', 'ACME', 'Lyon', 69, 45000, 1, 1, 2), "
+                 "('Dev', 'ACME', NULL, NULL, NULL, NULL, NULL, 0)")
+    assert_resume_a_jour(conn)
+
+    conn.execute("DELETE FROM offres WHERE id % 7 = 0")
+    assert_resume_a_jour(conn)
+
+    conn.execute("UPDATE offres SET cluster = (cluster + 1) % 3 WHERE id % 5 = 0")
+    conn.execute("UPDATE offres SET salaire_annuel = salaire_annuel * 2, region = 'Paris' "
+                 "WHERE id % 11 = 0")
+    conn.execute("UPDATE offres SET salaire_annuel = NULL WHERE id % 13 = 0")
+    assert_resume_a_jour(conn)
+
+
+def test_resume_upsert_et_remplacement(conn, offres_clusterisees):
+    offres = offres_clusterisees[COLUMNS].iloc[1000:3000].copy()
+    offres["salaire_annuel"] *= 1.1
+    inserer_offres(conn, offres, mode="update")
+    assert_resume_a_jour(conn)
+
+    inserer_offres(conn, offres.iloc[:500], remplacer=True)
+    assert conn.execute("SELECT SUM(n) FROM offres_resume").fetchone()[0] == 500
+    assert_resume_a_jour(conn)
@@ -0,0 +1,64 @@
+"""Scheduler : latence du serveur seule, erreurs du parser comptées à part"""
+import queue
+import time
+
+import pytest
+
+from bench_parser import load_pages
+from fixture_server import FIXTURES_DIR
+from scheduler import AdaptiveScheduler
+
+from test_parsers import scraper
+
+
+class PageFetcher:
+    """Fetcher hors-ligne : page_1.html pour toutes les URL"""
+
+    def __init__(self):
+        self.html = load_pages(FIXTURES_DIR)[0]
+
+    def fetch(self, url):
+        return self.html
+
+
+def crawler(parse_page):
+    crawler = scraper(base_url="page-{}", http_fetcher=PageFetcher())
+    crawler.scheduler = AdaptiveScheduler(initial_delay=0, min_delay=0, max_retries=2)
+    crawler.parse_page = parse_page
+    return crawler
+
+
+def scrape(crawler, concurrent):
+    if concurrent:
+        pool = queue.Queue()
+        pool.put(PageFetcher())
+        return crawler._fetch_and_parse(1, pool)
+    return crawler.scrape_page(1)
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_latence_sans_le_parsing(concurrent):
+    def parse_lent(html, page, warn=True):
+        time.sleep(0.2)
+        return []
+
+    c = crawler(parse_lent)
+    scrape(c, concurrent)
+
+    [metric] = c.scheduler.metrics
+    assert metric["ok"] and metric["latency"] < 0.1
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_erreur_du_parser(concurrent):
+    def parse_en_erreur(html, page, warn=True):
+        raise ValueError("sélecteur cassé")
+
+    c = crawler(parse_en_erreur)
+    assert not scrape(c, concurrent)
+
+    # une seule requête, réussie : pas de retry ni de ralentissement
+    assert [m["ok"] for m in c.scheduler.metrics] == [True]
+    assert c.scheduler.error_rate == 0
+    assert [e["page"] for e in c.scheduler.parse_errors] == [1]
+    assert c.scheduler.summary()["erreurs_parse"] == 1
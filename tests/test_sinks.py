@@ -0,0 +1,142 @@
+"""Sorties en flux : checkpoint de reprise et connexions SQLite"""
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from fetchers import HttpFetcher
+from fixture_server import FIXTURES_DIR, serve_fixtures
+from sinks import CsvSink, SqliteSink
+
+from test_parsers import scraper
+
+
+def crawl(directory, sink, resume=False, concurrent=True):
+    with serve_fixtures(directory) as base_url:
+        crawler = scraper(base_url=base_url, sink=sink, http_fetcher=HttpFetcher())
+        if concurrent:
+            crawler.scrape_all_pages_concurrent([HttpFetcher(), HttpFetcher()], 1, 3,
+                                                resume=resume)
+        else:
+            crawler.scrape_all_pages(1, 3, resume=resume)
+    return crawler
+
+
+@pytest.fixture
+def page_2_absente(tmp_path):
+    directory = tmp_path / "fixtures"
+    directory.mkdir()
+    for page in (1, 3):
+        shutil.copy(os.path.join(FIXTURES_DIR, f"page_{page}.html"), directory)
+    return str(directory)
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_checkpoint_bloque_a_la_page_en_echec(tmp_path, page_2_absente, concurrent):
+    path = str(tmp_path / "offres.csv")
+
+    crawler = crawl(page_2_absente, CsvSink(path), concurrent=concurrent)
+    assert crawler.failed_page == 2
+    assert CsvSink(path).last_page() == 1
+
+    # la reprise repart de la page 2 au lieu de la sauter
+    crawler = crawl(FIXTURES_DIR, CsvSink(path), resume=True, concurrent=concurrent)
+    assert crawler.failed_page is None
+    assert CsvSink(path).last_page() == 3
+
+    expected = crawl(FIXTURES_DIR, CsvSink(str(tmp_path / "complet.csv")),
+                     concurrent=concurrent).to_dataframe()
+    pd.testing.assert_frame_equal(CsvSink(path).to_dataframe(), expected)
+
+
+def test_sqlite_sink_ferme_ses_connexions(tmp_path):
+    connexions = []
+
+    class TracedSink(SqliteSink):
+        def _connect(self):
+            conn = super()._connect()
+            connexions.append(conn)
+            return conn
+
+    sink = TracedSink(str(tmp_path / "offres.db"))
+    sink.write_page(1, [])
+    sink.last_page()
+    sink.to_dataframe()
+
+    assert len(connexions) == 4
+    for conn in connexions:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+ANCIENNES_COLONNES = ["titre", "entreprise", "localisation", "salaire",
+                      "date_publication", "description"]
+
+
+def test_reprise_csv_sans_offre_id(tmp_path):
+    path = str(tmp_path / "offres.csv")
+    first = crawl(FIXTURES_DIR, CsvSink(path)).to_dataframe()
+
+    # sink écrit avant l'ajout de offre_id, checkpoint à la page 1
+    with open(os.path.join(FIXTURES_DIR, "page_1.html"), encoding="utf-8") as f:
+        n_page_1 = len(scraper().parse_page(f.read(), 1))
+    old = first.iloc[:n_page_1][ANCIENNES_COLONNES]
+    old.to_csv(path, index=False)
+    CsvSink(path)._save_checkpoint({"last_page": 1, "offset": os.path.getsize(path)})
+
+    crawl(FIXTURES_DIR, CsvSink(path), resume=True)
+    df = CsvSink(path).to_dataframe()
+
+    assert list(df.columns) == list(first.columns)
+    assert len(df) == len(first)
+    assert df["offre_id"].iloc[:len(old)].isna().all()
+    assert df["offre_id"].iloc[len(old):].tolist() == first["offre_id"].iloc[len(old):].tolist()
+
+
+def test_csv_colonnes_inconnues(tmp_path):
+    path = tmp_path / "offres.csv"
+    path.write_text("titre,autre\na,b\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="colonnes inconnues"):
+        CsvSink(str(path))
+
+
+def test_reprise_sqlite_sans_offre_id(tmp_path):
+    path = str(tmp_path / "offres.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE offres_brutes ({', '.join(f'{c} TEXT' for c in ANCIENNES_COLONNES)})")
+    conn.execute("INSERT INTO offres_brutes (titre) VALUES ('ancienne offre')")
+    conn.commit()
+    conn.close()
+
+    sink = SqliteSink(path)
+    crawl(FIXTURES_DIR, sink)
+    df = sink.to_dataframe()
+
+    assert "offre_id" in df.columns
+    assert pd.isna(df["offre_id"].iloc[0])
+    assert df["offre_id"].iloc[1:].notna().all()
+
+
+def test_empreintes_persistees_a_chaque_lot(tmp_path):
+    from seen_index import SeenIndex
+
+    class Crash(Exception):
+        pass
+
+    class CrashingSink(CsvSink):
+        def write_page(self, page, rows):
+            if page == 3:
+                raise Crash
+            super().write_page(page, rows)
+
+    path, index_path = str(tmp_path / "offres.csv"), str(tmp_path / "seen.db")
+    with pytest.raises(Crash), serve_fixtures() as base_url:
+        crawler = scraper(base_url=base_url, sink=CrashingSink(path),
+                          seen_index=SeenIndex(index_path))
+        crawler.scrape_all_pages_concurrent([HttpFetcher(), HttpFetcher()], 1, 3)
+
+    # crash avant la fin du crawl : les offres écrites sont déjà dans l'index
+    ecrites = CsvSink(path).to_dataframe()["offre_id"].tolist()
+    assert ecrites and SeenIndex(index_path).known(ecrites) == set(ecrites)
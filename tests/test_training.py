@@ -0,0 +1,55 @@
+"""Harnais de validation croisée vs GridSearchCV, rapport JSON"""
+import numpy as np
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from training import entrainer, load_report
+
+
+FEATURES = ["salaire_annuel", "temps_travail", "departement"]
+
+
+@pytest.fixture
+def donnees(offres_clusterisees):
+    df = offres_clusterisees.dropna(subset=FEATURES).iloc[:1500]
+    return df[FEATURES], (df["cluster"] == 1).astype(int).to_numpy()
+
+
+def preprocessor():
+    return ColumnTransformer([("num", StandardScaler(), FEATURES)])
+
+
+def test_identique_a_gridsearchcv(donnees):
+    X, y = donnees
+    grid = {"C": [0.01, 1, 100], "solver": ["lbfgs", "newton-cg"]}
+    cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+
+    resultat = entrainer(preprocessor(), X, y, grid=grid, cv=cv, n_jobs=1, refit=False)
+
+    search = GridSearchCV(
+        Pipeline([("preprocessor", preprocessor()),
+                  ("classifier", LogisticRegression(max_iter=1000, random_state=42))]),
+        {f"classifier__{k}": v for k, v in grid.items()},
+        cv=cv, scoring="f1_weighted").fit(X, y)
+
+    scores = resultat.scores.set_index(["C", "solver"])["val_f1_mean"]
+    for params, score in zip(search.cv_results_["params"], search.cv_results_["mean_test_score"]):
+        assert scores[(params["classifier__C"], params["classifier__solver"])] == \
+            pytest.approx(score)
+
+
+def test_rapport_avec_grille_numpy(donnees, tmp_path):
+    X, y = donnees
+    path = str(tmp_path / "metrics.json")
+
+    resultat = entrainer(preprocessor(), X, y, grid={"C": np.logspace(-2, 0, 2)},
+                         cv=StratifiedKFold(n_splits=2), n_jobs=1, report_path=path)
+
+    report = load_report(path)
+    assert report["grid"] == {"C": [0.01, 1.0]}
+    assert report["best_params"] == resultat.best_params
+    assert type(resultat.best_params["C"]) is float